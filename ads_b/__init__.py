@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: __init__.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Core ADS-B processing functions used by the ADS-B Overflight Analysis Toolbox script tools.  Functions work on NumPy and pandas data and do not require ArcGIS, and modules are imported on first use.
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+from importlib import import_module
+
+# Fixed local variables
+submodules = ["batch", "benchmark", "tables", "worker"]
+
+# Public functions and the modules that define them.  Modules are imported on first use, so importing
+# one module (e.g., ads_b.stages) or starting a tool does not load every module and its dependencies.
+module_exports = {
+    "parse": ["HeaderError", "decode_valid_flags", "read_logger_file"],
+    "clean": ["clean_logger_file", "clean_waypoints", "qaqc_percentages", "remove_duplicates"],
+    "schema": ["icao_integers", "icao_text", "text_waypoints"],
+    "flights": ["segment_flights", "simplify_waypoints", "sort_waypoints"],
+    "pipeline": ["output_csv_name", "output_file_name", "process_logger_file"],
+    "formats": ["read_waypoints", "write_waypoints"],
+    "sinuosity": ["flight_sinuosity", "line_sinuosity"],
+    "agl": ["altitude_agl", "altitude_msl"],
+    "dem": ["open_dem", "sample_dem"],
+    "buffers": ["buffer_key", "clear_buffers", "load_buffer", "save_buffer"],
+    "geometry": ["buffer_mask", "points_in_polygon", "prepare_polygon"],
+    "faa": ["aircraft_table", "faa_index", "faa_lookup", "faa_values"],
+    "dedup": ["distinct_count", "duplicate_ids", "keep_mask"],
+    "merge": ["append_keys", "key_fingerprints", "key_hashes", "new_inputs", "read_manifest", "write_manifest"],
+    "screening": ["apply_rules", "flight_membership", "flight_set", "rule_bitmask", "screen_flights", "screening_counts"],
+    "altitudes": ["altitude_summary", "histogram_summary", "new_histogram", "reclass_table", "update_histogram"],
+    "density": ["band_masks", "kernel_density"],
+    "stages": ["StageLog", "stage_log"],
+    "synthetic": ["synthetic_logger_data", "write_logger_file"],
+    "timezones": ["offset_table", "utc_to_local"],
+    "temporal": ["calendar_fields", "calendar_keys", "temporal_summaries"]}
+exports = {name: module for module, names in module_exports.items() for name in names}
+__all__ = list(exports)
+
+def __getattr__(name):
+    """Import the module defining a public function, or a submodule, the first time it is used."""
+    if name in exports:
+        value = getattr(import_module("." + exports[name], __name__), name)
+    elif name in module_exports or name in submodules:
+        value = import_module("." + name, __name__)
+    else:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+    globals()[name] = value
+    return value
+
+def __dir__():
+    """List the public functions along with the names already loaded."""
+    return sorted(set(globals()) | set(exports))
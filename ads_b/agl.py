@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: agl.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Converts waypoint altitudes to feet above mean sea level (MSL) and above ground level (AGL)
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np
+
+# Fixed local variables
+feet_per_meter = 3.28084
+
+def altitude_msl(altitude):
+    """Convert MSL altitudes in meters to whole feet, truncating like int()."""
+    return np.trunc(np.asarray(altitude, dtype=float) * feet_per_meter).astype(np.int64)
+
+def altitude_agl(alt_msl, elevation):
+    """Return whole-foot AGL altitudes from MSL altitudes (feet) and terrain elevations (meters)."""
+    return np.trunc(np.asarray(alt_msl, dtype=float) - np.asarray(elevation, dtype=float) * feet_per_meter).astype(np.int64)
+
+def below_msl_threshold(alt_msl, msl_filter):
+    """Return a boolean mask of waypoints at or below the MSL altitude threshold (feet)."""
+    return np.asarray(alt_msl) <= float(msl_filter)
+
+def altitude_agl_values(alt_msl, elevation):
+    """Return whole-foot AGL altitudes as a list of ints, with None where the terrain elevation is NaN (nodata)."""
+    elevation = np.asarray(elevation, dtype=float)
+    agl = altitude_agl(alt_msl, np.nan_to_num(elevation)).astype(object)
+    agl[np.isnan(elevation)] = None
+    return agl.tolist()
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: altitudes.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson
+    Description:  Classifies waypoint altitudes (AGL or MSL) into user-defined bands and summarizes waypoint and flight counts by band
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+from .tables import add_percentage
+
+def class_count(altMax, altInterval):
+    """Return the number of altitude classes between 0 and altMax."""
+    return round(int(altMax)/int(altInterval))
+
+def class_bounds(altMin, altMax, altInterval):
+    """Return the upper bound of each altitude class, starting at altMin."""
+    return [int(altMin) + int(altInterval) * i for i in range(0, class_count(altMax, altInterval))]
+
+def reclass_table(altMin, altMax, altInterval):
+    """Return a ReclassifyField MANUAL table of [upper bound, class value] pairs."""
+    return [[bound, '{}'.format(i)] for i, bound in enumerate(class_bounds(altMin, altMax, altInterval))]
+
+def classify_altitudes(values, altMin, altMax, altInterval):
+    """Return the zero-based altitude class of each value, or -1 above the last class.
+
+    Class 0 holds values at or below altMin and each following class holds
+    values greater than the previous upper bound and at or below its own.
+    """
+    bounds = np.asarray(class_bounds(altMin, altMax, altInterval))
+    classes = np.searchsorted(bounds, np.asarray(values), side="left")
+    return np.where(classes < len(bounds), classes, -1)
+
+def class_ranges(altMin, altMax, altInterval):
+    """Return a text label ("lower - upper") for each altitude class."""
+    bounds = class_bounds(altMin, altMax, altInterval)
+    lower = [None] + bounds[:-1]
+    return ["{0} - {1}".format("" if lo is None else lo, hi).strip() for lo, hi in zip(lower, bounds)]
+
+def altitude_summary(values, altMin, altMax, altInterval, field="alt_agl"):
+    """Return waypoint FREQUENCY and PERCENTAGE by altitude class, sorted by class.
+
+    values should already exclude waypoints above altMax.  Output fields are
+    named after field (e.g., alt_agl_MANUAL and alt_agl_MANUAL_RANGE) to
+    match the tables produced by Tool 5.
+    """
+    values = np.asarray(values)
+    classes = classify_altitudes(values, altMin, altMax, altInterval)
+    labels = class_ranges(altMin, altMax, altInterval)
+    table = pd.Series(classes).value_counts().sort_index().reset_index()
+    table.columns = [field + "_MANUAL", "FREQUENCY"]
+    table.insert(0, field + "_MANUAL_RANGE", [labels[c] if c >= 0 else None for c in table[field + "_MANUAL"]])
+    table[field + "_MANUAL"] = table[field + "_MANUAL"].where(table[field + "_MANUAL"] >= 0)
+    return add_percentage(table, len(values))
+
+def unique_flights(flight_ids):
+    """Return the number of unique flights in an array of flight IDs."""
+    return len(pd.unique(np.asarray(flight_ids)))
+
+def new_histogram(altMin, altMax, altInterval):
+    """Return an empty streaming altitude histogram for use with update_histogram.
+
+    The histogram holds a waypoint count and a sorted array of hashed
+    flight IDs for each altitude class, plus one overflow class for values
+    above the last class bound but at or below altMax.
+    """
+    classes = class_count(altMax, altInterval) + 1
+    return {"bounds": (altMin, altMax, altInterval), "counts": np.zeros(classes, dtype=np.int64), "flights": [np.empty(0, dtype=np.uint64) for i in range(classes)]}
+
+def update_histogram(histogram, values, flight_ids):
+    """Add a chunk of waypoint altitudes and their flight IDs to a streaming altitude histogram.
+
+    Values above altMax (including any null placeholder above altMax) are
+    ignored.  Waypoint counts are updated with np.bincount and the distinct
+    flights in each class with sorted arrays of 64-bit flight ID hashes.
+    """
+    altMin, altMax, altInterval = histogram["bounds"]
+    values = np.asarray(values)
+    keep = values <= int(altMax)
+    classes = classify_altitudes(values[keep], altMin, altMax, altInterval)
+    overflow = len(histogram["counts"]) - 1
+    classes = np.where(classes < 0, overflow, classes)
+    histogram["counts"] += np.bincount(classes, minlength=len(histogram["counts"]))
+
+    # Reduce the chunk to its distinct (flight, class) pairs before merging the hashed flight IDs into each class
+    codes, flights = pd.factorize(np.asarray(flight_ids, dtype=object)[keep])
+    pairs = pd.unique(codes.astype(np.int64) * len(histogram["counts"]) + classes)
+    pairClasses = pairs % len(histogram["counts"])
+    pairFlights = pd.util.hash_array(np.asarray(flights, dtype=object))[pairs // len(histogram["counts"])]
+    for c in np.unique(pairClasses):
+        histogram["flights"][c] = np.union1d(histogram["flights"][c], pairFlights[pairClasses == c])
+    return histogram
+
+def histogram_flights(histogram):
+    """Return the number of distinct flights in all classes of a streaming altitude histogram."""
+    return len(np.unique(np.concatenate(histogram["flights"])))
+
+def histogram_summary(histogram, field="alt_agl"):
+    """Return waypoint FREQUENCY, PERCENTAGE, and distinct FLIGHTS by altitude class from a streaming histogram.
+
+    The table has the same fields and sort order as altitude_summary, with
+    classes that hold no waypoints omitted as with the Frequency tool.
+    Waypoints above the last class bound but at or below altMax, which
+    ReclassifyField leaves unclassified, are reported first in a null class
+    as altitude_summary does.
+    """
+    altMin, altMax, altInterval = histogram["bounds"]
+    labels = class_ranges(altMin, altMax, altInterval)
+    counts = histogram["counts"]
+    overflow = len(counts) - 1
+    classes = np.flatnonzero(counts)
+    classes = np.concatenate([classes[classes == overflow], classes[classes != overflow]])
+    table = pd.DataFrame({field + "_MANUAL_RANGE": [None if c == overflow else labels[c] for c in classes], field + "_MANUAL": np.where(classes == overflow, -1, classes),
+                          "FREQUENCY": counts[classes], "FLIGHTS": [len(histogram["flights"][c]) for c in classes]})
+    table[field + "_MANUAL"] = table[field + "_MANUAL"].where(table[field + "_MANUAL"] >= 0)
+    return add_percentage(table, int(counts.sum()))
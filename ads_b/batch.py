@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: batch.py
+    Author: Shawn Hutchinson
+    Credits: Damon Joyce, Shawn Hutchinson, Brian Peterson, Myles Cramer, Davyd Betchkal
+    Description:  Processes a folder or glob of raw ADS-B logger files across a pool of worker processes and reports combined QA/QC results
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import argparse, glob, os, sys, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .clean import count_names, qaqc_percentages
+from .formats import output_formats, write_waypoints
+from .pipeline import output_file_name, process_logger_file
+
+def find_logger_files(input_path, pattern="*.tsv"):
+    """Return a sorted list of logger files in a folder, or matching a glob pattern."""
+    if os.path.isdir(input_path):
+        input_path = os.path.join(input_path, pattern)
+    return sorted(f for f in glob.glob(input_path) if os.path.isfile(f))
+
+def process_file(input_file, park_name, logger_name, dur_threshold, output_workspace, chunk_size=None, output_format="CSV"):
+    """Process one logger file and write its output file, trapping any error.
+
+    Returns a dictionary with the input and output file names, the summary
+    returned by process_logger_file, the elapsed time, and an error message
+    (None when the file was processed successfully).
+    """
+    start = time.time()
+    result = {"input": input_file, "output": None, "summary": None, "error": None}
+    try:
+        data, result["summary"] = process_logger_file(input_file, logger_name, dur_threshold, chunk_size)
+        result["output"] = os.path.join(output_workspace, output_file_name(park_name, logger_name, input_file, output_format))
+        write_waypoints(data, result["output"])
+    except Exception as e:
+        result["error"] = "{0}: {1}".format(type(e).__name__, e) if str(e) else type(e).__name__
+    result["secs"] = round(time.time() - start, 3)
+    return result
+
+def run_batch(input_files, park_name, logger_name, dur_threshold, output_workspace, processes=None, chunk_size=None, progress=None, output_format="CSV"):
+    """Process logger files across a pool of worker processes.
+
+    Files are processed independently, so an error in one file is recorded
+    in its result and does not stop the batch.  progress, if given, is
+    called as progress(done, total, result) as each file finishes.  Results
+    are returned in the order of input_files.
+    """
+    results = {}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = {pool.submit(process_file, f, park_name, logger_name, dur_threshold, output_workspace, chunk_size, output_format): f for f in input_files}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if progress:
+                progress(len(results), len(input_files), result)
+    return [results[f] for f in input_files]
+
+def batch_report(results):
+    """Combine per-file results into a single QA/QC report.
+
+    Row counts are summed over all successfully processed files before the
+    TSLC, duplicate, and invalid coordinate percentages are calculated, so
+    each file is weighted by its number of waypoints.
+    """
+    done = [r for r in results if r["error"] is None]
+    report = {"files": len(results), "processed": len(done), "failed": len(results) - len(done), "flights": 0, "aircraft": 0}
+    if not done:
+        return report
+    counts = {key: sum(r["summary"]["counts"][key] for r in done) for key in count_names + ["waypoints", "duplicate_waypoints"]}
+    report.update(qaqc_percentages(counts))
+    report["duplicates"] = counts["duplicate_waypoints"] / counts["waypoints"] * 100
+    report["flights"] = sum(r["summary"]["flights"] for r in done)
+    report["aircraft"] = sum(r["summary"]["aircraft"] for r in done)
+    return report
+
+def main(argv=None):
+    """Command line entry point:  python -m ads_b.batch INPUT PARK DURATION OUTPUT [options]"""
+    parser = argparse.ArgumentParser(prog="python -m ads_b.batch", description="Process raw ADS-B logger TSV files in parallel.")
+    parser.add_argument("input", help="folder of logger TSV files or a glob pattern (e.g., \"logs/2023*.tsv\")")
+    parser.add_argument("park", help="four letter park unit code (e.g., GRSM)")
+    parser.add_argument("threshold", type=int, help="flight duration threshold in seconds (e.g., 900)")
+    parser.add_argument("output", help="folder where output files are written")
+    parser.add_argument("--site", default="", help="logger site name")
+    parser.add_argument("--processes", type=int, default=None, help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="rows read at a time from each input file")
+    parser.add_argument("--format", default="CSV", type=str.upper, choices=list(output_formats), help="output file format (default: CSV)")
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    input_files = find_logger_files(args.input)
+    if not input_files:
+        print("No logger files found matching {0}".format(args.input))
+        return 1
+    print("Processing {0} logger files...".format(len(input_files)))
+
+    def progress(done, total, result):
+        status = "failed ({0})".format(result["error"]) if result["error"] else "done"
+        print("[{0}/{1}] {2} {3} in {4} secs".format(done, total, os.path.basename(result["input"]), status, result["secs"]))
+
+    results = run_batch(input_files, args.park, args.site, args.threshold, args.output, args.processes, args.chunk_size, progress, args.format)
+    report = batch_report(results)
+    print("Files processed: {0} of {1}".format(report["processed"], report["files"]))
+    if report["processed"]:
+        print("Percent of original waypoints eliminated due to TSLC: {0}".format(round(report["invalid_tslc"], 2)))
+        print("Percent duplicate waypoints: {0}".format(round(report["duplicates"], 2)))
+        print("Percent waypoints with invalid altitudes: {0}".format(report["invalid_altitude"]))
+        print("Percent waypoints with invalid ICAO addresses: {0}".format(round(report["invalid_icao"], 2)))
+        print("Percent waypoints with invalid x,y coordinates: {0}".format(round(report["invalid_coords"], 2)))
+        print("Total flights in input files: {0}".format(report["flights"]))
+        print("Total aircraft-days in input files: {0}".format(report["aircraft"]))
+    for result in results:
+        if result["error"]:
+            print("Failed: {0} ({1})".format(result["input"], result["error"]))
+    print("Total execution time (secs) = {0}".format(round(time.time() - start, 3)))
+    return 1 if report["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
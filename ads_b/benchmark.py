@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: benchmark.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Times each stage of the processing chain on synthetic logger files of increasing size and reports throughput and peak memory
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import argparse, json, os, shutil, sys, tempfile, time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .parse import check_header, decode_valid_flags, read_logger_file, standardize_fields
+from .clean import clean_waypoints, remove_duplicates
+from .flights import segment_flights, simplify_waypoints, sort_waypoints
+from .sinuosity import flightline_table
+from .screening import flight_membership, flight_set, rule_bitmask, screen_flights
+from .agl import altitude_msl
+from .altitudes import new_histogram, update_histogram
+from .dedup import keep_mask
+from .temporal import temporal_summaries
+from .stages import StageLog
+from .synthetic import synthetic_logger_data, write_logger_file
+
+# Fixed local variables
+default_sizes = [1000000, 10000000, 50000000]
+operator_names = np.array(["", "", "", "", "", "", "", "", "STATE OF TENNESSEE", "US DEPT OF INTERIOR"])
+
+def output_rows(value):
+    """Return the number of rows in a stage result (a table or array, or a tuple led by one), or None for other results."""
+    if isinstance(value, tuple):
+        value = value[0]
+    return None if isinstance(value, dict) or not hasattr(value, "__len__") else len(value)
+
+def timed(stages, stage, rows_in, func, *args):
+    """Run func(*args) as a stage of a StageLog, add its throughput to the stage record, and return the result of func."""
+    stages.start(stage, int(rows_in))
+    value = func(*args)
+    record = stages.end(output_rows(value))
+    record["rows_per_sec"] = int(rows_in / record["wall_secs"]) if record["wall_secs"] > 0 else None
+    return value
+
+def run_stages(path, rows, logger_name="BENCH", dur_threshold=900, seed=0, log_file=None):
+    """Run each processing stage in turn on a logger file and return a list of stage timings.
+
+    Stages follow the processing chain from reading the TSV file through
+    Tool 1 cleaning and flight segmentation, Tool 2 flightlines, Tool 4
+    screening, and the Tool 5 and Tool 6 summaries.  The flags stage times
+    validFlags decoding on its own; clean includes it again.  FAA attributes
+    used by screening are assigned at random, and screening reports the
+    waypoints of suspect flights as its output rows.  Stage records are
+    also appended to log_file as JSON lines when it is given.
+    """
+    stages = StageLog("benchmark", [], log_file=log_file)
+    raw = timed(stages, "ingest", rows, lambda: read_logger_file(path)[0])
+    timed(stages, "flags", len(raw), lambda: decode_valid_flags(standardize_fields(check_header(raw))["validFlags"]))
+    data, counts = timed(stages, "clean", len(raw), clean_waypoints, raw, logger_name)
+    del raw
+    data, duplicates = timed(stages, "dedup", len(data), remove_duplicates, data)
+    data = timed(stages, "sort", len(data), sort_waypoints, data)
+    data, simplified = timed(stages, "simplify", len(data), simplify_waypoints, data)
+    data = timed(stages, "segment", len(data), segment_flights, data, dur_threshold)
+    lines = timed(stages, "sinuosity", len(data), flightline_table, data["flight_id"].to_numpy(), data["TIME"].to_numpy(), data["lon"].to_numpy(), data["lat"].to_numpy())
+    rng = np.random.default_rng(seed)
+    lines["TYPE_REGISTRANT"] = rng.choice([1, 3, 5, 7], len(lines))
+    lines["NAME"] = operator_names[rng.integers(0, len(operator_names), len(lines))]
+
+    def screening():
+        criteria = screen_flights(lines, "5", "0.10, 0.99", "US DEPT OF INTERIOR", "1")
+        suspect = lines["flight_id"].to_numpy()[rule_bitmask(criteria) > 0]
+        return np.flatnonzero(flight_membership(data["flight_id"].to_numpy(), flight_set(suspect)))
+
+    def altitudes():
+        histogram = new_histogram(500, 10000, 500)
+        return update_histogram(histogram, altitude_msl(data["altitude"].to_numpy()), data["flight_id"].to_numpy())
+
+    def temporal():
+        return temporal_summaries(data[keep_mask(data, ["flight_id"])], "America/New_York")
+
+    timed(stages, "screening", len(data), screening)
+    timed(stages, "altitudes", len(data), altitudes)
+    timed(stages, "temporal", len(data), temporal)
+    return stages.close()
+
+def benchmark_size(rows, work_dir, seed=0, time_header="TIME", aircraft=None, gap_rate=0.001, keep=False, log_file=None):
+    """Generate a synthetic logger file with rows records and return its generation time and stage timings.
+
+    Run in a separate process for each size so that peak memory reflects
+    that size alone.
+    """
+    path = os.path.join(work_dir, "synthetic_{0}.tsv".format(rows))
+    start = time.perf_counter()
+    write_logger_file(synthetic_logger_data(rows, aircraft, gap_rate=gap_rate, time_header=time_header, seed=seed), path)
+    result = {"rows": rows, "generate_secs": round(time.perf_counter() - start, 3), "file_mb": round(os.path.getsize(path) / 2 ** 20, 1)}
+    try:
+        result["stages"] = run_stages(path, rows, seed=seed, log_file=log_file)
+    finally:
+        if not keep:
+            os.remove(path)
+    result["total_secs"] = round(sum(stage["wall_secs"] for stage in result["stages"]), 3)
+    result["peak_rss_mb"] = max((stage["peak_rss_mb"] or 0) for stage in result["stages"]) or None
+    return result
+
+def compare_results(results, baseline, tolerance=0.2):
+    """Return (rows, stage, rows_per_sec, baseline rows_per_sec) for each stage whose throughput fell by more than tolerance."""
+    previous = {(r["rows"], s["stage"]): s["rows_per_sec"] for r in baseline for s in r["stages"]}
+    slower = []
+    for result in results:
+        for stage in result["stages"]:
+            before = previous.get((result["rows"], stage["stage"]))
+            if before and stage["rows_per_sec"] is not None and stage["rows_per_sec"] < before * (1 - tolerance):
+                slower.append((result["rows"], stage["stage"], stage["rows_per_sec"], before))
+    return slower
+
+def main(argv=None):
+    """Command line entry point:  python -m ads_b.benchmark [options]"""
+    parser = argparse.ArgumentParser(prog="python -m ads_b.benchmark", description="Time each processing stage on synthetic ADS-B logger files.")
+    parser.add_argument("--rows", type=int, nargs="+", default=default_sizes, help="synthetic file sizes in rows (default: 1000000 10000000 50000000)")
+    parser.add_argument("--aircraft", type=int, default=None, help="number of aircraft (default: one per 2,000 rows)")
+    parser.add_argument("--gap-rate", type=float, default=0.001, help="chance that an aircraft starts a new flight after each report (default: 0.001)")
+    parser.add_argument("--header", default="TIME", choices=["TIME", "timestamp"], help="time field header variant (default: TIME)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the synthetic data")
+    parser.add_argument("--work-dir", default=None, help="folder for synthetic files (default: a temporary folder)")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic files")
+    parser.add_argument("--output", default=None, help="JSON file where results are written")
+    parser.add_argument("--log", default=None, help="file where stage records are appended as JSON lines")
+    parser.add_argument("--baseline", default=None, help="JSON results of an earlier run to check for slower stages")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="fractional drop in throughput reported as a regression (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    workDir = args.work_dir or tempfile.mkdtemp(prefix="ads_b_benchmark_")
+    os.makedirs(workDir, exist_ok=True)
+    results = []
+    try:
+        for rows in args.rows:
+            print("Benchmarking {0} rows...".format(rows))
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(benchmark_size, rows, workDir, args.seed, args.header, args.aircraft, args.gap_rate, args.keep, args.log).result()
+            results.append(result)
+            print("{0:<10} {1:>12} {2:>12} {3:>10} {4:>10} {5:>14} {6:>12}".format("stage", "rows in", "rows out", "secs", "cpu secs", "rows/sec", "peak RSS MB"))
+            for stage in result["stages"]:
+                print("{0:<10} {1:>12} {2:>12} {3:>10} {4:>10} {5:>14} {6:>12}".format(stage["stage"], stage["rows_in"], "" if stage["rows_out"] is None else stage["rows_out"], stage["wall_secs"], stage["cpu_secs"], stage["rows_per_sec"] or "", stage["peak_rss_mb"] or ""))
+            print("Generated {0} MB in {1} secs; stages took {2} secs with a peak RSS of {3} MB".format(result["file_mb"], result["generate_secs"], result["total_secs"], result["peak_rss_mb"]))
+    finally:
+        if not args.work_dir and not args.keep:
+            shutil.rmtree(workDir, ignore_errors=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=1)
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = compare_results(results, json.load(f), args.tolerance)
+        for rows, stage, rate, before in slower:
+            print("Regression: {0} at {1} rows ran at {2} rows/sec versus {3} rows/sec in the baseline".format(stage, rows, rate, before))
+        return 1 if slower else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: buffers.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Caches buffered park boundary geometry on disk, keyed by boundary content, buffer distance, and spatial reference
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import glob, hashlib, os
+import numpy as np
+
+# Fixed local variables
+cache_version = 1
+max_buffers = 32
+
+def buffer_key(boundary, distance, boundary_sr, output_sr, dissolve="ALL"):
+    """Return a cache key for a buffer of boundary polygons.
+
+    boundary is a list of WKB geometries for the boundary features, read in
+    any order.  The key changes whenever the boundary geometry, the buffer
+    distance (e.g., "10 Miles"), the boundary or output spatial reference
+    strings, or the dissolve option change, so a stale buffer is never used.
+    """
+    digest = hashlib.sha1("v{0}|{1}|{2}|{3}|{4}".format(cache_version, " ".join(str(distance).split()).lower(), boundary_sr, output_sr, dissolve).encode())
+    for geometry in sorted(bytes(g) for g in boundary):
+        digest.update(hashlib.sha1(geometry).digest())
+    return digest.hexdigest()
+
+def buffer_path(cache_dir, key):
+    """Return the file holding a cached buffer."""
+    return os.path.join(cache_dir, "buffer_" + key + ".npz")
+
+def load_buffer(cache_dir, key):
+    """Return the cached buffer geometry (a list of WKB bytes) for key, or None when it is not cached.
+
+    Loading a buffer marks it as recently used for eviction.
+    """
+    path = buffer_path(cache_dir, key)
+    try:
+        with np.load(path) as cached:
+            lengths, data = cached["lengths"], cached["data"]
+    except (OSError, KeyError, ValueError):
+        return None
+    os.utime(path)
+    ends = np.cumsum(lengths)
+    return [data[end - length:end].tobytes() for length, end in zip(lengths, ends)]
+
+def save_buffer(cache_dir, key, geometries, max_entries=max_buffers):
+    """Cache buffer geometry (a list of WKB bytes) under key and evict the least recently used buffers beyond max_entries."""
+    os.makedirs(cache_dir, exist_ok=True)
+    geometries = [bytes(g) for g in geometries]
+    lengths = np.array([len(g) for g in geometries], dtype=np.int64)
+    data = np.frombuffer(b"".join(geometries), dtype=np.uint8)
+    temp = buffer_path(cache_dir, key) + ".tmp.npz"
+    np.savez(temp, lengths=lengths, data=data)
+    os.replace(temp, buffer_path(cache_dir, key))
+    evict_buffers(cache_dir, max_entries)
+
+def evict_buffers(cache_dir, max_entries=max_buffers):
+    """Delete the least recently used cached buffers so that at most max_entries remain."""
+    paths = sorted(glob.glob(os.path.join(cache_dir, "buffer_*.npz")), key=os.path.getmtime, reverse=True)
+    for path in paths[max_entries:]:
+        os.remove(path)
+
+def clear_buffers(cache_dir, key=None):
+    """Invalidate one cached buffer (by key) or every cached buffer in cache_dir."""
+    paths = [buffer_path(cache_dir, key)] if key else glob.glob(os.path.join(cache_dir, "buffer_*.npz"))
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: clean.py
+    Author: Shawn Hutchinson
+    Credits: Damon Joyce, Shawn Hutchinson, Brian Peterson, Myles Cramer, Davyd Betchkal
+    Description:  Formats and screens raw ADS-B logger records and reports QA/QC percentages for removed waypoints
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+from .parse import check_header, flags_names, standardize_fields, unpack_valid_flags
+from .schema import compact_waypoints, concat_waypoints, constant_category, date_categories, icao_integers, invalid_icao
+
+# Fixed local variables
+count_names = ["flag_rows", "valid_latlon", "valid_altitude", "icao_rows", "invalid_icao", "format_rows", "pressure_alts", "tslc_rows", "invalid_tslc", "coord_rows", "invalid_lat", "invalid_lon"]
+duplicate_fields = ["TIME", "ICAO_address", "lat", "lon", "altitude", "heading"]
+
+def clean_waypoints(data, logger_name):
+    """Check, standardize, and screen a block of raw logger records.
+
+    Returns the cleaned records, reduced to the fields needed for flight
+    segmentation, and a dictionary of the row counts (keyed by count_names)
+    used to report QA/QC percentages.  Counts from successive chunks can be
+    summed before the percentages are calculated with qaqc_percentages.
+    Fields are stored with the compact types of schema.waypoint_schema:
+    ICAO addresses as uint32 values, heading and velocities as float32, and
+    SITE and DATE as categoricals.  Records whose ICAO address is not 1-6
+    hex digits (optionally prefixed with "~") are removed and counted as
+    invalid_icao.
+    """
+    counts = {}
+
+    # Check for the required header, standardize key field names, and unpack validFlags into Boolean values
+    data = check_header(data)
+    data = standardize_fields(data)
+    data = unpack_valid_flags(data)
+
+    # Keep only those records with valid latlon and altitude values based on validFlags
+    counts["flag_rows"] = len(data.index)
+    counts["valid_latlon"] = int(data["valid_LATLON"].sum())
+    counts["valid_altitude"] = int(data["valid_ALTITUDE"].sum())
+    data.drop(data[data["valid_LATLON"] == "False"].index, inplace = True)
+    data.drop(data[data["valid_ALTITUDE"] == "False"].index, inplace = True)
+
+    # Ensure remaining field values (except TIME) use proper data types, with ICAO addresses parsed from hex to integers
+    data = data.replace('-', np.nan)
+    data.dropna(how="any", axis=0, inplace=True)
+    data["ICAO_address"] = icao_integers(data["ICAO_address"])
+    counts["icao_rows"] = len(data)
+    counts["invalid_icao"] = int((data["ICAO_address"] == invalid_icao).sum())
+    data.drop(data[data["ICAO_address"] == invalid_icao].index, inplace = True)
+    data["lat"] = data["lat"].astype(int)
+    data["lon"] = data["lon"].astype(int)
+    data["altitude"] = data["altitude"].astype(int)
+    counts["format_rows"] = len(data)
+    counts["pressure_alts"] = 0
+    if "altType" in data.columns:
+        data["altType"] = data["altType"].astype(int)
+        counts["pressure_alts"] = len(data["altType"] == 0)
+    data["heading"] = data["heading"].astype(int)
+    data["hor_velocity"] = data["hor_velocity"].astype(int)
+    data["ver_velocity"] = data["ver_velocity"].astype(int)
+    data["tslc"] = data["tslc"].astype(int)
+
+    # Convert Unix-based TIME field to datetime objects in then re-scale selected numeric variable values
+    # Note that the TIME field is controlled by the ADS-B logger which is initialized by local users in local time
+    data["TIME"] = pd.to_datetime(data["TIME"], unit = "s")
+    data["lat"] = data["lat"] / 1e7
+    data["lon"] = data["lon"] / 1e7
+    data["altitude"] = data["altitude"] / 1e3
+    data["heading"] = data["heading"] / 1e2
+    data["hor_velocity"] = data["hor_velocity"] / 1e2
+    data["ver_velocity"] = data["ver_velocity"] / 1e2
+    data["SITE"] = constant_category(logger_name, len(data))
+    data["DATE"] = date_categories(data["TIME"])
+
+    # Keep only those records with TSLC values of 1 or 2 seconds
+    counts["tslc_rows"] = data.shape[0]
+    counts["invalid_tslc"] = len(data.query("tslc >= 3 or tslc == 0"))
+    data.drop(data[data["tslc"] >= 3].index, inplace = True)
+    data.drop(data[data["tslc"] == 0].index, inplace = True)
+
+    # Remove lat/lon coordinates that are obviously incorrect
+    counts["coord_rows"] = data.shape[0]
+    counts["invalid_lat"] = len(data.query("lat >= 90 or lat <= -90"))
+    counts["invalid_lon"] = len(data.query("lon >= 180 or lon <= -180"))
+    data.drop(data[data["lat"] >= 90].index, inplace = True)
+    data.drop(data[data["lat"] <= -90].index, inplace = True)
+    data.drop(data[data["lon"] >= 180].index, inplace = True)
+    data.drop(data[data["lon"] <= -180].index, inplace = True)
+
+    # Drop fields no longer needed
+    data = data.drop(columns = ["tslc"] + flags_names)
+    return compact_waypoints(data), counts
+
+def clean_logger_file(chunks, logger_name):
+    """Clean an iterable of raw logger chunks and return the combined records, keeping the compact field types, and summed counts."""
+    cleaned = []
+    counts = dict.fromkeys(count_names, 0)
+    for chunk in chunks:
+        chunk, chunk_counts = clean_waypoints(chunk, logger_name)
+        cleaned.append(chunk)
+        for key in count_names:
+            counts[key] += chunk_counts[key]
+    return concat_waypoints(cleaned), counts
+
+def qaqc_percentages(counts, pressure_altitudes=False):
+    """Convert summed row counts into the QA/QC percentages reported by Tool 1.
+
+    Returns a dictionary with the percentages of waypoints with invalid
+    lat/lon flags, invalid altitudes, invalid ICAO addresses, invalid TSLC
+    values, and invalid coordinates, plus pressure altitudes when
+    pressure_altitudes is True.
+    """
+    pct = {}
+    if counts["valid_latlon"] == counts["flag_rows"]:
+        pct["invalid_latlon"] = 0
+    else:
+        pct["invalid_latlon"] = round(100 - counts["valid_latlon"] / counts["flag_rows"] * 100, 2)
+    if counts["valid_altitude"] == counts["flag_rows"]:
+        pct["invalid_altitude"] = 0
+    else:
+        pct["invalid_altitude"] = round(100 - counts["valid_altitude"] / counts["flag_rows"] * 100, 2)
+    pct["invalid_icao"] = counts["invalid_icao"] / counts["icao_rows"] * 100
+    if pressure_altitudes:
+        pct["pressure_alts"] = counts["pressure_alts"] / counts["format_rows"] * 100
+    pct["invalid_tslc"] = counts["invalid_tslc"] / counts["tslc_rows"] * 100
+    invalidLat = counts["invalid_lat"] / counts["coord_rows"] * 100
+    invalidLon = counts["invalid_lon"] / counts["coord_rows"] * 100
+    pct["invalid_coords"] = pct["invalid_latlon"] + invalidLat + invalidLon
+    return pct
+
+def remove_duplicates(data):
+    """Remove duplicate waypoints and return the records and the percentage removed."""
+    duplicateWaypoints = 100 - (len(data.drop_duplicates(subset=duplicate_fields)) / len(data) * 100)
+    data = data.drop_duplicates(subset=duplicate_fields, keep = 'last')
+    return data, duplicateWaypoints
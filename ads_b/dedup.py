@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: dedup.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Identifies duplicate records and counts distinct values from hashed composite keys over NumPy columns, in place of copying feature classes and running DeleteIdentical
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+
+def key_columns(data, fields):
+    """Return the key fields of a structured array, DataFrame, or dictionary of arrays as a DataFrame.
+
+    A DATE key field is taken from the calendar day of TIME, matching the
+    yyyyMMdd DATE field used to identify duplicate waypoints.
+    """
+    return pd.DataFrame({field: np.asarray(data["TIME"], dtype="datetime64[D]") if field == "DATE" else np.asarray(data[field]) for field in fields})
+
+def key_hashes(data, fields):
+    """Return a 64-bit hash of the key fields of each row."""
+    return pd.util.hash_pandas_object(key_columns(data, fields), index=False).to_numpy()
+
+def keep_mask(data, fields):
+    """Return a boolean mask that is True for the first row with each distinct combination of key fields.
+
+    Rows are grouped by a hash of their key fields (the fields DeleteIdentical
+    would compare) in a single hash table pass, and every row after the
+    first in a group is a duplicate.  Duplicates are checked against the first row of their group
+    and, in the unlikely event of a hash collision, the mask is rebuilt by
+    comparing the key fields themselves.
+    """
+    keys = key_columns(data, fields)
+    codes = pd.factorize(pd.util.hash_pandas_object(keys, index=False).to_numpy())[0]
+    keep = np.ones(len(codes), dtype=bool)
+    keep[1:] = codes[1:] > np.maximum.accumulate(codes)[:-1]
+    firstRows = np.flatnonzero(keep)
+    duplicates = np.flatnonzero(~keep)
+    for field in fields:
+        values = keys[field].to_numpy()
+        same, original = values[duplicates], values[firstRows[codes[duplicates]]]
+        equal = same == original
+        if not equal.all() and not (equal | (pd.isna(same) & pd.isna(original))).all():
+            return ~keys.duplicated(keep="first").to_numpy()
+    return keep
+
+def distinct_count(data, fields):
+    """Return the number of distinct combinations of key fields (e.g., unique flight_id values)."""
+    return int(keep_mask(data, fields).sum())
+
+def duplicate_ids(data, fields, id_field="OID@"):
+    """Return the IDs (e.g., OID@ values) of rows that repeat the key fields of an earlier row, as a list for a layer selection set."""
+    return np.asarray(data[id_field])[~keep_mask(data, fields)].tolist()
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: dem.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Memory-maps uncompressed GeoTIFF and ESRI floating point (.flt) DEMs and samples terrain elevations at waypoint coordinates
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import glob, hashlib, os
+import numpy as np
+
+# Fixed local variables
+tiff_types = {1: "u1", 2: "S1", 3: "u2", 4: "u4", 6: "i1", 7: "u1", 8: "i2", 9: "i4", 11: "f4", 12: "f8", 16: "u8", 17: "i8", 18: "u8"}
+sample_formats = {1: "u", 2: "i", 3: "f"}
+batch_rows = 1000000
+raster_tables = ["fras_ras_", "fras_bnd_", "fras_blk_", "fras_aux_"]
+max_exports = 4
+
+def read_tiff_tags(path):
+    """Return the tags of the first image in a classic or BigTIFF file and the file byte order ("<" or ">")."""
+    with open(path, "rb") as f:
+        order = {b"II": "<", b"MM": ">"}.get(f.read(2))
+        if order is None:
+            raise ValueError("{0} is not a TIFF file".format(path))
+        version = int(np.frombuffer(f.read(2), order + "u2")[0])
+        if version == 42:
+            countType, entrySize, offsetType = "u2", 12, "u4"
+            f.seek(int(np.frombuffer(f.read(4), order + "u4")[0]))
+        elif version == 43:
+            countType, entrySize, offsetType = "u8", 20, "u8"
+            f.seek(8)
+            f.seek(int(np.frombuffer(f.read(8), order + "u8")[0]))
+        else:
+            raise ValueError("{0} is not a TIFF file".format(path))
+        entryCount = int(np.frombuffer(f.read(np.dtype(countType).itemsize), order + countType)[0])
+        entries = f.read(entryCount * entrySize)
+        tags = {}
+        for i in range(entryCount):
+            entry = entries[i * entrySize:(i + 1) * entrySize]
+            tag, fieldType = np.frombuffer(entry[:4], order + "u2")
+            if int(fieldType) not in tiff_types:
+                continue
+            dtype = np.dtype(order + tiff_types[int(fieldType)])
+            count = int(np.frombuffer(entry[4:4 + np.dtype(offsetType).itemsize], order + offsetType)[0])
+            valueField = entry[4 + np.dtype(offsetType).itemsize:]
+            if count * dtype.itemsize <= len(valueField):
+                raw = valueField[:count * dtype.itemsize]
+            else:
+                position = f.tell()
+                f.seek(int(np.frombuffer(valueField, order + offsetType)[0]))
+                raw = f.read(count * dtype.itemsize)
+                f.seek(position)
+            values = np.frombuffer(raw, dtype)
+            tags[int(tag)] = b"".join(values).rstrip(b"\x00").decode("ascii", "replace") if dtype.kind == "S" else values
+    return tags, order
+
+def open_geotiff(path):
+    """Memory-map the first band of an uncompressed, single-band GeoTIFF DEM.
+
+    Striped and tiled layouts are supported when the strips or tiles are
+    stored contiguously, which is how ArcGIS and GDAL write uncompressed
+    rasters.  Compressed GeoTIFFs raise a ValueError and should be exported
+    as uncompressed GeoTIFF or ESRI floating point (.flt) rasters.
+    """
+    tags, order = read_tiff_tags(path)
+    if int(tags.get(259, [1])[0]) != 1:
+        raise ValueError("{0} is compressed and cannot be memory-mapped".format(path))
+    if int(tags.get(277, [1])[0]) != 1:
+        raise ValueError("{0} has more than one band".format(path))
+    width, height = int(tags[256][0]), int(tags[257][0])
+    dtype = np.dtype(order + sample_formats[int(tags.get(339, [1])[0])] + str(int(tags[258][0]) // 8))
+    if 322 in tags:
+        tileWidth, tileHeight, offsets = int(tags[322][0]), int(tags[323][0]), tags[324]
+    else:
+        tileWidth, tileHeight, offsets = width, int(tags.get(278, [height])[0]), tags[273]
+    step = tileWidth * tileHeight * dtype.itemsize
+    if np.any(np.diff(offsets.astype(np.int64)) != step):
+        raise ValueError("{0} does not store its strips or tiles contiguously".format(path))
+    tilesDown, tilesAcross = -(-height // tileHeight), -(-width // tileWidth)
+    if 322 in tags:
+        data = np.memmap(path, dtype, "r", int(offsets[0]), (tilesDown, tilesAcross, tileHeight, tileWidth))
+    else:
+        data = np.memmap(path, dtype, "r", int(offsets[0]), (1, 1, height, width))
+        tileHeight = height
+    scale, tiepoint = tags[33550], tags[33922]
+    x0 = tiepoint[3] - tiepoint[0] * scale[0]
+    y0 = tiepoint[4] + tiepoint[1] * scale[1]
+
+    # Shift the origin to the corner of the first cell when the GeoKey RasterPixelIsPoint is set
+    geoKeys = tags.get(34735, np.array([], dtype=int)).reshape(-1, 4)
+    if np.any((geoKeys[:, 0] == 1025) & (geoKeys[:, 3] == 2)):
+        x0, y0 = x0 - scale[0] / 2, y0 + scale[1] / 2
+    nodata = float(tags[42113]) if 42113 in tags and tags[42113].strip() else None
+    return {"data": data, "rows": height, "cols": width, "tile": (tileHeight, tileWidth), "x0": float(x0), "y0": float(y0), "dx": float(scale[0]), "dy": float(scale[1]), "nodata": nodata}
+
+def open_flt(path):
+    """Memory-map an ESRI floating point raster (.flt with its .hdr header file)."""
+    header = {}
+    with open(os.path.splitext(path)[0] + ".hdr") as f:
+        for line in f:
+            if line.strip():
+                key, value = line.split()[:2]
+                header[key.lower()] = value
+    cols, rows, cellsize = int(header["ncols"]), int(header["nrows"]), float(header["cellsize"])
+    if "xllcenter" in header:
+        x0, yll = float(header["xllcenter"]) - cellsize / 2, float(header["yllcenter"]) - cellsize / 2
+    else:
+        x0, yll = float(header["xllcorner"]), float(header["yllcorner"])
+    order = ">" if header.get("byteorder", "lsbfirst").lower() == "msbfirst" else "<"
+    data = np.memmap(path, order + "f4", "r", 0, (1, 1, rows, cols))
+    nodata = float(header["nodata_value"]) if "nodata_value" in header else None
+    return {"data": data, "rows": rows, "cols": cols, "tile": (rows, cols), "x0": x0, "y0": yll + rows * cellsize, "dx": cellsize, "dy": cellsize, "nodata": nodata}
+
+def open_dem(path):
+    """Memory-map a DEM from an uncompressed GeoTIFF (.tif, .tiff) or ESRI floating point (.flt) file.
+
+    Only the file header is read; cell values are paged in from disk as
+    they are sampled, so the DEM is never loaded into memory as a whole.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".tif", ".tiff"):
+        return open_geotiff(path)
+    if ext == ".flt":
+        return open_flt(path)
+    raise ValueError("Unsupported DEM file type {0}".format(ext))
+
+def dem_file(path):
+    """Return path if it is a DEM file that open_dem can memory-map, otherwise None."""
+    try:
+        open_dem(path)
+    except (OSError, ValueError, KeyError):
+        return None
+    return path
+
+def file_signature(paths):
+    """Return the newest modification time and total size of a list of files."""
+    stats = [os.stat(path) for path in paths]
+    return (max([info.st_mtime_ns for info in stats], default=0), sum(info.st_size for info in stats))
+
+def catalog_offsets(gdb):
+    """Return the byte offset of each row of the system catalog table (a00000001) of a file geodatabase, 0 for deleted rows.
+
+    Row n is at index n - 1.  Returns None when the row index is sparse,
+    which the catalog of a file geodatabase does not use in practice.
+    """
+    with open(os.path.join(gdb, "a00000001.gdbtablx"), "rb") as f:
+        magic, blocks, rows, size = (int(v) for v in np.frombuffer(f.read(16), "<i4"))
+        raw = np.frombuffer(f.read(blocks * 1024 * size), np.uint8).reshape(-1, size)
+        bitmapWords = f.read(4)
+    if magic != 3 or len(raw) < rows or (len(bitmapWords) == 4 and int(np.frombuffer(bitmapWords, "<i4")[0]) != 0):
+        return None
+    return (raw[:rows].astype(np.int64) << (8 * np.arange(size, dtype=np.int64))).sum(axis=1)
+
+def raster_table_files(gdb, name):
+    """Return the files of the tables that store a raster dataset in a file geodatabase, or None when they cannot be found.
+
+    A raster named name is stored in the fras_ras_, fras_bnd_, fras_blk_,
+    and fras_aux_ tables.  Each table name is looked up in the geodatabase
+    system catalog, where the row holding it gives the table number n, and
+    the table is stored in the files named a0000000n (in hex) with any
+    extension.  Only names inside a live catalog row count, so tables of a
+    deleted raster with the same name are ignored.
+    """
+    try:
+        with open(os.path.join(gdb, "a00000001.gdbtable"), "rb") as f:
+            catalog = f.read()
+        offsets = catalog_offsets(gdb)
+    except (OSError, ValueError):
+        return None
+    if offsets is None:
+        return None
+    live = np.flatnonzero(offsets > 0)
+    starts = offsets[live]
+    ends = starts + 4 + np.array([int(np.frombuffer(catalog[o:o + 4], "<u4")[0]) if o + 4 <= len(catalog) else 0 for o in starts], dtype=np.int64)
+    names = catalog.lower()
+    paths = []
+    for prefix in raster_tables:
+        table = (prefix + name).lower().encode("utf-8")
+        if len(table) > 127:
+            return None
+        text = bytes([len(table)]).lower() + table
+        rows = []
+        pos = names.find(text)
+        while pos >= 0:
+            rows += [int(r) + 1 for r in live[(starts <= pos) & (pos + len(text) <= ends)]]
+            pos = names.find(text, pos + 1)
+        if len(rows) != 1:
+            return None
+        paths += glob.glob(os.path.join(gdb, "a{0:08x}.*".format(rows[0])))
+    return sorted(paths)
+
+def source_signature(path):
+    """Return the modification time and size of a DEM source, so an edited or replaced DEM gives a new signature.
+
+    A folder (e.g., an Esri Grid) is summarized by its newest file and total
+    size.  A raster stored in a file geodatabase is summarized by the files
+    of its own tables (see raster_table_files), so writing other datasets to
+    the same geodatabase does not change it.  When those tables cannot be
+    found, the nearest existing folder above the raster (the geodatabase) is
+    summarized instead.
+    """
+    name = os.path.basename(path)
+    while path and not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return (0, 0)
+        path = parent
+    if os.path.isfile(path):
+        return file_signature([path])
+    if path.lower().endswith(".gdb"):
+        tables = raster_table_files(path, name)
+        if tables:
+            return file_signature(tables)
+    return file_signature([os.path.join(folder, f) for folder, dirs, files in os.walk(path) for f in files])
+
+def export_name(path, description=""):
+    """Return the file name of the floating point raster exported from a DEM that open_dem cannot read.
+
+    The name is keyed by the DEM path, its source_signature, and an optional
+    description of the raster (e.g., its extent, cell size, and spatial
+    reference from arcpy.Describe), so an export is reused only while the
+    DEM is unchanged.
+    """
+    mtime, size = source_signature(path)
+    return "dem_" + hashlib.md5("{0}|{1}|{2}|{3}".format(path, mtime, size, description).encode()).hexdigest()[:12] + ".flt"
+
+def find_export(folder, name):
+    """Return the path of the DEM export named name in folder, or None when it has not been exported.
+
+    Finding an export marks it as recently used for eviction.
+    """
+    path = os.path.join(folder, name)
+    if not os.path.exists(path):
+        return None
+    os.utime(path)
+    return path
+
+def evict_exports(folder, max_entries=max_exports):
+    """Delete the least recently used DEM exports (each .flt file with its .hdr and other companion files) so that at most max_entries remain."""
+    paths = sorted(glob.glob(os.path.join(folder, "dem_*.flt")), key=os.path.getmtime, reverse=True)
+    for path in paths[max_entries:]:
+        for companion in glob.glob(os.path.splitext(path)[0] + ".*"):
+            os.remove(companion)
+
+def cell_values(dem, rows, cols):
+    """Return DEM cell values (NaN for nodata) at row and column indices, reading cells in file order.
+
+    Indices are sorted by their position in the file before the memory-mapped
+    values are gathered, so each strip or tile is paged in once per batch.
+    """
+    tileHeight, tileWidth = dem["tile"]
+    tileRows, tileCols = rows // tileHeight, cols // tileWidth
+    inRow, inCol = rows % tileHeight, cols % tileWidth
+    tilesAcross = dem["data"].shape[1]
+    order = np.argsort((tileRows * tilesAcross + tileCols) * (tileHeight * tileWidth) + inRow * tileWidth + inCol, kind="stable")
+    raw = np.empty(len(rows), dtype=dem["data"].dtype)
+    raw[order] = dem["data"][tileRows[order], tileCols[order], inRow[order], inCol[order]]
+    values = raw.astype(float)
+    if dem["nodata"] is not None:
+        values[raw == dem["data"].dtype.type(dem["nodata"])] = np.nan
+    return values
+
+def sample_batch(dem, x, y, method):
+    """Return DEM elevations for one batch of coordinates; see sample_dem."""
+    col = (x - dem["x0"]) / dem["dx"] - 0.5
+    row = (dem["y0"] - y) / dem["dy"] - 0.5
+    nearestCol, nearestRow = np.floor(col + 0.5), np.floor(row + 0.5)
+    inside = (nearestCol >= 0) & (nearestCol < dem["cols"]) & (nearestRow >= 0) & (nearestRow < dem["rows"])
+    elevation = np.full(len(x), np.nan)
+    if not inside.any():
+        return elevation
+    nearestCol, nearestRow = nearestCol[inside].astype(np.int64), nearestRow[inside].astype(np.int64)
+    nearest = cell_values(dem, nearestRow, nearestCol)
+    if method == "nearest":
+        elevation[inside] = nearest
+        return elevation
+
+    # Interpolate between the four surrounding cell centers, repeating edge cells at the DEM boundary
+    col, row = col[inside], row[inside]
+    col0, row0 = np.floor(col), np.floor(row)
+    fc, fr = col - col0, row - row0
+    c0 = np.clip(col0, 0, dem["cols"] - 1).astype(np.int64)
+    c1 = np.clip(col0 + 1, 0, dem["cols"] - 1).astype(np.int64)
+    r0 = np.clip(row0, 0, dem["rows"] - 1).astype(np.int64)
+    r1 = np.clip(row0 + 1, 0, dem["rows"] - 1).astype(np.int64)
+    corners = cell_values(dem, np.concatenate([r0, r0, r1, r1]), np.concatenate([c0, c1, c0, c1])).reshape(4, -1)
+    bilinear = (corners[0] * (1 - fc) + corners[1] * fc) * (1 - fr) + (corners[2] * (1 - fc) + corners[3] * fc) * fr
+
+    # Use the nearest cell where any surrounding cell is nodata
+    elevation[inside] = np.where(np.isnan(bilinear), nearest, bilinear)
+    return elevation
+
+def sample_dem(dem, x, y, method="nearest", batch_size=batch_rows):
+    """Return DEM elevations at x and y coordinates (in the DEM coordinate system).
+
+    method is "nearest" (the value of the cell containing each point, as
+    with ExtractValuesToPoints) or "bilinear".  Points outside the DEM or on
+    nodata cells are NaN.  Coordinates are processed in batches of
+    batch_size so memory use does not grow with the number of waypoints.
+    """
+    if isinstance(dem, str):
+        dem = open_dem(dem)
+    method = method.lower()
+    if method not in ("nearest", "bilinear"):
+        raise ValueError("Unsupported DEM sampling method {0}".format(method))
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    elevation = np.empty(len(x))
+    for start in range(0, len(x), batch_size):
+        stop = start + batch_size
+        elevation[start:stop] = sample_batch(dem, x[start:stop], y[start:stop], method)
+    return elevation
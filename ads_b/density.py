@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: density.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson
+    Description:  Calculates quartic kernel density surfaces for waypoints in several altitude bands at once on a shared grid
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np
+
+# Fixed local variables
+grid_divisions = 250
+square_kilometer = 1000000.0
+
+def band_masks(values, bounds):
+    """Return a boolean mask of the values in each (start, end] altitude band, as selected by Tool 5."""
+    values = np.asarray(values)
+    return [(values > start) & (values <= end) for start, end in bounds]
+
+def unit_scale(spatial_reference_type, meters_per_unit=1.0, lat=0.0, a=6378137.0, f=1 / 298.257223563):
+    """Return the meters per coordinate unit along x and y.
+
+    For a geographic coordinate system these are the lengths of a degree of
+    longitude and latitude on the ellipsoid at latitude lat, which makes
+    distances within a park-sized extent close to geodesic distances.  For
+    a projected coordinate system both are meters_per_unit.
+    """
+    if spatial_reference_type != "Geographic":
+        return float(meters_per_unit), float(meters_per_unit)
+    phi = np.radians(lat)
+    e2 = f * (2 - f)
+    w = np.sqrt(1 - e2 * np.sin(phi) ** 2)
+    return float(np.radians(1) * a * np.cos(phi) / w), float(np.radians(1) * a * (1 - e2) / w ** 3)
+
+def default_cell_size(extent):
+    """Return the default output cell size: the shorter side of the extent (xmin, ymin, xmax, ymax) divided by 250."""
+    xmin, ymin, xmax, ymax = extent
+    return min(xmax - xmin, ymax - ymin) / grid_divisions
+
+def default_radius(x, y, scale=(1.0, 1.0)):
+    """Return the default search radius (meters) for a set of points, as calculated by the Kernel Density tool.
+
+    The radius is 0.9 * min(SD, sqrt(1 / ln(2)) * Dm) * n ^ -0.2, where SD is
+    the standard distance and Dm the median distance of the points from
+    their mean center.
+    """
+    x = np.asarray(x, dtype=float) * scale[0]
+    y = np.asarray(y, dtype=float) * scale[1]
+    if len(x) == 0:
+        return 0.0
+    dx, dy = x - x.mean(), y - y.mean()
+    sd = np.sqrt((dx ** 2).mean() + (dy ** 2).mean())
+    dm = np.median(np.hypot(dx, dy))
+    return float(0.9 * min(sd, np.sqrt(1 / np.log(2)) * dm) * len(x) ** -0.2)
+
+def quartic_kernel(radius, cell_size, scale, half_width):
+    """Return quartic kernel weights (per square meter) on a grid of cell offsets out to half_width cells from the center."""
+    rows = np.arange(-half_width[1], half_width[1] + 1)[:, None] * cell_size * scale[1]
+    cols = np.arange(-half_width[0], half_width[0] + 1)[None, :] * cell_size * scale[0]
+    d2 = (rows ** 2 + cols ** 2) / radius ** 2
+    return np.where(d2 < 1, 3 / (np.pi * radius ** 2) * (1 - d2) ** 2, 0.0)
+
+def kernel_density(x, y, masks, extent, cell_size=None, radii=None, scale=(1.0, 1.0), area=square_kilometer):
+    """Return quartic kernel density surfaces for several subsets of points on a shared grid.
+
+    masks is a list of boolean masks selecting the points in each band.
+    All points are binned into one (band, row, column) array in a single
+    pass, using linear binning so each point is shared among the four
+    nearest cell centers, and each band is convolved with its kernel by FFT.
+    radii gives the search radius (meters) of each band and defaults to
+    default_radius of the band's points.  Densities are points per
+    area square meters (per square kilometer by default), matching
+    KernelDensity with the PLANAR method in a projected coordinate system
+    or, through scale, closely approximating the GEODESIC method.
+
+    Returns an array of shape (bands, rows, columns) ordered from the top
+    row down and the grid as a dictionary with the lower left corner
+    (xmin, ymin), cell_size, rows, and cols.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    xmin, ymin, xmax, ymax = extent
+    if cell_size is None:
+        cell_size = default_cell_size(extent)
+    cols = max(1, int(np.ceil((xmax - xmin) / cell_size)))
+    rows = max(1, int(np.ceil((ymax - ymin) / cell_size)))
+    ymax = ymin + rows * cell_size
+    if radii is None:
+        radii = [default_radius(x[m], y[m], scale) for m in masks]
+    bands = len(masks)
+    grid = {"xmin": float(xmin), "ymin": float(ymin), "cell_size": float(cell_size), "rows": rows, "cols": cols}
+    if bands == 0:
+        return np.zeros((0, rows, cols)), grid
+
+    # Pad the grid by the widest kernel so points near the edge and FFT wrap-around do not affect the output cells
+    halfWidths = [(int(np.ceil(r / (cell_size * scale[0]))), int(np.ceil(r / (cell_size * scale[1])))) for r in radii]
+    padX = max(w[0] for w in halfWidths) + 1
+    padY = max(w[1] for w in halfWidths) + 1
+    shape = (rows + 2 * padY, cols + 2 * padX)
+
+    # Linear binning of every band's points into one (band, row, column) count array
+    band = np.concatenate([np.full(np.count_nonzero(m), i) for i, m in enumerate(masks)])
+    points = np.concatenate([np.flatnonzero(m) for m in masks])
+    u = (x[points] - xmin) / cell_size - 0.5 + padX
+    v = (ymax - y[points]) / cell_size - 0.5 + padY
+    valid = (u >= 0) & (u < shape[1] - 1) & (v >= 0) & (v < shape[0] - 1)
+    band, u, v = band[valid], u[valid], v[valid]
+    c0, r0 = np.floor(u).astype(np.int64), np.floor(v).astype(np.int64)
+    fu, fv = u - c0, v - r0
+    counts = np.zeros(bands * shape[0] * shape[1])
+    base = (band * shape[0] + r0) * shape[1] + c0
+    for offset, weight in [(0, (1 - fu) * (1 - fv)), (1, fu * (1 - fv)), (shape[1], (1 - fu) * fv), (shape[1] + 1, fu * fv)]:
+        counts += np.bincount(base + offset, weight, minlength=len(counts))
+    counts = counts.reshape(bands, shape[0], shape[1])
+
+    # Convolve each band with its kernel, centered on the first cell so the FFT product is not shifted
+    kernels = np.zeros((bands,) + shape)
+    for i, (r, (hx, hy)) in enumerate(zip(radii, halfWidths)):
+        if r > 0:
+            kernel = quartic_kernel(r, cell_size, scale, (hx, hy))
+            kernels[i, :2 * hy + 1, :2 * hx + 1] = kernel
+            kernels[i] = np.roll(kernels[i], (-hy, -hx), axis=(0, 1))
+    density = np.fft.irfft2(np.fft.rfft2(counts) * np.fft.rfft2(kernels), s=shape)
+    density = density[:, padY:padY + rows, padX:padX + cols] * area
+
+    # Remove FFT round-off so cells beyond the search radius of every point are exactly 0
+    density[density < 1e-9 * density.max(axis=(1, 2), keepdims=True)] = 0
+    return density, grid
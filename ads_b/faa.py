@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: faa.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Builds a cached, memory-mapped lookup index from FAA Releasable Database text files and joins aircraft attributes by ICAO address
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import glob, json, os
+import numpy as np, pandas as pd
+
+# Fixed local variables
+source_files = {"MASTER": "MASTER.txt", "ACFTREF": "ACFTREF.txt"}
+master_key = "MODE_S_CODE_HEX"
+master_fields = ["N_NUMBER", "TYPE_AIRCRAFT", "TYPE_ENGINE", "TYPE_REGISTRANT", "NAME", "MFR_MDL_CODE"]
+acftref_key = "CODE"
+acftref_fields = ["MODEL"]
+faa_field_types = {"N_NUMBER": "TEXT", "TYPE_AIRCRAFT": "TEXT", "TYPE_ENGINE": "LONG", "TYPE_REGISTRANT": "LONG", "NAME": "TEXT", "MFR_MDL_CODE": "TEXT", "MODEL": "TEXT"}
+index_folder = "faa_index"
+index_version = 1
+
+def faa_sources(faa_path):
+    """Return the paths of the MASTER and ACFTREF text files for an FAA folder or geodatabase.
+
+    The text files are looked for in faa_path itself and then in the folder
+    containing it, so the files downloaded from the FAA can sit next to the
+    geodatabase they were imported into.  Returns None when either file is
+    missing.
+    """
+    for folder in [faa_path, os.path.dirname(os.path.abspath(faa_path))]:
+        if not os.path.isdir(folder):
+            continue
+        names = {os.path.basename(p).upper(): p for p in glob.glob(os.path.join(folder, "*.[tT][xX][tT]"))}
+        if all(name.upper() in names for name in source_files.values()):
+            return {table: names[name.upper()] for table, name in source_files.items()}
+    return None
+
+def source_signature(sources):
+    """Return the size and modification time of each source file, used to detect when the index is stale."""
+    return {table: [os.path.getsize(path), os.stat(path).st_mtime_ns] for table, path in sources.items()}
+
+def read_faa_text(path, fields):
+    """Read select fields from an FAA Releasable Database text file with whitespace stripped.
+
+    Header names are converted to the geodatabase field names (e.g.,
+    "MODE S CODE HEX" becomes MODE_S_CODE_HEX) and all values are text.
+    """
+    data = pd.read_csv(path, dtype=str, keep_default_na=False, encoding="utf-8-sig", encoding_errors="replace")
+    data.columns = [c.strip().upper().replace(" ", "_").replace("-", "_") for c in data.columns]
+    return data[fields].apply(lambda column: column.str.strip())
+
+def text_array(values):
+    """Return text values as a fixed-width byte string array that can be memory-mapped."""
+    return pd.Series(values).str.encode("ascii", "replace").to_numpy().astype("S")
+
+def icao_codes(icao):
+    """Return ICAO hex addresses as unsigned integers, with -1 for blank or invalid addresses."""
+    def parse(value):
+        try:
+            return int(str(value).strip(), 16)
+        except ValueError:
+            return -1
+    return np.array([parse(value) for value in icao], dtype=np.int64)
+
+def build_faa_index(sources, cache_dir):
+    """Build the lookup index from the MASTER and ACFTREF text files and save it to cache_dir.
+
+    MASTER records are keyed by the integer value of MODE_S_CODE_HEX and
+    ACFTREF records by CODE.  Each table is stored as a sorted key array and
+    one aligned array per field, all as .npy files that are memory-mapped
+    when loaded, plus an index.json holding the source file signature.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    master = read_faa_text(sources["MASTER"], [master_key] + master_fields)
+    master["key"] = icao_codes(master[master_key])
+    master = master[master["key"] >= 0].sort_values("key", kind="mergesort").drop_duplicates("key")
+    np.save(os.path.join(cache_dir, "MASTER_key.npy"), master["key"].to_numpy(np.uint32))
+    for field in master_fields:
+        np.save(os.path.join(cache_dir, "MASTER_" + field + ".npy"), text_array(master[field]))
+    acftref = read_faa_text(sources["ACFTREF"], [acftref_key] + acftref_fields)
+    acftref = acftref.sort_values(acftref_key, kind="mergesort").drop_duplicates(acftref_key)
+    np.save(os.path.join(cache_dir, "ACFTREF_key.npy"), text_array(acftref[acftref_key]))
+    for field in acftref_fields:
+        np.save(os.path.join(cache_dir, "ACFTREF_" + field + ".npy"), text_array(acftref[field]))
+    with open(os.path.join(cache_dir, "index.json"), "w") as f:
+        json.dump({"version": index_version, "sources": source_signature(sources), "records": {"MASTER": len(master), "ACFTREF": len(acftref)}}, f)
+
+def load_faa_index(cache_dir):
+    """Return the memory-mapped MASTER and ACFTREF arrays saved by build_faa_index."""
+    index = {}
+    for table, fields in [("MASTER", master_fields), ("ACFTREF", acftref_fields)]:
+        index[table] = {field: np.load(os.path.join(cache_dir, table + "_" + field + ".npy"), mmap_mode="r") for field in ["key"] + fields}
+    return index
+
+def index_is_current(sources, cache_dir):
+    """Return True when cache_dir holds an index built from the current versions of the source files."""
+    try:
+        with open(os.path.join(cache_dir, "index.json")) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return manifest.get("version") == index_version and manifest.get("sources") == source_signature(sources)
+
+def faa_index(faa_path, cache_dir=None):
+    """Return the FAA lookup index for an FAA folder or geodatabase, rebuilding it only when the text files change.
+
+    The index is cached in a faa_index folder next to the MASTER text file
+    unless cache_dir is given.  Returns None when the MASTER and ACFTREF
+    text files cannot be found.
+    """
+    sources = faa_sources(faa_path)
+    if sources is None:
+        return None
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(sources["MASTER"]), index_folder)
+    if not index_is_current(sources, cache_dir):
+        build_faa_index(sources, cache_dir)
+    return load_faa_index(cache_dir)
+
+def sorted_lookup(keys, values):
+    """Return the position of each value in a sorted key array, or -1 where the value is not present."""
+    values = np.asarray(values)
+    if len(keys) == 0:
+        return np.full(len(values), -1)
+    pos = np.minimum(np.searchsorted(keys, values), len(keys) - 1)
+    return np.where(np.asarray(keys[pos]) == values, pos, -1)
+
+def faa_lookup(icao, index, fields=None):
+    """Return FAA attributes for each distinct ICAO address as a DataFrame indexed by ICAO_address.
+
+    Only the distinct addresses are looked up, first in MASTER and then in
+    ACFTREF through MFR_MDL_CODE.  Addresses not found in the FAA database
+    have null values, as with a geodatabase table join.  LONG fields in
+    faa_field_types are returned as integers.
+    """
+    if fields is None:
+        fields = master_fields + acftref_fields
+    addresses = pd.unique(pd.Series(icao, dtype=object))
+    master = index["MASTER"]
+    codes = icao_codes(addresses)
+    pos = sorted_lookup(master["key"], np.where(codes >= 0, codes, 0).astype(np.uint32))
+    pos[codes < 0] = -1
+    found = pos >= 0
+    attributes = pd.DataFrame(index=pd.Index(addresses, name="ICAO_address"))
+    for field in master_fields:
+        values = np.full(len(addresses), None, dtype=object)
+        values[found] = np.char.decode(np.asarray(master[field][pos[found]]), "ascii")
+        attributes[field] = values
+    acftref = index["ACFTREF"]
+    mfrCodes = attributes["MFR_MDL_CODE"].fillna("").to_numpy().astype(str)
+    acftPos = sorted_lookup(acftref["key"], np.char.encode(mfrCodes, "ascii"))
+    for field in acftref_fields:
+        values = np.full(len(addresses), None, dtype=object)
+        values[acftPos >= 0] = np.char.decode(np.asarray(acftref[field][acftPos[acftPos >= 0]]), "ascii")
+        attributes[field] = values
+    attributes = attributes[fields].replace("", None)
+    for field in fields:
+        if faa_field_types[field] == "LONG":
+            attributes[field] = pd.to_numeric(attributes[field], errors="coerce").astype("Int64")
+    return attributes
+
+def faa_values(icao, index, fields=None):
+    """Return a dictionary mapping each distinct ICAO address to a list of FAA attribute values (None when null).
+
+    This is the in-memory side of a hash join and is meant to be used with
+    an arcpy.da.UpdateCursor to write FAA attributes in one pass.
+    """
+    attributes = faa_lookup(icao, index, fields)
+    return dict(zip(attributes.index, cursor_rows(attributes)))
+
+def cursor_rows(table):
+    """Return the rows of a DataFrame as lists with null values as None, ready for an arcpy.da cursor."""
+    table = table.astype(object)
+    table = table.where(table.notna(), None)
+    return [list(values) for values in table.itertuples(index=False, name=None)]
+
+def aircraft_table(icao, flight_id, index=None, fields=None):
+    """Return a table with one row per aircraft holding its waypoint and flight counts and FAA attributes.
+
+    FAA attributes are resolved once per ICAO address from the lookup index
+    (and omitted when index is None), so waypoint tables only need to carry
+    ICAO_address as a key to the aircraft table.
+    """
+    waypoints = pd.DataFrame({"ICAO_address": pd.Series(icao, dtype=object), "flight_id": pd.Series(flight_id, dtype=object)})
+    table = waypoints.groupby("ICAO_address", sort=True).agg(WAYPOINTS=("flight_id", "size"), FLIGHTS=("flight_id", "nunique"))
+    if index is not None:
+        table = table.join(faa_lookup(table.index, index, fields))
+    return table.reset_index()
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: flights.py
+    Author: Shawn Hutchinson
+    Credits: Damon Joyce, Shawn Hutchinson, Brian Peterson, Myles Cramer, Davyd Betchkal
+    Description:  Sorts and simplifies cleaned ADS-B waypoints and segments them into unique flights
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+from .schema import category_codes, icao_text
+
+# Fixed local variables
+simplify_fields = ["ICAO_address", "lat", "lon", "altitude", "heading", "SITE"]
+
+def sort_order(icao, time):
+    """Return the row order that sorts waypoints by ICAO address and time, or None when they are already sorted.
+
+    Aircraft are ranked once (as uint32 codes or text) and rows are grouped
+    by rank with a stable radix sort, which takes linear time.  Loggers
+    write records in close to time order, so within each aircraft the times
+    are then usually already sorted and nothing more is done; otherwise
+    the grouped rows are sorted by one int64 key packing the aircraft rank
+    above the time, where the stable sort takes advantage of the runs that
+    are already in order.  Rows with the same ICAO address and time keep
+    their input order, as with a stable sort on both fields.
+    """
+    codes, uniques = pd.factorize(np.asarray(icao), sort=True)
+    time = np.asarray(time, dtype="datetime64[ns]").view(np.int64)
+    if len(codes) < 2:
+        return None
+
+    # Missing addresses rank after every aircraft, as with sort_values
+    codes = np.where(codes < 0, len(uniques), codes)
+    groups = int(codes.max()) + 1
+    if (codes[1:] >= codes[:-1]).all() and not ((time[1:] < time[:-1]) & (codes[1:] == codes[:-1])).any():
+        return None
+    order = np.argsort(codes.astype(np.uint16) if groups <= np.iinfo(np.uint16).max else codes, kind="stable")
+    codes, time = np.repeat(np.arange(groups), np.bincount(codes, minlength=groups)), time[order]
+    if not ((time[1:] < time[:-1]) & (codes[1:] == codes[:-1])).any():
+        return order
+    tmin = int(time.min())
+    span = int(time.max()) - tmin + 1
+    if groups * span < np.iinfo(np.int64).max:
+        return order[np.argsort(codes.astype(np.int64) * span + (time - tmin), kind="stable")]
+    return order[np.lexsort((time, codes))]
+
+def sort_waypoints(data):
+    """Sort records by ICAO_address and TIME with sort_order then reset the dataframe index."""
+    order = sort_order(data["ICAO_address"], data["TIME"])
+    if order is not None:
+        data = data.take(order)
+    return data.reset_index(drop=True)
+
+def simplify_waypoints(data):
+    """Remove rows repeating the previous row's position, heading, and site.
+
+    Returns the simplified records and the percentage of records removed.
+    """
+    preSimplify = len(data)
+    data = data.loc[(data[simplify_fields].shift() != data[simplify_fields]).any(axis=1)]
+    postSimplify = len(data)
+    percentSimplify = ((preSimplify - postSimplify) / preSimplify) * 100
+    return data, percentSimplify
+
+def segment_index(icao, time, dur_threshold, date=None):
+    """Split waypoints sorted by ICAO address and time into flights in a single pass.
+
+    A new flight starts at the first waypoint of each aircraft, whenever
+    the time since the previous waypoint is at least dur_threshold seconds,
+    and (when date is given) whenever the DATE value changes.  Returns the
+    flight code of every row, the start/stop offsets of each flight (flight
+    k spans rows offsets[k]:offsets[k + 1]), and the zero-based number of
+    each flight within its aircraft used in flight IDs.
+    """
+    icao = np.asarray(icao)
+    time = np.asarray(time, dtype="datetime64[ns]").view(np.int64)
+    n = len(icao)
+    new_aircraft = np.ones(n, dtype=bool)
+    new_aircraft[1:] = icao[1:] != icao[:-1]
+    gap = np.zeros(n, dtype=bool)
+    gap[1:] = np.diff(time) >= int(dur_threshold) * 10**9
+    gap[new_aircraft] = int(dur_threshold) <= 0
+    new_flight = new_aircraft | gap
+    if date is not None:
+        date = np.asarray(date)
+        new_flight[1:] |= date[1:] != date[:-1]
+    starts = np.flatnonzero(new_flight)
+    offsets = np.append(starts, n)
+    codes = np.cumsum(new_flight) - 1
+
+    # Number flights within each aircraft by counting time gaps since the aircraft's first waypoint
+    gaps = np.cumsum(gap)
+    aircraft_start = np.maximum.accumulate(np.where(new_aircraft, np.arange(n), 0))
+    numbers = (gaps - gaps[aircraft_start] + gap[aircraft_start])[starts]
+    return codes, offsets, numbers
+
+def multi_waypoint_flights(offsets):
+    """Return the row mask and re-based offsets after removing flights with a single waypoint."""
+    sizes = np.diff(offsets)
+    keep = np.repeat(sizes > 1, sizes)
+    kept_sizes = sizes[sizes > 1]
+    return keep, np.append(0, np.cumsum(kept_sizes)), sizes > 1
+
+def offsets_from_ids(flight_ids):
+    """Return flight start/stop offsets for rows already grouped by flight ID."""
+    flight_ids = np.asarray(flight_ids)
+    change = np.ones(len(flight_ids), dtype=bool)
+    change[1:] = flight_ids[1:] != flight_ids[:-1]
+    return np.append(np.flatnonzero(change), len(flight_ids))
+
+def format_flight_ids(icao, numbers, date):
+    """Return flight IDs (ICAO address + "_" + flight number + "_" + DATE) for one row per flight."""
+    return np.array([i + "_" + str(k) + "_" + d for i, k, d in zip(icao, numbers, date)], dtype=object)
+
+def segment_flights(data, dur_threshold, return_offsets=False):
+    """Assign a flight_id to sorted waypoints and remove single-waypoint flights.
+
+    A new flight by the same aircraft starts whenever the time between two
+    sequential waypoints is at least dur_threshold seconds.  Flight IDs use
+    the convention ICAO_address + "_" + zero-based flight index + "_" + DATE
+    and are formatted once per flight.  When return_offsets is True the
+    start/stop offsets of each flight in the returned rows are also
+    returned, so later stages can slice flights without grouping again.
+    flight_id is stored as a categorical with one category per flight, and
+    uint32 ICAO addresses are formatted as hex text in the flight IDs.
+    """
+    codes, offsets, numbers = segment_index(data["ICAO_address"], data["TIME"], dur_threshold, category_codes(data["DATE"]))
+    keep, kept_offsets, kept_flights = multi_waypoint_flights(offsets)
+    starts = offsets[:-1][kept_flights]
+    icao = data["ICAO_address"].to_numpy()[starts]
+    if np.issubdtype(icao.dtype, np.integer):
+        icao = icao_text(icao)
+    flight_ids = format_flight_ids(icao, numbers[kept_flights], np.asarray(data["DATE"])[starts])
+    flightCodes, flightNames = pd.factorize(flight_ids)
+    data = data[keep].copy()
+    data["flight_id"] = pd.Categorical.from_codes(np.repeat(flightCodes, np.diff(kept_offsets)), flightNames)
+    if return_offsets:
+        return data, kept_offsets
+    return data
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: formats.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Writes and reads processed ADS-B waypoint files as CSV or typed columnar files (Parquet, Feather, or compressed NumPy archives)
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import os
+import numpy as np, pandas as pd
+from .schema import text_waypoints
+
+# Fixed local variables
+output_formats = {"CSV": ".csv", "PARQUET": ".parquet", "FEATHER": ".feather", "NPZ": ".npz"}
+float32_fields = ["heading", "hor_velocity", "ver_velocity"]
+text_fields = ["ICAO_address", "SITE", "DATE", "flight_id"]
+
+def file_format(path):
+    """Return the output format name (CSV, PARQUET, FEATHER, or NPZ) for a file path."""
+    ext = os.path.splitext(path)[1].lower()
+    for fmt, fmt_ext in output_formats.items():
+        if ext == fmt_ext:
+            return fmt
+    raise ValueError("Unsupported waypoint file type {0}".format(ext))
+
+def typed_waypoints(data):
+    """Return waypoints with native column types and no index for columnar output.
+
+    TIME is stored as datetime64, heading and velocities as float32, and
+    text fields (including uint32 ICAO addresses and categorical fields) as
+    strings.  Coordinates and altitude stay float64 because they feed
+    geometry and whole-foot altitude conversions downstream.
+    """
+    data = text_waypoints(data.reset_index(drop=True))
+    data["TIME"] = pd.to_datetime(data["TIME"])
+    for field in float32_fields:
+        if field in data.columns:
+            data[field] = data[field].astype(np.float32)
+    for field in text_fields:
+        if field in data.columns:
+            data[field] = data[field].astype(str)
+    return data
+
+def write_waypoints(data, path):
+    """Write processed waypoints in the format given by the file extension.
+
+    CSV output keeps the index column written by Tool 1 for compatibility
+    with existing workflows; columnar formats store typed columns only.
+    ICAO addresses held as uint32 values are written as hex text.
+    Parquet and Feather require the optional pyarrow package.
+    """
+    fmt = file_format(path)
+    if fmt == "CSV":
+        text_waypoints(data).to_csv(path)
+    elif fmt == "NPZ":
+        np.savez_compressed(path, **columns_to_arrays(typed_waypoints(data)))
+    elif fmt == "PARQUET":
+        typed_waypoints(data).to_parquet(path, index=False)
+    else:
+        typed_waypoints(data).to_feather(path)
+
+def read_waypoints(path):
+    """Read processed waypoints written by write_waypoints (or a Tool 1 CSV) into a DataFrame."""
+    fmt = file_format(path)
+    if fmt == "CSV":
+        return pd.read_csv(path, index_col=0, parse_dates=["TIME"], dtype={field: str for field in text_fields})
+    if fmt == "NPZ":
+        with np.load(path, allow_pickle=False) as archive:
+            return pd.DataFrame({field: archive[field] for field in archive.files})
+    if fmt == "PARQUET":
+        return pd.read_parquet(path)
+    return pd.read_feather(path)
+
+def columns_to_arrays(data):
+    """Return a dictionary of NumPy arrays, one per field, with text stored as fixed-width unicode."""
+    arrays = {}
+    for field in data.columns:
+        values = data[field].to_numpy()
+        if values.dtype == object:
+            values = values.astype(str)
+        elif np.issubdtype(values.dtype, np.datetime64):
+            values = values.astype("datetime64[us]")
+        arrays[field] = values
+    return arrays
+
+def to_structured_array(data):
+    """Return waypoints as a NumPy structured array suitable for arcpy.da.NumPyArrayToTable."""
+    arrays = columns_to_arrays(data)
+    array = np.empty(len(data), dtype=[(field, values.dtype) for field, values in arrays.items()])
+    for field, values in arrays.items():
+        array[field] = values
+    return array
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: geometry.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Prepares buffered park boundary polygons for fast point-in-polygon tests of waypoint coordinate arrays
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np
+
+# Fixed local variables
+grid_cells = 256
+chunk_pairs = 4000000
+
+def rings_from_wkb(wkb):
+    """Return the rings of a WKB Polygon or MultiPolygon (as written by SHAPE@WKB) as a list of (n, 2) coordinate arrays.
+
+    Z and M values are dropped.  Curves in geodatabase polygons are
+    densified by ArcGIS when geometry is exported as WKB.
+    """
+    wkb = bytes(wkb)
+    rings = []
+
+    def read_polygon(pos):
+        order = "<" if wkb[pos] == 1 else ">"
+        geomType = int(np.frombuffer(wkb, order + "u4", 1, pos + 1)[0])
+        isoType = geomType & 0x0FFFFFFF
+        dims = 2 + (bool(geomType & 0x80000000) or isoType // 1000 in (1, 3)) + (bool(geomType & 0x40000000) or isoType // 1000 in (2, 3))
+        pos += 5
+        count = int(np.frombuffer(wkb, order + "u4", 1, pos)[0])
+        pos += 4
+        if isoType % 1000 == 6:
+            for i in range(count):
+                pos = read_polygon(pos)
+            return pos
+        for i in range(count):
+            points = int(np.frombuffer(wkb, order + "u4", 1, pos)[0])
+            coords = np.frombuffer(wkb, order + "f8", points * dims, pos + 4).reshape(points, dims)
+            rings.append(coords[:, :2].astype(float))
+            pos += 4 + points * dims * 8
+        return pos
+
+    read_polygon(0)
+    return rings
+
+def ring_edges(rings):
+    """Return the start and end coordinates of every edge in a list of rings, closing rings as needed."""
+    x1, y1, x2, y2 = [], [], [], []
+    for ring in rings:
+        ring = np.asarray(ring, dtype=float)
+        if len(ring) and not np.array_equal(ring[0], ring[-1]):
+            ring = np.vstack([ring, ring[:1]])
+        x1.append(ring[:-1, 0])
+        y1.append(ring[:-1, 1])
+        x2.append(ring[1:, 0])
+        y2.append(ring[1:, 1])
+    return [np.concatenate(v) if v else np.empty(0) for v in (x1, y1, x2, y2)]
+
+def band_crossings(prepared, x, y):
+    """Return True for points inside the polygon by counting ray crossings with the edges in each point's y-band."""
+    x1, y1, x2, y2 = prepared["edges"]
+    ymin, bandHeight, bands = prepared["ymin"], prepared["band_height"], len(prepared["band_offsets"]) - 1
+    pointBands = np.clip(((y - ymin) / bandHeight).astype(np.int64), 0, bands - 1)
+    order = np.argsort(pointBands, kind="stable")
+    bandStarts = np.searchsorted(pointBands[order], np.arange(bands + 1))
+    inside = np.zeros(len(x), dtype=bool)
+    for band in np.flatnonzero(np.diff(bandStarts)):
+        edges = prepared["band_edges"][prepared["band_offsets"][band]:prepared["band_offsets"][band + 1]]
+        if len(edges) == 0:
+            continue
+        ex1, ey1, ex2, ey2 = x1[edges], y1[edges], x2[edges], y2[edges]
+        points = order[bandStarts[band]:bandStarts[band + 1]]
+        step = max(1, chunk_pairs // len(edges))
+        for start in range(0, len(points), step):
+            p = points[start:start + step]
+            px, py = x[p, None], y[p, None]
+            straddles = (ey1 > py) != (ey2 > py)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                crossX = ex1 + (py - ey1) * (ex2 - ex1) / (ey2 - ey1)
+            inside[p] = (np.count_nonzero(straddles & (px < crossX), axis=1) % 2) == 1
+    return inside
+
+def prepare_polygon(rings, cells=grid_cells):
+    """Prepare a polygon (a list of exterior and hole rings) for repeated point-in-polygon tests.
+
+    Edges are indexed by horizontal bands so each test only considers the
+    edges that can cross a point's ray, and a cells x cells grid over the
+    polygon's bounding box records which cells are entirely inside, entirely
+    outside, or crossed by the boundary.  Only points in boundary cells need
+    an exact edge test.  Holes and multipart polygons follow the even-odd
+    rule.
+    """
+    x1, y1, x2, y2 = ring_edges(rings)
+    xmin, xmax = min(x1.min(), x2.min()), max(x1.max(), x2.max())
+    ymin, ymax = min(y1.min(), y2.min()), max(y1.max(), y2.max())
+    cellWidth = (xmax - xmin) / cells or 1.0
+    cellHeight = (ymax - ymin) / cells or 1.0
+
+    # Index edges by the horizontal bands (grid rows) spanned by each edge
+    b0 = np.clip(((np.minimum(y1, y2) - ymin) / cellHeight).astype(np.int64), 0, cells - 1)
+    b1 = np.clip(((np.maximum(y1, y2) - ymin) / cellHeight).astype(np.int64), 0, cells - 1)
+    spans = b1 - b0 + 1
+    edgeIds = np.repeat(np.arange(len(x1)), spans)
+    edgeBands = np.repeat(b0, spans) + (np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans))
+    order = np.argsort(edgeBands, kind="stable")
+    prepared = {"edges": (x1, y1, x2, y2), "bbox": (xmin, ymin, xmax, ymax), "ymin": ymin, "band_height": cellHeight, "cell_width": cellWidth, "cells": cells,
+                "band_edges": edgeIds[order], "band_offsets": np.searchsorted(edgeBands[order], np.arange(cells + 1))}
+
+    # Mark grid cells touched by an edge bounding box as boundary cells, then classify the remaining cells by their centers
+    c0 = np.clip(((np.minimum(x1, x2) - xmin) / cellWidth).astype(np.int64), 0, cells - 1)
+    c1 = np.clip(((np.maximum(x1, x2) - xmin) / cellWidth).astype(np.int64), 0, cells - 1)
+    boundary = np.zeros((cells, cells), dtype=bool)
+    for r0, r1, cc0, cc1 in zip(b0, b1, c0, c1):
+        boundary[r0:r1 + 1, cc0:cc1 + 1] = True
+    rows, cols = np.nonzero(~boundary)
+    state = np.full((cells, cells), 2, dtype=np.int8)
+    state[rows, cols] = band_crossings(prepared, xmin + (cols + 0.5) * cellWidth, ymin + (rows + 0.5) * cellHeight)
+    prepared["state"] = state
+    return prepared
+
+def points_in_polygon(prepared, x, y):
+    """Return a boolean mask of the points (x, y arrays) that fall inside a prepared polygon.
+
+    Points outside the bounding box are rejected first, points in grid
+    cells entirely inside or outside the polygon are resolved from the grid,
+    and only the remaining points are tested against nearby edges.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    xmin, ymin, xmax, ymax = prepared["bbox"]
+    cells = prepared["cells"]
+    mask = np.zeros(len(x), dtype=bool)
+    candidates = np.flatnonzero((x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax))
+    cx, cy = x[candidates], y[candidates]
+    cols = np.clip(((cx - xmin) / prepared["cell_width"]).astype(np.int64), 0, cells - 1)
+    rows = np.clip(((cy - ymin) / prepared["band_height"]).astype(np.int64), 0, cells - 1)
+    state = prepared["state"][rows, cols]
+    mask[candidates[state == 1]] = True
+    edge = state == 2
+    mask[candidates[edge]] = band_crossings(prepared, cx[edge], cy[edge])
+    return mask
+
+def buffer_mask(geometries, x, y):
+    """Return a boolean mask of the points inside any of a list of WKB polygons (e.g., the features of a buffer).
+
+    Each polygon is prepared separately so that overlapping buffer features
+    are combined as a union rather than by the even-odd rule.
+    """
+    mask = np.zeros(len(x), dtype=bool)
+    for geometry in geometries:
+        mask |= points_in_polygon(prepare_polygon(rings_from_wkb(geometry)), x, y)
+    return mask
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: merge.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Tracks the daily waypoint and flightline feature classes already merged into a season and the keys of the merged features so new days can be appended without duplicates
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import json, os
+import numpy as np, pandas as pd
+from .dedup import key_columns, key_hashes
+
+# Fixed local variables
+waypoint_key_fields = ["ICAO_address", "lat", "lon", "DATE", "altitude"]
+flightline_key_fields = ["flight_id", "LengthMiles", "Sinuosity"]
+manifest_version = 2
+fingerprint_dtype = np.dtype([("hash", "<u8"), ("check", "<u8")])
+check_hash_key = "ads_b_merge_chk1"
+
+def manifest_path(output):
+    """Return the manifest file for a merged feature class, stored next to the geodatabase holding it.
+
+    For C:/ADSB/Season.gdb/Points the manifest is
+    C:/ADSB/Season.gdb_Points.merge.json, with the key index alongside it
+    in C:/ADSB/Season.gdb_Points.merge.npy.
+    """
+    workspace, name = os.path.split(os.path.abspath(output))
+    return workspace + "_" + name + ".merge.json"
+
+def index_path(manifest):
+    """Return the key index file that accompanies a manifest file."""
+    return os.path.splitext(manifest)[0] + ".npy"
+
+def read_manifest(path):
+    """Return the manifest and key index for a merged feature class, or (None, None) when either is missing or out of date."""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+        keys = np.load(index_path(path))
+    except (OSError, ValueError):
+        return None, None
+    if manifest.get("version") != manifest_version or manifest.get("keys") != len(keys):
+        return None, None
+    return manifest, keys
+
+def write_manifest(path, inputs, keys):
+    """Save the merged inputs (a dictionary of feature class name to row count) and the sorted key index.
+
+    The key index is written first so that a manifest never refers to keys
+    that were not saved.
+    """
+    temp = index_path(path) + ".tmp.npy"
+    np.save(temp, keys)
+    os.replace(temp, index_path(path))
+    with open(path + ".tmp", "w") as f:
+        json.dump({"version": manifest_version, "keys": len(keys), "inputs": inputs}, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+def new_inputs(manifest, inputs):
+    """Return the inputs not yet merged, or None when a merged input was removed or its row count changed.
+
+    inputs is a dictionary of feature class name to row count for the
+    daily feature classes now in the workspace.  A return of None means the
+    merged feature class no longer matches its inputs and must be rebuilt.
+    """
+    merged = manifest["inputs"]
+    for name, rows in merged.items():
+        if inputs.get(name) != rows:
+            return None
+    return [name for name in inputs if name not in merged]
+
+def key_fingerprints(data, fields):
+    """Return a 128-bit fingerprint of the key fields of each row: key_hashes plus a second hash of the keys computed with a different hash key.
+
+    Two keys are taken to match only when both hashes match, so a false
+    match needs two independent 64-bit hashes to collide at once
+    (probability about n * n / 2 ** 129 for n keys).
+    """
+    fingerprints = np.empty(len(data), dtype=fingerprint_dtype)
+    fingerprints["hash"] = key_hashes(data, fields)
+    fingerprints["check"] = pd.util.hash_pandas_object(key_columns(data, fields), index=False, hash_key=check_hash_key).to_numpy()
+    return fingerprints
+
+def key_index(hashes):
+    """Return the sorted, distinct key fingerprints (from key_fingerprints) of the features in a merged feature class."""
+    return np.unique(np.asarray(hashes, dtype=fingerprint_dtype))
+
+def append_keys(index, hashes):
+    """Return a mask of the rows to append and the updated sorted key index.
+
+    hashes are the key_fingerprints of the new rows.  A row is kept when
+    its fingerprint is not in index (the sorted fingerprints of the
+    features already merged) and is the first row with that fingerprint in
+    hashes, so the cost of each append depends on the new rows only, apart
+    from the merge of the two sorted arrays.  Keys themselves are not kept
+    in the index, so a new row is wrongly skipped only if both of its
+    64-bit hashes collide with those of a different merged key.
+    """
+    hashes = np.asarray(hashes, dtype=fingerprint_dtype)
+    first = np.zeros(len(hashes), dtype=bool)
+    first[np.unique(hashes, return_index=True)[1]] = True
+    if len(index):
+        pos = np.minimum(np.searchsorted(index, hashes), len(index) - 1)
+        first &= index[pos] != hashes
+    added = np.sort(hashes[first])
+    merged = np.empty(len(index) + len(added), dtype=fingerprint_dtype)
+    positions = np.searchsorted(index, added) + np.arange(len(added))
+    inserted = np.zeros(len(merged), dtype=bool)
+    inserted[positions] = True
+    merged[inserted] = added
+    merged[~inserted] = index
+    return first, merged
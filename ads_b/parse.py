@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: parse.py
+    Author: Shawn Hutchinson
+    Credits: Damon Joyce, Shawn Hutchinson, Brian Peterson, Myles Cramer, Davyd Betchkal
+    Description:  Reads raw ADS-B logger TSV files, checks for the required header, standardizes field names, and unpacks the validFlags field
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Create custom error class
+class HeaderError(Exception):
+    pass
+
+# Import libraries
+import numpy as np, pandas as pd
+
+# Fixed local variables
+header_list = ["TIME", "timestamp"]
+flags_names = ["valid_BARO", "valid_VERTICAL_VELOCITY", "SIMULATED_REPORT", "valid_IDENT", "valid_CALLSIGN", "valid_VELOCITY", "valid_HEADING", "valid_ALTITUDE", "valid_LATLON"]
+text_fields = {"ICAO_address": str, "validFlags": str, "valid_flags": str}
+field_names = {"timestamp": "TIME", "valid_flags": "validFlags", "altitude_type": "altType", "alt_type": "altType"}
+unused_fields = ["squawk", "callsign", "emitter_type", "emitterType"]
+
+def read_logger_file(input_file, chunk_size=None):
+    """Return an iterable of DataFrames read from a raw logger TSV file.
+
+    The whole file is returned as a single DataFrame unless chunk_size is
+    given, in which case blocks of at most chunk_size rows are read lazily.
+    ICAO addresses and validFlags are always read as text so every chunk
+    parses them identically.
+    """
+    # How the pandas read_csv function checks for and warns users of bad lines changed at version 1.3.
+    # The initial pandas version check ensures users running ArcGIS 2.x and 3.x can both run the script.
+    pd_version = float(pd.__version__[:-2])
+    if (pd_version < 1.3):
+        reader = pd.read_csv(input_file, sep="\t", low_memory=False, dtype=text_fields, chunksize=chunk_size, error_bad_lines=False, warn_bad_lines=True)
+    else:
+        reader = pd.read_csv(input_file, sep="\t", low_memory=False, dtype=text_fields, chunksize=chunk_size, on_bad_lines="warn")
+    if chunk_size is None:
+        return [reader]
+    return reader
+
+def check_header(data):
+    """Remove repeated header rows and raise HeaderError if the file has no text header."""
+    mask = data.iloc[:, 0].isin(header_list)
+    data = data[~mask]
+    if not any(elem in data.columns for elem in header_list):
+        raise HeaderError
+    return data
+
+def standardize_fields(data):
+    """Rename logger-specific field names to standard names and remove unused fields."""
+    data = data.rename(columns={k: v for k, v in field_names.items() if k in data.columns})
+    return data.drop(unused_fields, axis=1, errors="ignore")
+
+def decode_valid_flags(valid_flags):
+    """Unpack a column of hex validFlags strings into nine boolean columns.
+
+    Each distinct hex string is parsed once and the low nine bits are then
+    extracted for every row with bitwise operations, so the cost no longer
+    grows with a Python call per row.  Bit 8 maps to valid_BARO and bit 0
+    to valid_LATLON, matching bin(int(t, 16))[2:].zfill(9)[-9:].
+    """
+    codes, uniques = pd.factorize(valid_flags)
+    if (codes < 0).any():
+        raise ValueError("validFlags contains missing values")
+    values = np.array([int(str(u), 16) & 0x1FF for u in uniques], dtype=np.uint16)[codes]
+    shifts = np.arange(len(flags_names) - 1, -1, -1, dtype=np.uint16)
+    bits = ((values[:, np.newaxis] >> shifts) & 1).astype(bool)
+    return pd.DataFrame(bits, columns=flags_names, index=valid_flags.index)
+
+def unpack_valid_flags(data):
+    """Replace the validFlags field with the nine decoded boolean flag fields."""
+    flags_df = decode_valid_flags(data["validFlags"])
+    return pd.concat([data.drop("validFlags", axis=1), flags_df], axis=1)
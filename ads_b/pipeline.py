@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: pipeline.py
+    Author: Shawn Hutchinson
+    Credits: Damon Joyce, Shawn Hutchinson, Brian Peterson, Myles Cramer, Davyd Betchkal
+    Description:  Runs the complete Tool 1 processing chain on a raw ADS-B logger file without ArcGIS
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import os
+from .parse import read_logger_file
+from .clean import clean_logger_file, qaqc_percentages, remove_duplicates
+from .flights import segment_flights, simplify_waypoints, sort_waypoints
+from .formats import output_formats
+
+def output_file_name(park_name, logger_name, input_file, output_format="CSV"):
+    """Return the Tool 1 output file name for a raw logger file in the given output format."""
+    base = os.path.basename(input_file)
+    return "ADSB_" + park_name + "_" + logger_name + "_" + os.path.splitext(base)[0] + output_formats[output_format.upper()]
+
+def output_csv_name(park_name, logger_name, input_file):
+    """Return the Tool 1 output CSV file name for a raw logger file."""
+    return output_file_name(park_name, logger_name, input_file)
+
+def process_logger_file(input_file, logger_name, dur_threshold, chunk_size=None):
+    """Clean a raw logger TSV file and segment its waypoints into flights.
+
+    Returns the processed waypoints, ready to be written to CSV, and a
+    dictionary of QA/QC percentages and aircraft and flight totals matching
+    the messages reported by Tool 1.  The row counts behind the
+    percentages (keyed by count_names, plus waypoints and
+    duplicate_waypoints) are kept separately under "counts" so results
+    from several files can be combined.
+    """
+    data, counts = clean_logger_file(read_logger_file(input_file, chunk_size), logger_name)
+    summary = qaqc_percentages(counts, "altType" in data.columns)
+    summary["counts"] = dict(counts)
+    summary["counts"]["waypoints"] = len(data)
+    data, summary["duplicates"] = remove_duplicates(data)
+    summary["counts"]["duplicate_waypoints"] = summary["counts"]["waypoints"] - len(data)
+    data = sort_waypoints(data)
+    data, summary["simplified"] = simplify_waypoints(data)
+    data = segment_flights(data, dur_threshold)
+    summary["flights"] = data["flight_id"].nunique()
+    summary["aircraft"] = data["ICAO_address"].nunique()
+    return data, summary
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: schema.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Defines the compact in-memory column types of cleaned waypoint tables and converts ICAO addresses, dates, and codes back to text for output
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+
+# Fixed local variables
+waypoint_schema = {"TIME": "datetime64", "ICAO_address": "uint32", "lat": "float64", "lon": "float64", "altitude": "float64", "altType": "int16",
+                   "heading": "float32", "hor_velocity": "float32", "ver_velocity": "float32", "SITE": "category", "DATE": "category", "flight_id": "category"}
+category_fields = [field for field, dtype in waypoint_schema.items() if dtype == "category"]
+non_icao_bit = 1 << 24
+invalid_icao = 0xFFFFFFFF
+
+def parse_icao(value):
+    """Return the integer of one ICAO hex address, with non_icao_bit set for a "~" (non-ICAO) address, or invalid_icao when it is not 1-6 hex digits."""
+    text = str(value).strip()
+    flag = 0
+    if text.startswith("~"):
+        text, flag = text[1:], non_icao_bit
+    if not 0 < len(text) <= 6:
+        return invalid_icao
+    try:
+        return int(text, 16) | flag
+    except ValueError:
+        return invalid_icao
+
+def icao_integers(icao):
+    """Return ICAO hex addresses as uint32 values, with invalid_icao for missing or invalid addresses.
+
+    Each distinct address is parsed once.  Upper and lower case spellings
+    of an address, and addresses with or without leading zeros, give the
+    same value, so they are treated as one aircraft.
+    """
+    codes, uniques = pd.factorize(np.asarray(icao, dtype=object))
+    values = np.array([parse_icao(u) for u in uniques] + [invalid_icao], dtype=np.uint32)
+    return values[codes]
+
+def icao_text(icao):
+    """Return uint32 ICAO addresses as six digit upper case hex text, prefixed with "~" for non-ICAO addresses."""
+    codes, uniques = pd.factorize(np.asarray(icao))
+    text = np.array(["{0}{1:06X}".format("~" if u & non_icao_bit else "", u & (non_icao_bit - 1)) for u in uniques.tolist()] + [""], dtype=object)
+    return text[codes]
+
+def date_categories(time):
+    """Return the yyyyMMdd DATE of each datetime as a categorical, formatting each calendar day once."""
+    days = np.asarray(time, dtype="datetime64[D]")
+    codes, uniques = pd.factorize(days, sort=True)
+    return pd.Categorical.from_codes(codes, [str(day).replace("-", "") for day in np.asarray(uniques, dtype="datetime64[D]")])
+
+def constant_category(value, size):
+    """Return a categorical repeating one value (e.g., the SITE name) size times."""
+    return pd.Categorical.from_codes(np.zeros(size, dtype=np.int8), [value])
+
+def category_codes(values):
+    """Return the integer codes of a categorical Series, or the values of any other Series, for fast comparisons between rows."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy()
+    return values.to_numpy()
+
+def compact_waypoints(data):
+    """Apply the waypoint_schema types to the fields of a waypoint table that it has, except TIME and ICAO_address, which are converted when they are parsed."""
+    types = {field: dtype for field, dtype in waypoint_schema.items() if field in data.columns and field not in ["TIME", "ICAO_address"]}
+    return data.astype(types)
+
+def concat_waypoints(frames):
+    """Concatenate waypoint tables, combining the categories of each categorical field so the result stays categorical."""
+    frames = list(frames)
+    for field in category_fields:
+        if all(field in frame.columns and isinstance(frame[field].dtype, pd.CategoricalDtype) for frame in frames):
+            categories = pd.api.types.union_categoricals([frame[field] for frame in frames], sort_categories=True).categories
+            frames = [frame.assign(**{field: frame[field].cat.set_categories(categories)}) for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
+def text_waypoints(data):
+    """Return waypoints with ICAO_address as hex text for output files.
+
+    Addresses are written in the normalized form of icao_text, as six upper
+    case hex digits, so an address logged as 2296f0 is written as 2296F0
+    (and its flight_id starts with 2296F0).  Files whose addresses were
+    logged that way are unchanged.
+    """
+    if "ICAO_address" in data.columns and np.issubdtype(data["ICAO_address"].dtype, np.integer):
+        data = data.assign(ICAO_address=icao_text(data["ICAO_address"]))
+    return data
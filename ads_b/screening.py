@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: screening.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson
+    Description:  Parses screening parameters and identifies flightlines suspected of being unrelated to tourism operations
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+
+# Fixed local variables
+screening_fields = ["flight_id", "TYPE_REGISTRANT", "Sinuosity", "NAME", "LengthMiles"]
+
+def parse_registrant_values(registrantValues):
+    """Return the single-digit TYPE_REGISTRANT codes in a user-supplied string (e.g., "5", "1, 5", or "1;5"), ignoring any separators."""
+    return [n for n in registrantValues if n in "0123456789"]
+
+def parse_sinuosity_values(sinuosityValues):
+    """Return the minimum and maximum sinuosity values in a user-supplied string (e.g., "0.10, 0.99")."""
+    splitSinuosityValues = [n.strip() for n in sinuosityValues.split(",")]
+    return float(splitSinuosityValues[0]), float(splitSinuosityValues[1])
+
+def parse_name_values(nameValues):
+    """Return the operator names in a user-supplied comma-separated string."""
+    nameValues = nameValues.replace(", ", ",")
+    return nameValues.split(",")
+
+def registrant_clause(valueList, fieldType="String"):
+    """Return a where clause selecting TYPE_REGISTRANT values for a String or Integer field."""
+    if fieldType == "String":
+        return " OR ".join(["TYPE_REGISTRANT = '{}'".format(n) for n in valueList])
+    return " OR ".join(["TYPE_REGISTRANT = {}".format(n) for n in valueList])
+
+def sinuosity_clause(field, sinuosityRange):
+    """Return a where clause selecting sinuosity values outside the minimum and maximum."""
+    return """{0} < {1[0]} OR {0} >  {1[1]}""".format(field, sinuosityRange)
+
+def name_clause(nameList):
+    """Return a where clause selecting operator NAME values."""
+    return " OR ".join(["NAME = '{}'".format(n) for n in nameList])
+
+def length_clause(mileValue):
+    """Return a where clause selecting flightlines shorter than the minimum length in miles."""
+    return "LengthMiles < {0}".format(mileValue)
+
+def registrant_rule(lines, registrantValues):
+    """Flag flightlines whose TYPE_REGISTRANT (text or integer) is one of the user-supplied codes."""
+    registrants = [int(n) for n in parse_registrant_values(registrantValues)]
+    return pd.to_numeric(lines["TYPE_REGISTRANT"], errors="coerce").isin(registrants).to_numpy()
+
+def sinuosity_rule(lines, sinuosityValues):
+    """Flag flightlines with Sinuosity below the minimum or above the maximum."""
+    sinuosityRange = parse_sinuosity_values(sinuosityValues)
+    sinuosity = pd.to_numeric(lines["Sinuosity"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    return (sinuosity < sinuosityRange[0]) | (sinuosity > sinuosityRange[1])
+
+def operator_rule(lines, nameValues):
+    """Flag flightlines whose operator NAME is one of the user-supplied names."""
+    return lines["NAME"].isin(parse_name_values(nameValues)).to_numpy()
+
+def length_rule(lines, mileValue):
+    """Flag flightlines shorter than the minimum length in miles."""
+    return pd.to_numeric(lines["LengthMiles"], errors="coerce").to_numpy(dtype=float, na_value=np.nan) < float(mileValue)
+
+# Screening rules in the order their counts are reported; each is called as rule(lines, value) with the user-supplied value of the same name
+screening_rules = {"registrant": registrant_rule, "sinuosity": sinuosity_rule, "operator": operator_rule, "length": length_rule}
+criteria_names = list(screening_rules)
+
+def flight_table(rows, fields=screening_fields):
+    """Return flightline attributes read with an arcpy.da.SearchCursor (a list of row tuples) as a DataFrame."""
+    return pd.DataFrame(list(rows), columns=fields)
+
+def apply_rules(lines, values, rules=None):
+    """Return a boolean DataFrame flagging which screening rules each flightline meets, evaluated in one pass.
+
+    values maps rule names to their user-supplied values.  rules defaults to
+    screening_rules; a new criterion only needs a rule function and an
+    entry in screening_rules, not another select, copy, and delete cycle.
+    """
+    if rules is None:
+        rules = screening_rules
+    return pd.DataFrame({name: np.asarray(rule(lines, values[name]), dtype=bool) for name, rule in rules.items()}, index=lines.index)
+
+def screen_flights(lines, registrantValues, sinuosityValues, nameValues, mileValue):
+    """Return a boolean DataFrame flagging which screening criteria each flightline meets.
+
+    lines is a flight-level table with TYPE_REGISTRANT, Sinuosity, NAME, and
+    LengthMiles fields.  The returned columns are named by criteria_names and
+    a flightline is suspect when any of them is True.
+    """
+    return apply_rules(lines, {"registrant": registrantValues, "sinuosity": sinuosityValues, "operator": nameValues, "length": mileValue})
+
+def rule_bitmask(criteria):
+    """Return a per-flightline integer with bit i set when the i-th rule (column) of criteria fired.
+
+    With the default rules, 1 = registrant, 2 = sinuosity, 4 = operator,
+    and 8 = length; 0 means the flightline is not suspect.
+    """
+    mask = np.zeros(len(criteria), dtype=np.int32)
+    for bit, name in enumerate(criteria.columns):
+        mask |= criteria[name].to_numpy().astype(np.int32) << bit
+    return mask
+
+def screening_counts(criteria):
+    """Return the number of flightlines removed by each criterion when applied in order, plus the total suspect count."""
+    counts = {}
+    removed = np.zeros(len(criteria), dtype=bool)
+    for name in criteria.columns:
+        selected = criteria[name].to_numpy() & ~removed
+        counts[name] = int(selected.sum())
+        removed |= selected
+    counts["suspect"] = int(removed.sum())
+    return counts
+
+def flight_set(flight_ids):
+    """Return a hashed set of flight IDs (a unique pandas Index) for repeated membership tests."""
+    return pd.Index(pd.unique(pd.Series(flight_ids, dtype=object)))
+
+def flight_membership(flight_ids, flights):
+    """Return a boolean mask of the waypoints whose flight_id is in flights, a set returned by flight_set.
+
+    This is a hash join of waypoints against the flight-level set, so it can
+    be applied to batches of waypoints without building a where clause.
+    """
+    return flights.get_indexer(pd.Series(flight_ids, dtype=object)) >= 0
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: sinuosity.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Calculates flightline path length, endpoint distance, and sinuosity from aircraft waypoints
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+from .flights import offsets_from_ids
+
+# Fixed local variables (GRS80 ellipsoid used by NAD83 and meters per US survey mile)
+grs80_a = 6378137.0
+grs80_f = 1 / 298.257222101
+meters_per_mile_us = 6336000 / 3937
+
+def line_sinuosity(x, y):
+    """Return the sinuosity of a single polyline given its vertex coordinates.
+
+    Sinuosity is the straight-line distance between the first and last
+    vertex divided by the path length, so a straight line has a value of 1.
+    Distances are planar in the units of the coordinates, which matches the
+    Shape_Length of a polyline in a geographic coordinate system.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    length = np.hypot(np.diff(x), np.diff(y)).sum()
+    d = np.hypot(x[0] - x[-1], y[0] - y[-1])
+    return d / length
+
+def geodesic_distance(lon1, lat1, lon2, lat2, a=grs80_a, f=grs80_f, iterations=50):
+    """Return ellipsoidal distances (meters) between arrays of points using Vincenty's inverse formula.
+
+    Coordinates are in decimal degrees.  Iteration stops when every pair
+    has converged, which for the short segments between waypoints takes a
+    handful of passes; identical points have a distance of 0.
+    """
+    b = (1 - f) * a
+    L = np.radians(np.asarray(lon2, dtype=float) - np.asarray(lon1, dtype=float))
+    U1 = np.arctan((1 - f) * np.tan(np.radians(np.asarray(lat1, dtype=float))))
+    U2 = np.arctan((1 - f) * np.tan(np.radians(np.asarray(lat2, dtype=float))))
+    sinU1, cosU1, sinU2, cosU2 = np.sin(U1), np.cos(U1), np.sin(U2), np.cos(U2)
+    lam = L.copy()
+    for iteration in range(iterations):
+        sinLam, cosLam = np.sin(lam), np.cos(lam)
+        sinSigma = np.hypot(cosU2 * sinLam, cosU1 * sinU2 - sinU1 * cosU2 * cosLam)
+        cosSigma = sinU1 * sinU2 + cosU1 * cosU2 * cosLam
+        sigma = np.arctan2(sinSigma, cosSigma)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sinAlpha = np.where(sinSigma > 0, cosU1 * cosU2 * sinLam / sinSigma, 0.0)
+            cos2Alpha = 1 - sinAlpha ** 2
+            cos2SigmaM = np.where(cos2Alpha > 0, cosSigma - 2 * sinU1 * sinU2 / cos2Alpha, 0.0)
+        C = f / 16 * cos2Alpha * (4 + f * (4 - 3 * cos2Alpha))
+        lamPrev = lam
+        lam = L + (1 - C) * f * sinAlpha * (sigma + C * sinSigma * (cos2SigmaM + C * cosSigma * (-1 + 2 * cos2SigmaM ** 2)))
+        if np.all(np.abs(lam - lamPrev) < 1e-12):
+            break
+    u2 = cos2Alpha * (a ** 2 - b ** 2) / b ** 2
+    A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+    B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+    deltaSigma = B * sinSigma * (cos2SigmaM + B / 4 * (cosSigma * (-1 + 2 * cos2SigmaM ** 2) - B / 6 * cos2SigmaM * (-3 + 4 * sinSigma ** 2) * (-3 + 4 * cos2SigmaM ** 2)))
+    return b * A * (sigma - deltaSigma)
+
+def flight_lines(lon, lat, offsets):
+    """Return path length, endpoint distance, and sinuosity for every flight in one pass.
+
+    lon and lat are waypoint coordinates (decimal degrees) ordered by time
+    within each flight, and flight k spans rows offsets[k]:offsets[k + 1].
+    Returns a DataFrame with one row per flight holding the planar path
+    Length and endpoint Distance (degrees, as used by Shape_Length and the
+    original getSinuosity codeblock), the geodesic LengthMiles (US survey miles),
+    Sinuosity, and ZeroLength for flights whose path has no length.
+    """
+    lon = np.asarray(lon, dtype=float)
+    lat = np.asarray(lat, dtype=float)
+    offsets = np.asarray(offsets)
+    starts, stops = offsets[:-1], offsets[1:]
+
+    # Segment lengths between sequential waypoints, with segments joining two different flights set to 0
+    planar = np.hypot(np.diff(lon), np.diff(lat))
+    geodesic = geodesic_distance(lon[:-1], lat[:-1], lon[1:], lat[1:])
+    between = stops[:-1] - 1
+    planar[between[between < len(planar)]] = 0
+    geodesic[between[between < len(geodesic)]] = 0
+
+    # Sum segment lengths per flight with a cumulative sum so empty and single-waypoint flights have a length of 0
+    planarSum = np.append(0, np.cumsum(planar))
+    geodesicSum = np.append(0, np.cumsum(geodesic))
+    last = np.maximum(stops - 1, starts)
+    length = planarSum[last] - planarSum[starts]
+    lengthMiles = (geodesicSum[last] - geodesicSum[starts]) / meters_per_mile_us
+    d = np.hypot(lon[starts] - lon[last], lat[starts] - lat[last])
+    zeroLength = ~(length > 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sinuosity = np.where(zeroLength, np.nan, d / length)
+    return pd.DataFrame({"Length": length, "Distance": d, "LengthMiles": lengthMiles, "Sinuosity": sinuosity, "ZeroLength": zeroLength})
+
+def polyline_wkb(lon, lat, offsets):
+    """Return a list of well-known binary (WKB) LineString geometries, one per flight.
+
+    The WKB for each flight is assembled from the coordinate arrays without
+    creating a Python object per vertex, and can be written directly with
+    the SHAPE@WKB token of an arcpy.da.InsertCursor.
+    """
+    xy = np.column_stack([np.asarray(lon, dtype="<f8"), np.asarray(lat, dtype="<f8")])
+    offsets = np.asarray(offsets)
+    header = np.array([1], dtype="u1").tobytes() + np.array([2], dtype="<u4").tobytes()
+    sizes = np.diff(offsets).astype("<u4")
+    return [bytearray(header + sizes[k].tobytes() + xy[offsets[k]:offsets[k + 1]].tobytes()) for k in range(len(sizes))]
+
+def flight_sinuosity(data, x="lon", y="lat", flight="flight_id", order="TIME"):
+    """Return a flight-level table of path length, endpoint distance, and sinuosity.
+
+    Waypoints are ordered by order within each flight, as PointsToLine does,
+    before segment lengths are summed.  Flights with a path length of 0 have
+    a Sinuosity of NaN.
+    """
+    data = data.sort_values([flight, order], kind="mergesort")
+    offsets = offsets_from_ids(data[flight].to_numpy())
+    lines = flight_lines(data[x].to_numpy(), data[y].to_numpy(), offsets)
+    lines.insert(0, flight, data[flight].to_numpy()[offsets[:-1]])
+    return lines
+
+def flightline_table(flight_id, time, lon, lat):
+    """Build flightlines and their attributes from waypoint arrays in a single pass.
+
+    Waypoints are ordered by flight_id and time, as PointsToLine does, and
+    one row is returned per flight with the flight_id, ICAO_address, Year,
+    LengthMiles, Sinuosity, and ZeroLength fields plus the line geometry as
+    WKB in a Shape field.
+    """
+    flight_id = np.asarray(flight_id).astype(str)
+    order = np.lexsort((np.asarray(time), flight_id))
+    flight_id, lon, lat = flight_id[order], np.asarray(lon, dtype=float)[order], np.asarray(lat, dtype=float)[order]
+    offsets = offsets_from_ids(flight_id)
+    lines = flight_lines(lon, lat, offsets)
+    ids = pd.Series(flight_id[offsets[:-1]])
+    lines.insert(0, "flight_id", ids)
+    lines.insert(1, "ICAO_address", ids.str.split("_", n=1).str[0])
+    lines.insert(2, "Year", ids.str[-8:-4].astype(int))
+    lines["Shape"] = polyline_wkb(lon, lat, offsets)
+    return lines
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: stages.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Records wall time, CPU time, row counts, and peak memory for the named processing stages of each tool, writes them as JSON lines, and drives the tool progressor
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import datetime, json, os, sys, time
+
+# Fixed local variables
+log_variable = "ADS_B_STAGE_LOG"
+profile_variable = "ADS_B_PROFILE"
+profile_dir_variable = "ADS_B_PROFILE_DIR"
+profilers = ["cprofile", "pyinstrument"]
+
+def peak_rss():
+    """Return the peak resident memory of this process in bytes, or None when it cannot be measured.
+
+    Uses the resource module where available (Linux and macOS) and the
+    optional psutil package elsewhere (e.g., Windows).
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    except ImportError:
+        return None
+
+def reset_peak_rss():
+    """Reset the peak resident memory of this process where the operating system allows it (Linux), so the next reading covers one stage.
+
+    Elsewhere the peak is the highest reached since the process started.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+class StageLog:
+    """Records wall time, CPU time, rows in and out, and peak memory for each named stage of a tool.
+
+    stages is the registry of (name, label) pairs for a tool in the order
+    they run.  start begins a stage, ending the one before it, and calls
+    progress(label) so a tool progressor follows the same registry.  Each
+    finished stage is appended to records and, when log_file is given,
+    written to it as one JSON line.  profile ("cprofile" or "pyinstrument",
+    which must be installed) profiles each stage separately and saves the
+    results in profile_dir.
+    """
+
+    def __init__(self, tool, stages, progress=None, log_file=None, profile=None, profile_dir=None):
+        self.tool = tool
+        self.labels = dict(stages)
+        self.progress = progress
+        self.log_file = log_file
+        self.profile = profile.lower() if profile else None
+        self.profile_dir = profile_dir or os.getcwd()
+        if self.profile and self.profile not in profilers:
+            raise ValueError("Unsupported profiler {0}".format(profile))
+        if self.profile == "pyinstrument":
+            import pyinstrument
+        self.records = []
+        self.current = None
+        self.profiler = None
+
+    def __len__(self):
+        return len(self.labels)
+
+    def start(self, name, rows_in=None, label=None):
+        """End the running stage, then start the named stage and show its label (or the registered label) in the progressor."""
+        self.end()
+        if self.progress:
+            self.progress(label or self.labels.get(name, name))
+        reset_peak_rss()
+        self.current = {"tool": self.tool, "stage": name, "started": datetime.datetime.now().isoformat(timespec="seconds"), "rows_in": rows_in, "rows_out": None,
+                        "wall": time.perf_counter(), "cpu": time.process_time()}
+        if self.profile == "cprofile":
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif self.profile == "pyinstrument":
+            from pyinstrument import Profiler
+            self.profiler = Profiler()
+            self.profiler.start()
+
+    def rows(self, rows_in=None, rows_out=None):
+        """Set the rows in and/or out of the running stage."""
+        if self.current is not None:
+            if rows_in is not None:
+                self.current["rows_in"] = int(rows_in)
+            if rows_out is not None:
+                self.current["rows_out"] = int(rows_out)
+
+    def end(self, rows_out=None):
+        """End the running stage, if any, and record it."""
+        if self.current is None:
+            return None
+        wall, cpu = time.perf_counter() - self.current.pop("wall"), time.process_time() - self.current.pop("cpu")
+        self.rows(rows_out=rows_out)
+        if self.profiler is not None:
+            self.save_profile()
+        peak = peak_rss()
+        record = self.current
+        record.update({"wall_secs": round(wall, 3), "cpu_secs": round(cpu, 3), "peak_rss_mb": round(peak / 2 ** 20, 1) if peak else None})
+        self.records.append(record)
+        self.current = None
+        if self.log_file:
+            with open(self.log_file, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        return record
+
+    def save_profile(self):
+        """Stop the profiler for the running stage and save its results in profile_dir."""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, "{0}_{1}_{2}".format(self.tool, self.current["stage"], os.getpid()).replace(" ", "_"))
+        if self.profile == "cprofile":
+            self.profiler.disable()
+            self.profiler.dump_stats(path + ".prof")
+        else:
+            self.profiler.stop()
+            with open(path + ".html", "w") as f:
+                f.write(self.profiler.output_html())
+        self.profiler = None
+
+    def close(self):
+        """End the running stage and return the records of all stages."""
+        self.end()
+        return self.records
+
+    def total_secs(self):
+        """Return the wall time of all recorded stages."""
+        return sum(record["wall_secs"] for record in self.records)
+
+def stage_log(tool, stages, arcpy=None):
+    """Return a StageLog for a tool configured from environment variables.
+
+    ADS_B_STAGE_LOG names a file that stage records are appended to as JSON
+    lines, ADS_B_PROFILE selects a profiler (cprofile or pyinstrument), and
+    ADS_B_PROFILE_DIR the folder for profiles.  When the arcpy module is
+    passed, a step progressor with one step per registered stage is created
+    and each stage sets its label and position, so the package itself never
+    imports arcpy.
+    """
+    progress = None
+    if arcpy is not None:
+        arcpy.SetProgressor("step", stages[0][1], 0, len(stages), 1)
+
+        def progress(label):
+            arcpy.SetProgressorLabel(label)
+            arcpy.SetProgressorPosition()
+
+    return StageLog(tool, stages, progress, os.environ.get(log_variable), os.environ.get(profile_variable), os.environ.get(profile_dir_variable))
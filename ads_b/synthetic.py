@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: synthetic.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Generates synthetic raw ADS-B logger TSV files with realistic aircraft tracks for benchmarking the processing chain
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+
+# Fixed local variables
+tslc_mix = {1: 0.86, 2: 0.10, 0: 0.01, 3: 0.01, 7: 0.02}
+flags_mix = {"1ff": 0.97, "1fe": 0.015, "17f": 0.01, "17e": 0.005}
+header_fields = {"TIME": ["TIME", "ICAO_address", "lat", "lon", "altitude", "altType", "heading", "hor_velocity", "ver_velocity", "callsign", "emitter_type", "tslc", "validFlags", "squawk"],
+                 "timestamp": ["timestamp", "ICAO_address", "lat", "lon", "altitude", "alt_type", "heading", "hor_velocity", "ver_velocity", "callsign", "emitterType", "tslc", "valid_flags", "squawk"]}
+meters_per_degree = 111320.0
+
+def choose(rng, mix, size):
+    """Return size values drawn from a dictionary of value to probability."""
+    values = np.array(list(mix.keys()))
+    p = np.array(list(mix.values()), dtype=float)
+    return values[rng.choice(len(values), size=size, p=p / p.sum())]
+
+def synthetic_logger_data(rows, aircraft=None, hours=14, gap_rate=0.001, tslc=None, flags=None, duplicate_rate=0.01, time_header="TIME",
+                          start="2023-07-22 07:00", center=(35.6, -83.5), seed=0):
+    """Return a DataFrame of synthetic raw logger records in the field layout of a logger TSV file.
+
+    Each aircraft flies a track with a slowly wandering heading, speed, and
+    altitude, reporting about once a second, and starts a new flight after
+    a gap of 15 minutes to 3 hours with probability gap_rate per report.
+    Tracks start within the hours after start and within about half a
+    degree of center (lat, lon).  Reports from all aircraft are interleaved
+    in time order as a logger writes them, and duplicate_rate of them are
+    repeated.  tslc and flags are dictionaries of TSLC values and hex
+    validFlags strings to their probability (defaults tslc_mix and
+    flags_mix), and time_header selects the TIME or timestamp header
+    variant.  aircraft defaults to one per 2,000 reports.
+    """
+    rng = np.random.default_rng(seed)
+    if aircraft is None:
+        aircraft = max(1, rows // 2000)
+    unique = rows - int(rows * duplicate_rate)
+
+    # Reports per aircraft and the seconds between each aircraft's successive reports, including gaps between flights
+    counts = rng.multinomial(unique, rng.dirichlet(np.ones(aircraft)))
+    owner = np.repeat(np.arange(aircraft), counts)
+    firsts = np.append(0, np.cumsum(counts)[:-1])
+    first = np.zeros(unique, dtype=bool)
+    first[firsts[counts > 0]] = True
+    dt = rng.choice([1, 2], size=unique, p=[0.9, 0.1]).astype(np.int64)
+    gaps = rng.random(unique) < gap_rate
+    dt[gaps] = rng.integers(900, 3 * 3600, gaps.sum())
+    dt[first] = 0
+
+    def track(step):
+        """Return the cumulative sum of step restarted at each aircraft's first report."""
+        total = np.cumsum(step)
+        return total - np.repeat(total[firsts] - step[firsts], counts)
+
+    elapsed = track(dt)
+    span = elapsed[np.minimum(firsts + counts - 1, unique - 1)]
+    offset = (rng.random(aircraft) * np.maximum(hours * 3600 - span, 0)).astype(np.int64)
+    seconds = int(pd.Timestamp(start).timestamp()) + offset[owner] + elapsed
+
+    # Positions from speed and a wandering heading, with the distance between reports in degrees of latitude and longitude
+    heading = (rng.random(aircraft) * 360)[owner] + track(rng.normal(0, 1.5, unique))
+    heading = np.mod(heading, 360)
+    speed = (rng.random(aircraft) * 60 + 30)[owner]
+    distance = speed * dt
+    lat = (center[0] + rng.uniform(-0.5, 0.5, aircraft))[owner] + track(distance * np.cos(np.radians(heading)) / meters_per_degree)
+    lon = (center[1] + rng.uniform(-0.5, 0.5, aircraft))[owner] + track(distance * np.sin(np.radians(heading)) / (meters_per_degree * np.cos(np.radians(center[0]))))
+    verticalSpeed = rng.normal(0, 2, unique)
+    altitude = np.maximum((rng.random(aircraft) * 3000 + 600)[owner] + track(verticalSpeed * dt), 100)
+    icao = np.array(["{0:06X}".format(code) for code in rng.choice(0xFFFFFF, aircraft, replace=False)])
+
+    fields = header_fields[time_header]
+    data = pd.DataFrame({fields[0]: seconds, "ICAO_address": icao[owner],
+                         "lat": np.round(lat * 1e7).astype(np.int64), "lon": np.round(lon * 1e7).astype(np.int64),
+                         "altitude": np.round(altitude * 1e3).astype(np.int64), fields[5]: rng.choice([0, 1], size=unique, p=[0.05, 0.95]),
+                         "heading": np.round(heading * 1e2).astype(np.int64), "hor_velocity": np.round(speed * 1e2).astype(np.int64),
+                         "ver_velocity": np.round(verticalSpeed * 1e2).astype(np.int64), "callsign": "N" + pd.Series(icao[owner]).str[:4].to_numpy(),
+                         fields[10]: 1, "tslc": choose(rng, tslc_mix if tslc is None else tslc, unique),
+                         fields[12]: choose(rng, flags_mix if flags is None else flags, unique), "squawk": 1200})
+
+    # Interleave the aircraft in time order and repeat a share of the reports, as loggers do
+    data = data.iloc[np.argsort(seconds, kind="stable")]
+    repeats = np.ones(unique, dtype=np.int64)
+    repeats[rng.choice(unique, rows - unique, replace=False)] = 2
+    data = data.iloc[np.repeat(np.arange(unique), repeats)].reset_index(drop=True)
+    return data[fields]
+
+def write_logger_file(data, path, header_repeats=0):
+    """Write synthetic logger records to a tab-delimited file.
+
+    header_repeats additional header lines are written part way through the
+    file, as happens when a logger restarts, to exercise header removal.
+    """
+    blocks = np.array_split(np.arange(len(data)), header_repeats + 1)
+    with open(path, "w", newline="") as f:
+        for block in blocks:
+            data.iloc[block].to_csv(f, sep="\t", index=False)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: tables.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson
+    Description:  Builds frequency and percentage summary tables shared by the altitude and temporal summary tools
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import pandas as pd
+from .formats import to_structured_array
+
+def add_percentage(table, total=None):
+    """Add a PERCENTAGE field with each FREQUENCY as a percent of total, rounded to one decimal."""
+    if total is None:
+        total = table["FREQUENCY"].sum()
+    table["PERCENTAGE"] = (table["FREQUENCY"] / total * 100).round(1)
+    return table
+
+def frequency_table(data, fields, total=None):
+    """Return the FREQUENCY and PERCENTAGE of each unique combination of fields, like the Frequency tool."""
+    fields = [fields] if isinstance(fields, str) else list(fields)
+    table = data.groupby(fields, dropna=False).size().reset_index(name="FREQUENCY")
+    return add_percentage(table, total)
+
+def table_array(table):
+    """Return a summary table as a NumPy structured array for arcpy.da.NumPyArrayToTable, with null text values written as empty strings."""
+    table = table.copy()
+    for field in table.columns:
+        if not pd.api.types.is_numeric_dtype(table[field]):
+            table[field] = table[field].fillna("")
+    return to_structured_array(table)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: temporal.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson
+    Description:  Summarizes flights by day, hour, month/year, type of day, aircraft operator, and aircraft type
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+from .tables import add_percentage
+from .timezones import utc_to_local
+
+# Fixed local variables
+operator_reclassTable = [[1, "Individual"], [2, "Partnership"], [3, "Corporation"], [4, "Co-Owned"], [5, "Government"], [7, "LLC"], [8, "Non-Citizen Corporation"], [9, "Non-Citizen Co-Owned"]]
+type_reclassTable = [[1, "Glider"], [2, "Balloon"], [3, "Blimp/Dirigible"], [4, "Fixed Wing Single Engine"], [5, "Fixed Wing Multi Engine"], [6, "Rotorcraft"], [7, "Weight-Shift-Control"], [8, "Powered Parachute"], [9, "Gyroplane"]]
+day_names = np.array(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"])
+hour_labels = np.array(["{0:02d}".format(hour) for hour in range(24)])
+
+def get_day_type(daynum):
+    """Return "Weekday" for Monday-Friday (0-4) and "Weekend" otherwise."""
+    return np.where(np.asarray(daynum) < 5, "Weekday", "Weekend")
+
+def first_waypoints(data):
+    """Return the first waypoint of each flight, so that each row represents one flight."""
+    return data.drop_duplicates(subset="flight_id", keep="first")
+
+def calendar_keys(time):
+    """Return the hour (0-23), weekday (Monday = 0), and month (months since January 1970) of datetime values as integer arrays.
+
+    Keys are computed with datetime64 arithmetic on the whole array rather
+    than by formatting each value as text.  January 1, 1970 was a Thursday.
+    """
+    time = np.asarray(time, dtype="datetime64[us]")
+    days = time.astype("datetime64[D]")
+    hour = (time - days) // np.timedelta64(1, "h")
+    weekday = (days.astype(np.int64) + 3) % 7
+    month = time.astype("datetime64[M]").astype(np.int64)
+    return hour.astype(np.int64), weekday, month
+
+def month_labels(month):
+    """Return MONTH, YEAR, and MOYEAR (MM/YYYY) text for months since January 1970, formatting each distinct month once."""
+    months, inverse = np.unique(month, return_inverse=True)
+    monthText = np.array(["{0:02d}".format(m % 12 + 1) for m in months], dtype=str)[inverse]
+    yearText = np.array([str(m // 12 + 1970) for m in months], dtype=str)[inverse]
+    return monthText, yearText, np.char.add(np.char.add(monthText, "/"), yearText)
+
+def calendar_fields(time):
+    """Return DAY, HOUR, MONTH, YEAR, MOYEAR, and DAYTYPE text fields for datetime values."""
+    index = time.index if isinstance(time, pd.Series) else None
+    hour, weekday, month = calendar_keys(time)
+    fields = pd.DataFrame(index=index if index is not None else pd.RangeIndex(len(hour)))
+    fields["DAY"] = day_names[weekday]
+    fields["HOUR"] = hour_labels[hour]
+    fields["MONTH"], fields["YEAR"], fields["MOYEAR"] = month_labels(month)
+    fields["DAYTYPE"] = get_day_type(weekday)
+    return fields
+
+def rollup(groups, fields, total=None):
+    """Return the FREQUENCY and PERCENTAGE of each unique combination of fields by summing the FREQUENCY of grouped rows."""
+    fields = [fields] if isinstance(fields, str) else list(fields)
+    table = groups.groupby(fields, dropna=False)["FREQUENCY"].sum().reset_index()
+    return add_percentage(table, total)
+
+def day_type_summary(groups):
+    """Return flight frequencies by HOUR and DAYTYPE with percentages within each type of day."""
+    table = groups.groupby(["HOUR", "DAYTYPE"])["FREQUENCY"].sum().reset_index()
+    table = table.sort_values(["DAYTYPE", "HOUR"], kind="mergesort").reset_index(drop=True)
+    table["PERCENTAGE"] = (table["FREQUENCY"] / table.groupby("DAYTYPE")["FREQUENCY"].transform("sum") * 100).round(1)
+    return table
+
+def reclassify(table, field, reclassTable, outField):
+    """Add a text field describing each numeric code in field using a [[code, text], ...] table."""
+    lookup = dict(reclassTable)
+    table[outField] = pd.to_numeric(table[field], errors="coerce").map(lookup)
+    return table
+
+def temporal_summaries(flights, timezone=None):
+    """Return a dictionary of summary tables for a table with one row per flight.
+
+    flights (a DataFrame or dictionary of arrays) must have a TIME field and
+    may also have TYPE_REGISTRANT and TYPE_AIRCRAFT fields joined from the
+    FAA Releasable Database, in which case Operators and Type tables are
+    included.  TIME is read once as datetime64 and the flights are grouped
+    in a single pass by hour, weekday, month, operator, and aircraft type;
+    every table is then rolled up from those groups, which number in the
+    thousands at most, so text labels are only built for the groups.  Keys
+    match the suffixes of the FlightSummary tables written by Tool 6.
+
+    TIME values recorded by the data logger are UTC.  When timezone (an IANA
+    time zone such as America/Denver) is given they are converted to park
+    local time, including daylight saving time, before hours and days are
+    calculated; otherwise TIME is summarized as recorded.
+    """
+    hour, weekday, month = calendar_keys(utc_to_local(flights["TIME"], timezone))
+    keys = {"HOUR": hour, "WEEKDAY": weekday, "MONTH": month}
+    if "TYPE_REGISTRANT" in flights:
+        keys["TYPE_OPERATOR"] = pd.to_numeric(pd.Series(np.asarray(flights["TYPE_REGISTRANT"], dtype=object)), errors="coerce").to_numpy()
+        if "TYPE_AIRCRAFT" in flights:
+            keys["TYPE_AIRCRAFT"] = np.asarray(flights["TYPE_AIRCRAFT"], dtype=object)
+    groups = pd.DataFrame(keys).groupby(list(keys), dropna=False).size().reset_index(name="FREQUENCY")
+    total = int(groups["FREQUENCY"].sum())
+    groups["DAY"] = day_names[groups["WEEKDAY"].to_numpy()]
+    groups["DAYTYPE"] = get_day_type(groups["WEEKDAY"].to_numpy())
+    groups["MOYEAR"] = month_labels(groups["MONTH"].to_numpy())[2]
+    groups["HOUR"] = hour_labels[groups["HOUR"].to_numpy()]
+    tables = {}
+    tables["HR"] = rollup(groups, "HOUR", total)
+    tables["DAY"] = rollup(groups, "DAY", total)
+    tables["MOYR"] = rollup(groups, "MOYEAR", total)
+    tables["DAYTYPE"] = day_type_summary(groups)
+    if "TYPE_OPERATOR" in keys:
+        tables["Operators"] = reclassify(rollup(groups, "TYPE_OPERATOR", total), "TYPE_OPERATOR", operator_reclassTable, "Aircraft_Operator")
+        if "TYPE_AIRCRAFT" in keys:
+            tables["Type"] = reclassify(rollup(groups, "TYPE_AIRCRAFT", total), "TYPE_AIRCRAFT", type_reclassTable, "Aircraft_Type")
+    return tables
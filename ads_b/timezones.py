@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: timezones.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Converts UTC waypoint times to park local time for an IANA time zone using a precomputed table of UTC offsets and daylight saving time transitions
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import datetime
+from zoneinfo import ZoneInfo
+import numpy as np
+
+# Fixed local variables
+scan_step = 3600
+
+def utc_offset(zone, seconds):
+    """Return the UTC offset (seconds) of a ZoneInfo time zone at a time given in seconds since 1970-01-01 UTC."""
+    utc = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(seconds=int(seconds))
+    return int(utc.astimezone(zone).utcoffset().total_seconds())
+
+def offset_table(timezone, start, end):
+    """Return the UTC offsets in effect for an IANA time zone (e.g., America/Denver) between two times.
+
+    start and end are seconds since 1970-01-01 UTC.  The zone is scanned
+    hourly and each change of offset is narrowed to the second at which it
+    takes effect, so the table holds one row per daylight saving time
+    transition rather than one per waypoint.  Returns the sorted times at
+    which each offset begins (the first is start) and the offsets.
+    """
+    zone = ZoneInfo(timezone)
+    times, offsets = [int(start)], [utc_offset(zone, start)]
+    for t in range(int(start) + scan_step, int(end) + scan_step, scan_step):
+        offset = utc_offset(zone, t)
+        if offset != offsets[-1]:
+            low, high = t - scan_step, t
+            while high - low > 1:
+                middle = (low + high) // 2
+                if utc_offset(zone, middle) == offset:
+                    high = middle
+                else:
+                    low = middle
+            times.append(high)
+            offsets.append(offset)
+    return np.array(times, dtype=np.int64), np.array(offsets, dtype=np.int64)
+
+def utc_to_local(time, timezone):
+    """Return UTC datetime values converted to naive local datetime values for an IANA time zone.
+
+    Offsets are looked up for the whole array at once from an offset table
+    covering the range of the input times.  An empty timezone or "UTC"
+    returns the times unchanged.
+    """
+    time = np.asarray(time, dtype="datetime64[us]")
+    if not timezone or timezone.upper() == "UTC" or len(time) == 0:
+        return time
+    seconds = time.astype("datetime64[s]").astype(np.int64)
+    valid = ~np.isnat(time)
+    if not valid.any():
+        return time
+    times, offsets = offset_table(timezone, seconds[valid].min(), seconds[valid].max())
+    pos = np.maximum(np.searchsorted(times, seconds, side="right") - 1, 0)
+    return time + offsets[pos].astype("timedelta64[s]")
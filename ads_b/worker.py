@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: worker.py
+    Author: Shawn Hutchinson
+    Credits: Damon Joyce, Shawn Hutchinson, Brian Peterson, Myles Cramer, Davyd Betchkal
+    Description:  Keeps one warm Python process that processes raw ADS-B logger files as they are named on standard input, so per-file startup costs are paid once
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import argparse, json, os, sys, tempfile, time
+
+# Fixed local variables
+job_fields = ["input", "park", "site", "threshold", "output", "chunk_size", "format"]
+
+def warm_up():
+    """Import the processing modules and run a small synthetic logger file through them, so the first real file runs at full speed.
+
+    Returns the seconds taken.
+    """
+    start = time.time()
+    from .pipeline import process_logger_file
+    from .formats import write_waypoints
+    from .synthetic import synthetic_logger_data, write_logger_file
+    with tempfile.TemporaryDirectory(prefix="ads_b_worker_") as folder:
+        path = os.path.join(folder, "warm_up.tsv")
+        write_logger_file(synthetic_logger_data(2000, 2), path)
+        data, summary = process_logger_file(path, "WARM", 900)
+        write_waypoints(data, os.path.join(folder, "warm_up.csv"))
+    return round(time.time() - start, 3)
+
+def parse_job(line, defaults):
+    """Return the job named by one line of input: a logger file path, or a JSON object with any of job_fields overriding defaults."""
+    line = line.strip()
+    job = dict(defaults)
+    if line.startswith("{"):
+        values = json.loads(line)
+        unknown = set(values) - set(job_fields)
+        if unknown:
+            raise ValueError("Unknown job fields {0}".format(", ".join(sorted(unknown))))
+        job.update(values)
+    else:
+        job["input"] = line
+    missing = [field for field in ["input", "park", "threshold", "output"] if job.get(field) in (None, "")]
+    if missing:
+        raise ValueError("Job is missing {0}".format(", ".join(missing)))
+    job["threshold"] = int(job["threshold"])
+    job["format"] = job["format"].upper()
+    return job
+
+def json_value(value):
+    """Return a NumPy scalar in a result as the equivalent Python value for JSON output."""
+    return value.item() if hasattr(value, "item") else str(value)
+
+def serve(lines, output, defaults):
+    """Process the logger file named by each line of input and write one JSON result line to output as each file finishes.
+
+    Blank lines are skipped.  Each result is the dictionary returned by
+    batch.process_file, or holds only the input line and an error message
+    when the line cannot be read as a job.  Returns the number of files
+    that failed.
+    """
+    from .batch import process_file
+    failed = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            job = parse_job(line, defaults)
+        except ValueError as e:
+            result = {"input": line.strip(), "error": "{0}: {1}".format(type(e).__name__, e)}
+        else:
+            result = process_file(job["input"], job["park"], job["site"], job["threshold"], job["output"], job["chunk_size"], job["format"])
+        failed += result["error"] is not None
+        output.write(json.dumps(result, default=json_value) + "\n")
+        output.flush()
+    return failed
+
+def main(argv=None):
+    """Command line entry point:  python -m ads_b.worker [PARK DURATION OUTPUT] [options] < files"""
+    parser = argparse.ArgumentParser(prog="python -m ads_b.worker", description="Process raw ADS-B logger TSV files named on standard input in one warm process.")
+    parser.add_argument("park", nargs="?", default=None, help="four letter park unit code used when a job does not give one")
+    parser.add_argument("threshold", nargs="?", type=int, default=None, help="flight duration threshold in seconds used when a job does not give one")
+    parser.add_argument("output", nargs="?", default=None, help="folder where output files are written when a job does not give one")
+    parser.add_argument("--site", default="", help="logger site name")
+    parser.add_argument("--chunk-size", type=int, default=None, help="rows read at a time from each input file")
+    parser.add_argument("--format", default="CSV", type=str.upper, help="output file format (default: CSV)")
+    parser.add_argument("--no-warm-up", action="store_true", help="skip processing a small synthetic file at startup")
+    args = parser.parse_args(argv)
+
+    if not args.no_warm_up:
+        print("Worker ready in {0} secs".format(warm_up()), file=sys.stderr, flush=True)
+    defaults = {"input": None, "park": args.park, "site": args.site, "threshold": args.threshold, "output": args.output, "chunk_size": args.chunk_size, "format": args.format}
+    return 1 if serve(sys.stdin, sys.stdout, defaults) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
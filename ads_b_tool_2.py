@@ -8,7 +8,7 @@
     Description:  Ingests processed ADS-B data and produces point and line feature classes with sinuosity values and joined FAA database fields
     Status:  Development
     Date created: 10/7/2021
-    Date last modified: 7/12/2023
+    Date last modified: 10/18/2026
     Python Version: 3.9.16
 """
 
@@ -17,7 +17,15 @@ class WaypointError(Exception):
     pass
 
 # Import libraries
-import arcpy, time
+import arcpy, os, time
+from ads_b.agl import altitude_agl_values, altitude_msl, below_msl_threshold
+from ads_b.buffers import buffer_key, load_buffer, save_buffer
+from ads_b.dem import dem_file, evict_exports, export_name, find_export, sample_dem
+from ads_b.faa import aircraft_table, cursor_rows, faa_field_types, faa_index, faa_values
+from ads_b.formats import read_waypoints, to_structured_array
+from ads_b.geometry import buffer_mask
+from ads_b.sinuosity import flightline_table
+from ads_b.stages import stage_log
 
 # User-specified local variable(s) for ArcGIS script tool
 inputFile = arcpy.GetParameterAsText(0)
@@ -27,6 +35,10 @@ mslFilter = arcpy.GetParameterAsText(3)
 inputDEM = arcpy.GetParameterAsText(4)
 faaTable = arcpy.GetParameterAsText(5)
 outputWorkspace = arcpy.GetParameterAsText(6)
+faaJoinMode = arcpy.GetParameterAsText(7) if arcpy.GetArgumentCount() > 7 else ""
+
+# Optional FAA join mode: WAYPOINTS joins FAA fields to every waypoint, AIRCRAFT_TABLE stores them once per aircraft in a related table; WAYPOINTS is used when blank
+faaJoinMode = faaJoinMode.upper() if faaJoinMode else "WAYPOINTS"
 
 # Fixed local variable(s)
 spatialRef = arcpy.SpatialReference(4269)
@@ -38,86 +50,143 @@ inField2 = "MFR_MDL_CODE"
 joinTable2 = faaTable + "/ACFTREF"
 joinField2 = "CODE"
 fieldList2 = "MODEL"
-
-# Define new functions for sinuosity calculation
-codeblock1 = """
-def getSinuosity(shape):
-    length = shape.length
-    d = math.sqrt((shape.firstPoint.X - shape.lastPoint.X) ** 2 + (shape.firstPoint.Y - shape.lastPoint.Y) ** 2)
-    return d/length"""
+faaFields = fieldList1 + [fieldList2]
+demSampling = "nearest"
+bufferCache = os.path.join(arcpy.env.scratchFolder, "buffer_cache")
+lineFields = ["flight_id", "ICAO_address", "Year", "LengthMiles", "Sinuosity"]
+toolStages = [("read", "Creating waypoint feature class from ADS-B input file..."),
+              ("buffer", "Removing aircraft waypoints outside of buffered park boundary..."),
+              ("msl", "Calculating altitude (MSL in feet) and removing waypoints above altitude threshold..."),
+              ("agl", "Calculating waypoint altitudes (AGL in feet)..."),
+              ("faa_waypoints", "Joining fields from FAA Releaseable Database MASTER and ACFTREF tables to waypoints..."),
+              ("flightlines", "Creating flightline feature class from filtered ADS-B waypoints..."),
+              ("write_lines", "Writing flightlines and sinuosity values to line feature class..."),
+              ("faa_lines", "Joining fields from FAA Releaseable Database MASTER and ACFTREF tables to flightlines..."),
+              ("finalize", "Finalizing flightline feature class with fields from FAA Releasable Database...")]
 
 # Set local environments
 arcpy.env.workspace = outputWorkspace
 arcpy.env.overwriteOutput = True
 
-# Parallel Processing Factor - applies only to Buffer and Clip functions
+# Parallel Processing Factor - applies only to the Buffer function
 arcpy.env.parallelProcessingFactor = "50%"
 
 try:
     
-    # Start timer and create progressor
+    # Start timer and create progressor driven by the stage registry
     start = time.time()
-    arcpy.SetProgressor("step", "Creating waypoint feature class from ADS-B input file...", 0, 9, 1)
+    stages = stage_log("Tool 2", toolStages, arcpy)
     
-    if arcpy.CheckExtension("Spatial") == "Available":
-        
-        # Check out Spatial Analyst extension
-        arcpy.CheckOutExtension("Spatial")
-        
-        # Parse park name and output filename from local input variables
-        outputFile = arcpy.Describe(inputFile).baseName
-        parkName = outputFile[5:9]
-        print("Reading in ADS-B waypoint data from {0}...".format(outputFile))
-        arcpy.AddMessage("Reading in ADS-B waypoint data from {0}...".format(outputFile))
-        
-        # Create point feature class
-        arcpy.management.XYTableToPoint(inputFile, "temp1", "lon", "lat", "altitude", spatialRef)
-        arcpy.management.DeleteField("temp1", "Field1")
-        print("Point feature class created from ADS-B input file...")
-        arcpy.AddMessage("Point feature class created...")
-        
-        # Check for an existing park buffer file and use it, or create a new buffer file to screen waypoints
-        arcpy.SetProgressorLabel("Removing aircraft waypoints outside of buffered park boundary...")
-        arcpy.SetProgressorPosition()
-        if arcpy.Exists("Buffer_" + parkName + "_" + bufferDistance.replace(" ", "")):
-            print("Park buffer file already exists.  Moving to next process...")
-            arcpy.analysis.Clip("temp1", "Buffer_" + parkName + "_" + bufferDistance.replace(" ", ""), "temp2")
-            print("Waypoints outside buffer removed...")
-        else:
-            arcpy.analysis.Buffer(parkBoundaryFile, "Buffer_" + parkName + "_" + bufferDistance.replace(" ", ""), bufferDistance, "", "", "ALL")
-            arcpy.analysis.Clip("temp1", "Buffer_" + parkName + "_" + bufferDistance.replace(" ", ""), "temp2")
-            print("Park buffer generated and waypoints outside buffer removed...")
-        arcpy.AddMessage("Waypoints outside of management unit buffer removed...")
+    # Parse park name and output filename from local input variables
+    outputFile = arcpy.Describe(inputFile).baseName
+    parkName = outputFile[5:9]
+    print("Reading in ADS-B waypoint data from {0}...".format(outputFile))
+    arcpy.AddMessage("Reading in ADS-B waypoint data from {0}...".format(outputFile))
+    
+    # Read waypoints from a Tool 1 CSV file or a typed columnar file into memory
+    stages.start("read")
+    waypoints = read_waypoints(inputFile)
+    stages.rows(rows_out=len(waypoints))
+    print("ADS-B waypoint data read into memory...")
+    arcpy.AddMessage("ADS-B waypoint data read...")
+    
+    # Use a cached park buffer when the boundary geometry, buffer distance, and spatial reference are unchanged, or create a new buffer file and cache it
+    stages.start("buffer", len(waypoints))
+    boundaryGeometry = [row[0] for row in arcpy.da.SearchCursor(parkBoundaryFile, "SHAPE@WKB")]
+    bufferKey = buffer_key(boundaryGeometry, bufferDistance, arcpy.Describe(parkBoundaryFile).spatialReference.exportToString(), spatialRef.exportToString())
+    bufferGeometry = load_buffer(bufferCache, bufferKey)
+    if bufferGeometry is not None:
+        print("Park buffer found in buffer cache.  Moving to next process...")
+    else:
+        arcpy.analysis.Buffer(parkBoundaryFile, "Buffer_" + parkName + "_" + bufferDistance.replace(" ", ""), bufferDistance, "", "", "ALL")
+        bufferGeometry = [row[0] for row in arcpy.da.SearchCursor("Buffer_" + parkName + "_" + bufferDistance.replace(" ", ""), "SHAPE@WKB", spatial_reference=spatialRef)]
+        save_buffer(bufferCache, bufferKey, bufferGeometry)
+        print("Park buffer generated and cached...")
+    
+    # Remove waypoints outside the buffer with an in-memory point-in-polygon test instead of clipping to temporary feature classes
+    waypoints = waypoints[buffer_mask(bufferGeometry, waypoints["lon"].to_numpy(), waypoints["lat"].to_numpy())]
+    stages.rows(rows_out=len(waypoints))
+    print("Waypoints outside buffer removed...")
+    arcpy.AddMessage("Waypoints outside of management unit buffer removed...")
 
-        # Ensure waypoints exist within buffer before continuing, otherwise exit      
-        if int(arcpy.GetCount_management("temp2") [0]) > 0:
-            print("Aircraft waypoints exist within the buffered park boundary.  Continuing processing...")
-            pass
-        else:
-            raise WaypointError
-        
-        # Convert altitude (MSL) units converted from meters to feet and screen waypoints above threshold
-        arcpy.SetProgressorLabel("Calculating altitude (MSL in feet) and removing waypoints above altitude threshold...")
-        arcpy.SetProgressorPosition()
-        arcpy.management.CalculateField("temp2", "alt_msl", "int(!altitude! * 3.28084)", "PYTHON3", "", "LONG")
-        arcpy.analysis.Select("temp2", "temp3", """"alt_msl" <= %s""" %mslFilter)
-        print("Waypoints above user-defined altitude threshold removed...")
-        arcpy.AddMessage("Waypoints above user-defined altitude threshold removed...")
+    # Ensure waypoints exist within buffer before continuing, otherwise exit      
+    if len(waypoints) > 0:
+        print("Aircraft waypoints exist within the buffered park boundary.  Continuing processing...")
+        pass
+    else:
+        raise WaypointError
+    
+    # Convert altitude (MSL) units converted from meters to feet and screen waypoints above threshold
+    stages.start("msl", len(waypoints))
+    waypoints["alt_msl"] = altitude_msl(waypoints["altitude"]).astype("int32")
+    waypoints = waypoints[below_msl_threshold(waypoints["alt_msl"], mslFilter)]
+    stages.rows(rows_out=len(waypoints))
+    print("Waypoints above user-defined altitude threshold removed...")
+    arcpy.AddMessage("Waypoints above user-defined altitude threshold removed...")
 
-        # Perform AGL calculations and add new attribute field to waypoints
-        arcpy.SetProgressorLabel("Calculating waypoint altitudes (AGL in feet)...")
-        arcpy.SetProgressorPosition()
-        countPts = arcpy.management.GetCount("temp3")
-        arcpy.sa.ExtractValuesToPoints("temp3", inputDEM,  outputFile + "_Points_" + bufferDistance.replace(" ", ""))
-        arcpy.management.CalculateField(outputFile + "_Points_" + bufferDistance.replace(" ", ""), "alt_agl", "int(!alt_msl! - !RASTERVALU! * 3.28084)", "PYTHON3", "", "LONG")
-        arcpy.management.DeleteField(outputFile + "_Points_" + bufferDistance.replace(" ", ""), ["RASTERVALU"])
-        print("Aircraft altitude above ground level (AGL in feet) calculated...")
-        arcpy.AddMessage("Aircraft altitude above ground level (AGL in feet) calculated...")
+    # Locate a DEM file that can be memory-mapped, exporting the input DEM to a floating point raster in the scratch folder when needed and reusing the export only while the DEM is unchanged
+    # Exports are keyed by the DEM's own files and its extent, cell size, and spatial reference, and only the most recently used exports are kept
+    countPts = len(waypoints)
+    stages.start("agl", countPts)
+    demDescribe = arcpy.Describe(inputDEM)
+    demPath = demDescribe.catalogPath
+    demFile = dem_file(demPath)
+    if demFile is None:
+        demDescription = "|".join(str(v) for v in [demDescribe.extent, demDescribe.meanCellWidth, demDescribe.meanCellHeight, demDescribe.width, demDescribe.height, demDescribe.spatialReference.exportToString()])
+        demExport = export_name(demPath, demDescription)
+        demFile = find_export(arcpy.env.scratchFolder, demExport)
+        if demFile is None:
+            demFile = os.path.join(arcpy.env.scratchFolder, demExport)
+            arcpy.conversion.RasterToFloat(inputDEM, demFile)
+            evict_exports(arcpy.env.scratchFolder)
+    
+    # Create the point feature class from the screened waypoints, then sample terrain elevations at waypoints (projected to the DEM coordinate system) and write AGL altitudes in one cursor pass
+    arcpy.da.NumPyArrayToFeatureClass(to_structured_array(waypoints), outputFile + "_Points_" + bufferDistance.replace(" ", ""), ("lon", "lat", "altitude"), spatialRef)
+    print("Point feature class created from ADS-B input file...")
+    demPoints = arcpy.da.FeatureClassToNumPyArray(outputFile + "_Points_" + bufferDistance.replace(" ", ""), ["alt_msl", "SHAPE@X", "SHAPE@Y"], spatial_reference=demDescribe.spatialReference)
+    elevation = sample_dem(demFile, demPoints["SHAPE@X"], demPoints["SHAPE@Y"], demSampling)
+    arcpy.management.AddField(outputFile + "_Points_" + bufferDistance.replace(" ", ""), "alt_agl", "LONG")
+    with arcpy.da.UpdateCursor(outputFile + "_Points_" + bufferDistance.replace(" ", ""), "alt_agl") as cursor:
+        for row, agl in zip(cursor, altitude_agl_values(demPoints["alt_msl"], elevation)):
+            cursor.updateRow([agl])
+    stages.rows(rows_out=len(demPoints))
+    print("Aircraft altitude above ground level (AGL in feet) calculated...")
+    arcpy.AddMessage("Aircraft altitude above ground level (AGL in feet) calculated...")
+    
+    
+    # Load the cached FAA lookup index, which is rebuilt only when the FAA Releasable Database text files change, and read waypoint keys and coordinates once
+    stages.start("faa_waypoints", countPts)
+    faaIndex = faa_index(faaTable)
+    waypoints = arcpy.da.FeatureClassToNumPyArray(outputFile + "_Points_" + bufferDistance.replace(" ", ""), [inField1, "flight_id", "TIME", "SHAPE@X", "SHAPE@Y"])
+    stages.rows(rows_out=len(waypoints))
+    if faaIndex is not None:
+        faaValues = faa_values(waypoints[inField1], faaIndex, faaFields)
+    if faaJoinMode == "AIRCRAFT_TABLE":
         
+        # Store FAA attributes once per aircraft in a table related to waypoints by ICAO address instead of on every waypoint
+        aircraft = aircraft_table(waypoints[inField1], waypoints["flight_id"], faaIndex, faaFields)
+        arcpy.management.CreateTable(outputWorkspace, outputFile + "_Aircraft_" + bufferDistance.replace(" ", ""))
+        arcpy.management.AddFields(outputFile + "_Aircraft_" + bufferDistance.replace(" ", ""), [[inField1, "TEXT"], ["WAYPOINTS", "LONG"], ["FLIGHTS", "LONG"]] + [[field, faa_field_types[field]] for field in aircraft.columns if field in faaFields])
+        with arcpy.da.InsertCursor(outputFile + "_Aircraft_" + bufferDistance.replace(" ", ""), list(aircraft.columns)) as cursor:
+            for row in cursor_rows(aircraft):
+                cursor.insertRow(row)
+        if faaIndex is None:
+            arcpy.management.CalculateField(joinTable1, joinField1, "!MODE_S_CODE_HEX!.strip()", "PYTHON3")
+            arcpy.management.JoinField(outputFile + "_Aircraft_" + bufferDistance.replace(" ", ""), inField1, joinTable1, joinField1, fieldList1)
+            arcpy.management.JoinField(outputFile + "_Aircraft_" + bufferDistance.replace(" ", ""), inField2, joinTable2, joinField2, fieldList2)
+        arcpy.management.CreateRelationshipClass(outputFile + "_Aircraft_" + bufferDistance.replace(" ", ""), outputFile + "_Points_" + bufferDistance.replace(" ", ""), outputFile + "_Aircraft_Points_" + bufferDistance.replace(" ", ""), "SIMPLE", "Waypoints", "Aircraft", "NONE", "ONE_TO_MANY", "NONE", inField1, inField1)
+        print("FAA fields stored once per aircraft in {0} aircraft table related to waypoints...".format(len(aircraft)))
+    elif faaIndex is not None:
+        
+        # Look up FAA attributes once per aircraft in memory and write them to waypoints in a single cursor pass
+        arcpy.management.AddFields(outputFile + "_Points_" + bufferDistance.replace(" ", ""), [[field, faa_field_types[field]] for field in faaFields])
+        with arcpy.da.UpdateCursor(outputFile + "_Points_" + bufferDistance.replace(" ", ""), [inField1] + faaFields) as cursor:
+            for row in cursor:
+                cursor.updateRow([row[0]] + faaValues[row[0]])
+        print("FAA fields joined to waypoint file from cached FAA lookup index...")
+    else:
         
         # Strip whitespace from the MODE_S_CODE_HEX field in the FAA MASTER file for waypoint table join
-        arcpy.SetProgressorLabel("Joining fields from FAA Releaseable Database MASTER table to waypoints...")
-        arcpy.SetProgressorPosition()
         arcpy.management.CalculateField(joinTable1, joinField1, "!MODE_S_CODE_HEX!.strip()", "PYTHON3")
         
         # Perform a table join to add FAA database variables from MASTER file to waypoints
@@ -125,95 +194,83 @@ try:
         print("FAA fields N_Number, Type_Aircraft, Type_Engine, Name, and MFR_MDL_Code joined to waypoint file from MASTER table to waypoints...")
         
         # Perform a table join to add FAA database variables from ACFTREF file to waypoints
-        arcpy.SetProgressorLabel("Joining fields from FAA Releaseable Database ACFTREF to waypoints...")
-        arcpy.SetProgressorPosition()
         arcpy.management.JoinField(outputFile + "_Points_" + bufferDistance.replace(" ", ""), inField2, joinTable2, joinField2, fieldList2)   
         print("FAA field MODEL joined to waypoint file from ACFTREF table...")
-        arcpy.AddMessage("Select fields from FAA Releasable Database joined to waypoint file...")
-        
-        # Create line feature class from screened waypoints
-        arcpy.SetProgressorLabel("Creating initial flightline feature class from filtered ADS-B waypoints...")
-        arcpy.SetProgressorPosition()
-        arcpy.management.PointsToLine(outputFile + "_Points_" + bufferDistance.replace(" ", ""), "temp4", "flight_id", "TIME")
-        countLines = arcpy.management.GetCount("temp4")
-        
-        # Retain only line features with > 0 length (0 length indicates 2 input waypoints with same x- and y-coordinate values)
-        selRecs = arcpy.management.SelectLayerByAttribute("temp4", "NEW_SELECTION", "Shape_Length > 0")
-        arcpy.management.CopyFeatures(selRecs, outputFile + "_Lines_" + bufferDistance.replace(" ", ""))
-        
-        # Add a new field to store ICAO address and year by extracting  values from FlightID,then calculate flightline length (miles)
-        arcpy.management.AddField(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), "ICAO_address", "TEXT")
-        arcpy.management.CalculateField(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), "ICAO_address", "!flight_id![:6]", "PYTHON3")
-        arcpy.management.AddField(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), "Year", "SHORT")
-        arcpy.management.CalculateField(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), "Year", "!flight_id![-8:-4]", "PYTHON3")
-        arcpy.management.CalculateGeometryAttributes(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), [["LengthMiles", "LENGTH_GEODESIC"]], "MILES_US")
-        print("Line feature class created from ADS-B waypoint data...")
-        arcpy.AddMessage("Line feature class created from ADS-B waypoint file {0}...".format(outputFile))
+    arcpy.AddMessage("Select fields from FAA Releasable Database joined to waypoint file...")
+    
+    # Build flightline geometry, length (miles), and sinuosity from screened waypoint coordinates in a single pass
+    stages.start("flightlines", len(waypoints))
+    lines = flightline_table(waypoints["flight_id"], waypoints["TIME"], waypoints["SHAPE@X"], waypoints["SHAPE@Y"])
+    countLines = len(lines)
+    stages.rows(rows_out=countLines)
+    
+    # Retain only line features with > 0 length (0 length indicates 2 input waypoints with same x- and y-coordinate values)
+    lines = lines[~lines["ZeroLength"]]
+    
+    # Write flightlines and their ICAO address, year, length, and sinuosity attributes in bulk with an insert cursor
+    stages.start("write_lines", len(lines))
+    arcpy.management.CreateFeatureclass(outputWorkspace, outputFile + "_Lines_" + bufferDistance.replace(" ", ""), "POLYLINE", spatial_reference=spatialRef)
+    arcpy.management.AddFields(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), [["flight_id", "TEXT"], ["ICAO_address", "TEXT"], ["Year", "SHORT"], ["LengthMiles", "DOUBLE"], ["Sinuosity", "FLOAT"]])
+    with arcpy.da.InsertCursor(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), ["SHAPE@WKB"] + lineFields) as cursor:
+        for row in zip(lines["Shape"], *[lines[field].tolist() for field in lineFields]):
+            cursor.insertRow(row)
+    print("Line feature class created from ADS-B waypoint data and sinuosity calculated for flight lines...")
+    arcpy.AddMessage("Line feature class created from ADS-B waypoint file {0}...".format(outputFile))
+    arcpy.AddMessage("Sinuosity calculated for flightline file...")
 
-        # Add new field to store sinuosity values
-        arcpy.SetProgressorLabel("Calculating the sinuosity of aircraft flightlines...")
-        arcpy.SetProgressorPosition()
-        arcpy.management.AddField(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), "Sinuosity", "FLOAT")    
-        print("New field for sinuosity created...")
+    # Join FAA attributes to flightlines from the values already looked up for waypoints, or from the FAA geodatabase tables
+    stages.start("faa_lines", len(lines))
+    if faaIndex is not None:
+        arcpy.management.AddFields(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), [[field, faa_field_types[field]] for field in faaFields])
+        with arcpy.da.UpdateCursor(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), [inField1] + faaFields) as cursor:
+            for row in cursor:
+                cursor.updateRow([row[0]] + faaValues[row[0]])
+        print("FAA fields joined to flightline file from cached FAA lookup index...")
+    elif faaJoinMode == "AIRCRAFT_TABLE":
+        arcpy.management.JoinField(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), inField1, outputFile + "_Aircraft_" + bufferDistance.replace(" ", ""), inField1, faaFields)
+        print("FAA fields joined to flightline file from aircraft table...")
+    else:
         
-        # Apply sinuosity calculation
-        arcpy.management.CalculateField(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), "Sinuosity", "getSinuosity(!Shape!)", "PYTHON3", codeblock1)
-        print("Sinuosity calculated for flight lines...")
-        arcpy.AddMessage("Sinuosity calculated for flightline file...")
-
-        # Strip whitespace from the MODE_S_CODE_HEX field in the FAA MASTER file for flightline table join
-        arcpy.SetProgressorLabel("Joining fields from FAA Releaseable Database MASTER table to flighlines...")
-        arcpy.SetProgressorPosition()
-        arcpy.management.CalculateField(joinTable1, joinField1, "!MODE_S_CODE_HEX!.strip()", "PYTHON3")
-    
-        # Perform a table join to add FAA database variables from MASTER file to flightline
+        # Perform a table join to add FAA database variables from MASTER file to flightline (MODE_S_CODE_HEX was stripped for the waypoint join)
         arcpy.management.JoinField(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), inField1, joinTable1, joinField1, fieldList1)
         print("FAA fields N_Number, Type_Aircraft, Type_Engine, Name, and MFR_MDL_Code joined from MASTER table to flightline file...")
     
         # Perform a table join to add FAA database variables from ACFTREF file to flightline
-        arcpy.SetProgressorLabel("Joining fields from FAA Releaseable Database ACFTREF table to flightlines...")
-        arcpy.SetProgressorPosition()
         arcpy.management.JoinField(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), inField2, joinTable2, joinField2, fieldList2)   
         print("FAA field MODEL joined from ACFTREF table to flightline file...")
-        arcpy.AddMessage("Select fields from FAA Releasable Database joined to flightline file...")
-        
-        # Count number of aircraft with "null" N-Numbers (i.e., aircraft not in FAA database)
-        arcpy.SetProgressorLabel("Finalizing flightline feature class with fields from FAA Releasable Database...")
-        arcpy.SetProgressorPosition()
-        selFlight = arcpy.management.SelectLayerByAttribute(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), "NEW_SELECTION", "N_NUMBER IS NULL")
-        countNA = arcpy.management.GetCount(selFlight)
-                
-        # Report aircraft and flight summaries and execution time
-        print("Success... Aircraft waypoint and flightline feature class created!")
-        arcpy.AddMessage("Success... Aircraft waypoint and flightline feature class created!")
-        
-        if countPts != 0:
-            print("There are {0} aircraft waypoints in {1}.".format(str(countPts), outputFile))
-            arcpy.AddMessage("There are {0} aircraft waypoints in {1}.".format(str(countPts), outputFile))
-        else:
-            pass            
-        if countLines != 0:
-            print("There are {0} aircraft flightlines in {1}.".format(str(countLines), outputFile))
-            arcpy.AddMessage("There are {0} aircraft flightlines in {1}.".format(str(countLines), outputFile))
-        else:
-            pass  
-        if countNA != 0:
-            print("There are {0} aircraft with null N-Number values in {1}.".format(str(countNA), outputFile)) 
-            arcpy.AddMessage("There are {0} aircraft with null N-Number values in {1}.".format(str(countNA), outputFile))
-        else:
-            pass
-        end = time.time()
-        print("Total Execution Time (secs) = {0}".format(str(round(end - start, 3))))
-        arcpy.AddMessage("Total Execution Time (secs) = {0}".format(str(round(end - start, 3))))
-        
-        # Check in Spatial Analyst Extension
-        arcpy.CheckInExtension("Spatial")
-        
-        # Reset the progressor
-        arcpy.ResetProgressor()
-
+    arcpy.AddMessage("Select fields from FAA Releasable Database joined to flightline file...")
+    
+    # Count number of aircraft with "null" N-Numbers (i.e., aircraft not in FAA database)
+    stages.start("finalize", len(lines))
+    selFlight = arcpy.management.SelectLayerByAttribute(outputFile + "_Lines_" + bufferDistance.replace(" ", ""), "NEW_SELECTION", "N_NUMBER IS NULL")
+    countNA = arcpy.management.GetCount(selFlight)
+            
+    # Report aircraft and flight summaries and execution time
+    stages.end()
+    print("Success... Aircraft waypoint and flightline feature class created!")
+    arcpy.AddMessage("Success... Aircraft waypoint and flightline feature class created!")
+    
+    if countPts != 0:
+        print("There are {0} aircraft waypoints in {1}.".format(str(countPts), outputFile))
+        arcpy.AddMessage("There are {0} aircraft waypoints in {1}.".format(str(countPts), outputFile))
     else:
-        arcpy.AddWarning("An ArcGIS Spatial Analyst extension is required!  The current status of this extension is {0}.".format(arcpy.CheckExtension("Spatial")))
+        pass            
+    if countLines != 0:
+        print("There are {0} aircraft flightlines in {1}.".format(str(countLines), outputFile))
+        arcpy.AddMessage("There are {0} aircraft flightlines in {1}.".format(str(countLines), outputFile))
+    else:
+        pass  
+    if countNA != 0:
+        print("There are {0} aircraft with null N-Number values in {1}.".format(str(countNA), outputFile)) 
+        arcpy.AddMessage("There are {0} aircraft with null N-Number values in {1}.".format(str(countNA), outputFile))
+    else:
+        pass
+    end = time.time()
+    print("Total Execution Time (secs) = {0}".format(str(round(end - start, 3))))
+    arcpy.AddMessage("Total Execution Time (secs) = {0}".format(str(round(end - start, 3))))
+    
+    # Reset the progressor
+    arcpy.ResetProgressor()
            
 except arcpy.ExecuteError:
     for i in range(0, arcpy.GetMessageCount()):
@@ -225,6 +282,10 @@ except WaypointError:
     
 finally:    
     
+    # Record the last stage, unless the stage log could not be created
+    if "stages" in locals():
+        stages.close()
+
     # Delete files no longer needed
     delList = arcpy.ListFeatureClasses("temp*")
     for i in delList:
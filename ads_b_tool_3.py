@@ -8,17 +8,24 @@
     Description:  Merges daily aircraft waypoint and flightlines feature classes into single feature classes for a desired time interval.
     Status:  Development
     Date created: 12/15/2021
-    Date last modified: 01/10/2024
+    Date last modified: 10/18/2026
     Python Version: 3.9.16
 """
 
 # Import libraries
-import arcpy, time
+import arcpy, os, time
+from ads_b.dedup import duplicate_ids
+from ads_b.merge import append_keys, flightline_key_fields, key_fingerprints, key_index, manifest_path, new_inputs, read_manifest, waypoint_key_fields, write_manifest
+from ads_b.stages import stage_log
 
 # User-specified local variable(s) for ArcGIS script tool
 inputWorkspace = arcpy.GetParameterAsText(0)
 outputPoints = arcpy.GetParameterAsText(1)
 outputLines = arcpy.GetParameterAsText(2)
+mergeMode = arcpy.GetParameterAsText(3) if arcpy.GetArgumentCount() > 3 else ""
+
+# Optional merge mode: FULL merges every daily feature class on each run, INCREMENTAL appends only daily feature classes not already merged; FULL is used when blank
+mergeMode = mergeMode.upper() if mergeMode else "FULL"
 
 # Set local environments
 arcpy.env.workspace = inputWorkspace
@@ -27,15 +34,23 @@ arcpy.env.overwriteOutput = True
 # Fixed local variables
 pointList = []
 lineList = []
+outputList = [os.path.normcase(os.path.abspath(outputPoints)), os.path.normcase(os.path.abspath(outputLines))]
+toolStages = [("list", "Creating a list of daily aircraft waypoint and flightline files..."),
+              ("merge_points", "Merging waypoint feature classes into a single point feature class..."),
+              ("merge_lines", "Merging flightline feature classes into a single line feature class..."),
+              ("report", "Preparing aircraft and flight summary information...")]
 
 try:
     
-    # Start timer and create progressor
+    # Start timer and create progressor driven by the stage registry
     start = time.time()
-    arcpy.SetProgressor("step", "Creating a list of daily aircraft waypoint and flightline files...", 0, 4, 1)
+    stages = stage_log("Tool 3", toolStages, arcpy)
+    stages.start("list")
        
     # Search input workspace and identify aircraft waypoint point and flight line feature classes
     for fc in arcpy.ListFeatureClasses():
+        if os.path.normcase(os.path.abspath(os.path.join(inputWorkspace, fc))) in outputList:
+            continue
         desc = arcpy.Describe(fc)
         if desc.shapeType == "Point":
             pointList.append(fc)
@@ -43,19 +58,48 @@ try:
             lineList.append(fc)     
             
     # Merge point feature classes into a single file without duplicates
-    arcpy.SetProgressorLabel("Merging waypoint feature classes into a single point feature class...")
-    arcpy.SetProgressorPosition()
+    stages.start("merge_points")
     if len(pointList) > 0:
         arcpy.AddMessage("Merging waypoint feature classes...")
         desc = arcpy.Describe(pointList[0])
         parkName = desc.baseName[5:9]       
-        arcpy.management.Merge(pointList, outputPoints)
-        count1 = arcpy.management.GetCount(outputPoints)
-        arcpy.management.ConvertTimeField(outputPoints, 'TIME', "", 'DATE', 'TEXT', 'yyyyMMdd')
-        arcpy.management.DeleteIdentical(outputPoints, ['ICAO_address', 'lat', 'lon', 'DATE', 'altitude'])
-        count2 = arcpy.management.GetCount(outputPoints)
-        count3 = int(str(count1)) - int(str(count2))
-        arcpy.management.DeleteField(outputPoints, "DATE")        
+        pointCounts = {fc: int(str(arcpy.management.GetCount(fc))) for fc in pointList}
+        pointManifest, pointKeys = read_manifest(manifest_path(outputPoints)) if mergeMode == "INCREMENTAL" and arcpy.Exists(outputPoints) else (None, None)
+        newPoints = new_inputs(pointManifest, pointCounts) if pointManifest else None
+        if newPoints is not None:
+            # Append only daily waypoint feature classes not yet merged, skipping waypoints whose (ICAO_address, lat, lon, DATE, altitude) key is already in the merged feature class
+            print("Appending {0} new waypoint feature classes to the existing merged point feature class...".format(str(len(newPoints))))
+            arcpy.AddMessage("Appending {0} new waypoint feature classes to the existing merged point feature class...".format(str(len(newPoints))))
+            count1, count2 = 0, 0
+            for fc in newPoints:
+                rows = arcpy.da.FeatureClassToNumPyArray(fc, ["OID@", "ICAO_address", "lat", "lon", "TIME", "altitude"])
+                keep, pointKeys = append_keys(pointKeys, key_fingerprints(rows, waypoint_key_fields))
+                appendOIDs = rows["OID@"][keep].tolist()
+                if appendOIDs:
+                    appendLayer = arcpy.management.MakeFeatureLayer(fc, "appendLayer").getOutput(0)
+                    appendLayer.setSelectionSet(appendOIDs, "NEW")
+                    arcpy.management.Append(appendLayer, outputPoints, "NO_TEST")
+                    arcpy.management.Delete(appendLayer)
+                count1 += len(rows)
+                count2 += len(appendOIDs)
+            count3 = count1 - count2
+        else:
+            # Identify duplicate waypoints from hashed (ICAO_address, lat, lon, DATE, altitude) keys, with DATE taken from TIME in memory, and delete them by OID
+            arcpy.management.Merge(pointList, outputPoints)
+            rows = arcpy.da.FeatureClassToNumPyArray(outputPoints, ["OID@", "ICAO_address", "lat", "lon", "TIME", "altitude"])
+            duplicateOIDs = duplicate_ids(rows, waypoint_key_fields)
+            if duplicateOIDs:
+                deleteLayer = arcpy.management.MakeFeatureLayer(outputPoints, "deleteLayer").getOutput(0)
+                deleteLayer.setSelectionSet(duplicateOIDs, "NEW")
+                arcpy.management.DeleteFeatures(deleteLayer)
+                arcpy.management.Delete(deleteLayer)
+            count1 = len(rows)
+            count3 = len(duplicateOIDs)
+            count2 = count1 - count3
+            if mergeMode == "INCREMENTAL":
+                pointKeys = key_index(key_fingerprints(rows, waypoint_key_fields))
+        if mergeMode == "INCREMENTAL":
+            write_manifest(manifest_path(outputPoints), pointCounts, pointKeys)
         print("{0} waypoints were found in the input point feature classes.".format(str(count1)))        
         arcpy.AddMessage("{0} waypoints were found in the input point feature classes.".format(str(count1)))
         print("{0} duplicate waypoints were removed from the input files.".format(str(count3)))
@@ -68,19 +112,51 @@ try:
         pass
 
     # Merge line feature classes into a single file
-    arcpy.SetProgressorLabel("Merging flightline feature classes into a single line feature class...")
-    arcpy.SetProgressorPosition()
+    stages.start("merge_lines")
     arcpy.AddMessage("Merging flightline feature classes...")
     if len(lineList) > 0:
         desc = arcpy.Describe(lineList[0])
         parkName = desc.baseName[5:9]
-        arcpy.management.Merge(lineList, outputLines)
-        count4 = arcpy.management.GetCount(outputLines)
-        print("{0} flightlines were found in the input line feature classes.".format(str(count4)))        
-        arcpy.AddMessage("{0} flightlines were found in the input line feature classes.".format(str(count4)))
-        arcpy.management.DeleteIdentical(outputLines, ['flight_id', 'LengthMiles', 'Sinuosity'])   
-        count5 = arcpy.management.GetCount(outputLines)
-        count6 = int(str(count4)) - int(str(count5))
+        lineCounts = {fc: int(str(arcpy.management.GetCount(fc))) for fc in lineList}
+        lineManifest, lineKeys = read_manifest(manifest_path(outputLines)) if mergeMode == "INCREMENTAL" and arcpy.Exists(outputLines) else (None, None)
+        newLines = new_inputs(lineManifest, lineCounts) if lineManifest else None
+        if newLines is not None:
+            # Append only daily flightline feature classes not yet merged, skipping flightlines whose (flight_id, LengthMiles, Sinuosity) key is already in the merged feature class
+            print("Appending {0} new flightline feature classes to the existing merged line feature class...".format(str(len(newLines))))
+            arcpy.AddMessage("Appending {0} new flightline feature classes to the existing merged line feature class...".format(str(len(newLines))))
+            count4, count5 = 0, 0
+            for fc in newLines:
+                rows = arcpy.da.FeatureClassToNumPyArray(fc, ["OID@", "flight_id", "LengthMiles", "Sinuosity"])
+                keep, lineKeys = append_keys(lineKeys, key_fingerprints(rows, flightline_key_fields))
+                appendOIDs = rows["OID@"][keep].tolist()
+                if appendOIDs:
+                    appendLayer = arcpy.management.MakeFeatureLayer(fc, "appendLayer").getOutput(0)
+                    appendLayer.setSelectionSet(appendOIDs, "NEW")
+                    arcpy.management.Append(appendLayer, outputLines, "NO_TEST")
+                    arcpy.management.Delete(appendLayer)
+                count4 += len(rows)
+                count5 += len(appendOIDs)
+            count6 = count4 - count5
+            print("{0} flightlines were found in the input line feature classes.".format(str(count4)))        
+            arcpy.AddMessage("{0} flightlines were found in the input line feature classes.".format(str(count4)))
+        else:
+            arcpy.management.Merge(lineList, outputLines)
+            count4 = arcpy.management.GetCount(outputLines)
+            print("{0} flightlines were found in the input line feature classes.".format(str(count4)))        
+            arcpy.AddMessage("{0} flightlines were found in the input line feature classes.".format(str(count4)))
+            rows = arcpy.da.FeatureClassToNumPyArray(outputLines, ["OID@", "flight_id", "LengthMiles", "Sinuosity"])
+            duplicateOIDs = duplicate_ids(rows, flightline_key_fields)
+            if duplicateOIDs:
+                deleteLayer = arcpy.management.MakeFeatureLayer(outputLines, "deleteLayer").getOutput(0)
+                deleteLayer.setSelectionSet(duplicateOIDs, "NEW")
+                arcpy.management.DeleteFeatures(deleteLayer)
+                arcpy.management.Delete(deleteLayer)
+            count6 = len(duplicateOIDs)
+            count5 = int(str(count4)) - count6
+            if mergeMode == "INCREMENTAL":
+                lineKeys = key_index(key_fingerprints(rows, flightline_key_fields))
+        if mergeMode == "INCREMENTAL":
+            write_manifest(manifest_path(outputLines), lineCounts, lineKeys)
         print("{0} duplicate flightlines were removed from the input files.".format(str(count6)))
         arcpy.AddMessage("{0} duplicate flightlines were removed from the input files.".format(str(count6)))
         print("A total of {0} unique flightlines were written to the merged line feature class.".format(str(count5)))        
@@ -91,8 +167,7 @@ try:
         pass
 
     # Report final aircraft summaries
-    arcpy.SetProgressorLabel("Preparing aircraft and flight summary information...")
-    arcpy.SetProgressorPosition()
+    stages.start("report")
     print("Success... Aircraft feature classes merged into single files!")
     arcpy.AddMessage("Success... Aircraft feature classes merged into single files!")
     print("{0} point feature classes were merged.".format(str(len(pointList))))
@@ -108,6 +183,10 @@ except arcpy.ExecuteError:
         arcpy.AddMessage("{0}:  {1}".format(arcpy.GetSeverity(i), arcpy.GetMessage(i)))
 
 finally:
+    # Record the last stage, unless the stage log could not be created
+    if "stages" in locals():
+        stages.close()
+
     # Report script tool execution time
     end = time.time()    
     print("Total Execution Time (secs) = {0}".format(str(round(end - start, 3))))    
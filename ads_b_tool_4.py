@@ -8,7 +8,7 @@
     Description:  Create waypoint and flightline files to further scrutinize suspected non-tourism flights.
     Status:  Development
     Date created: 2/22/2022
-    Date last modified: 1/26/2023
+    Date last modified: 10/18/2026
     Python Version: 3.9.16
 """
 
@@ -18,6 +18,8 @@ class NonGPError(Exception):
 
 # Import libraries
 import arcpy, time
+from ads_b.screening import flight_membership, flight_set, flight_table, rule_bitmask, screen_flights, screening_counts, screening_fields
+from ads_b.stages import stage_log
 
 # User-specified local variable(s) for ArcGIS script tool
 inputWaypoints = arcpy.GetParameterAsText(0)
@@ -35,121 +37,95 @@ outputScreenedMergedLines = arcpy.GetParameterAsText(9)
 arcpy.env.workspace = arcpy.Describe(inputWaypoints).path
 arcpy.env.overwriteOutput = True
 
+# Fixed local variables
+batchRows = 5000000
+toolStages = [("read_lines", "Reading merged flightline attributes for screening..."),
+              ("screen", "Evaluating screening criteria for merged flightlines..."),
+              ("write_lines", "Writing suspect and screened flightline feature classes..."),
+              ("rules", "Recording screening rules for suspect flightlines..."),
+              ("suspect_ids", "Creating list of suspect FLIGHT ID's..."),
+              ("partition", "Partitioning waypoints into suspect and screened waypoints..."),
+              ("write_waypoints", "Creating feature classes for suspect and screened waypoints...")]
+
 try:
     
-    # Start timer and create progressor
+    # Start timer and create progressor driven by the stage registry
     start = time.time()
-    arcpy.SetProgressor("step", "Copying merged flightlines for screening...", 0, 10, 1)
+    stages = stage_log("Tool 4", toolStages, arcpy)
        
-    # Make a feature layer of the flightline file to be screened
-    arcpy.management.CopyFeatures(inputFlightlines, outputScreenedMergedLines)
-    tempFlightlines = arcpy.management.MakeFeatureLayer(outputScreenedMergedLines)
-    
-    # Select flightlines with TYPE_REGISTRANT equal to user-supplied list in registrantValues
-    arcpy.SetProgressorLabel("Removing TYPE_REGISTRANT values from merged flightlines...")
-    arcpy.SetProgressorPosition()
-    valueList = list(registrantValues)    
-    fieldType = arcpy.ListFields(tempFlightlines, "TYPE_REGISTRANT")[0].type  
-    if fieldType == 'String':
-        whereClause = " OR ".join(["TYPE_REGISTRANT = '{}'".format(n) for n in valueList])
-        arcpy.management.SelectLayerByAttribute(tempFlightlines, "NEW_SELECTION", whereClause)
-    if fieldType == 'Integer':
-        whereClause = " OR ".join(["TYPE_REGISTRANT = {}".format(n) for n in valueList])
-        arcpy.management.SelectLayerByAttribute(tempFlightlines, "NEW_SELECTION", whereClause)
-    arcpy.management.CopyFeatures(tempFlightlines, 'temp1')   
-    count1 = arcpy.management.GetCount('temp1')
-    print(count1)
-    print("Flights meeting TYPE_REGISTRANT criteria selected...")
-    arcpy.AddMessage("Flights meeting TYPE_REGISTRANT criteria selected...")
-    arcpy.management.DeleteFeatures(tempFlightlines)
-        
-    # Select flightlines with Sinuosity values between user-supplied minimum and maximum
-    arcpy.SetProgressorLabel("Removing SINUOSITY values from merged flightlines...")
-    arcpy.SetProgressorPosition()
-    arcpy.management.SelectLayerByAttribute(tempFlightlines, "CLEAR_SELECTION")
-    splitSinuosityValues = sinuosityValues.split(", ")
-    whereClause = """{0} < {1[0]} OR {0} >  {1[1]}""".format(arcpy.AddFieldDelimiters(tempFlightlines, "Sinuosity"), splitSinuosityValues)
-    arcpy.management.SelectLayerByAttribute(tempFlightlines, 'NEW_SELECTION', whereClause)
-    arcpy.management.CopyFeatures(tempFlightlines, 'temp2')
-    count2 = arcpy.management.GetCount('temp2')
-    print("Flights meeting Sinuosity criteria selected...")
-    arcpy.AddMessage("Flights meeting Sinuosity criteria selected...")    
-    arcpy.management.DeleteFeatures(tempFlightlines)
-    
-    # Select commercial flightlines with NAME equal to user-supplied list in nameValues
-    arcpy.SetProgressorLabel("Removing OPERATOR values from merged flightlines...")
-    arcpy.SetProgressorPosition()
-    arcpy.management.SelectLayerByAttribute(tempFlightlines, "CLEAR_SELECTION")    
-    nameValues = nameValues.replace(", ", ",")
-    newNameValues = nameValues.split(",")    
-    whereClause = " OR ".join(["NAME = '{}'".format(n) for n in newNameValues])
-    arcpy.management.SelectLayerByAttribute(tempFlightlines, "NEW_SELECTION", whereClause)        
-    arcpy.management.CopyFeatures(tempFlightlines, 'temp3')
-    count3 = arcpy.management.GetCount('temp3')
-    print("Commerical flights meeting Operator Name(s) selected...")
-    arcpy.AddMessage("Commercial flights meeting Operator Name(s) selected...")           
-    arcpy.management.DeleteFeatures(tempFlightlines)
-    
-    # Select flightlines with length in miles less than threshold in user-supplied mileValue
-    arcpy.SetProgressorLabel("Removing flights less than MIN PATH LENGTH from merged flightlines...")
-    arcpy.SetProgressorPosition()
-    arcpy.management.SelectLayerByAttribute(tempFlightlines, "CLEAR_SELECTION")
-    whereClause = "LengthMiles < {0}".format(mileValue)
-    arcpy.management.SelectLayerByAttribute(tempFlightlines, 'NEW_SELECTION', whereClause)
-    arcpy.management.CopyFeatures(tempFlightlines, 'temp4')
-    count4 = arcpy.management.GetCount('temp4')
-    arcpy.management.DeleteFeatures(tempFlightlines)
-    print("Flights less than minimum path length selected...")
-    arcpy.AddMessage("Flights less than minimum path length selected...")
-    
-    # Merge temporary files into single new screening flightline file and delete temp files
-    arcpy.SetProgressorLabel("Merging suspect flightlines into output feature class.....")
-    arcpy.SetProgressorPosition()
-    arcpy.management.Merge(['temp1', 'temp2', 'temp3', 'temp4'], outputSuspectLines)
-    arcpy.management.DeleteIdentical(outputSuspectLines, ['flight_id', 'LengthMiles', 'Sinuosity'])      
-    count5 = arcpy.management.GetCount(outputSuspectLines)
-    print("Suspect flightlines merged into new screening feature class...")
-    arcpy.AddMessage("Suspect flightlines merged into new screening feature class...")            
-    
-    # Delete temporary files
-    arcpy.SetProgressorLabel("Removing temporary files...")
-    arcpy.SetProgressorPosition()
-    delList = arcpy.ListFeatureClasses("temp*")
-    for i in delList:
-        arcpy.management.Delete(i)
-    print("Temporary files removed from current workspace...")
-    arcpy.AddMessage("Temporary files removed from current workspace...")
-    
-    # Create a list of flight_id's for screened flightlines to screen waypoints
-    arcpy.SetProgressorLabel("Creating list of suspect FLIGHT ID's...")
-    arcpy.SetProgressorPosition()      
-    flightIdList = []
-    with arcpy.da.SearchCursor(outputSuspectLines, 'flight_id') as cursor:
+    # Read the flightline attributes used by the screening rules
+    stages.start("read_lines")
+    lines = flight_table(arcpy.da.SearchCursor(inputFlightlines, ["OID@"] + screening_fields), ["OID@"] + screening_fields)
+    stages.rows(rows_out=len(lines))
+    print("Merged flightline attributes read...")
+    arcpy.AddMessage("Merged flightline attributes read...")
+
+    # Evaluate the TYPE_REGISTRANT, Sinuosity, operator NAME, and minimum path length criteria in a single pass and record which rules each flightline meets as a bitmask
+    stages.start("screen", len(lines))
+    criteria = screen_flights(lines, registrantValues, sinuosityValues, nameValues, mileValue)
+    ruleMask = rule_bitmask(criteria)
+    counts = screening_counts(criteria)
+    count1, count2, count3, count4, count5 = counts["registrant"], counts["sinuosity"], counts["operator"], counts["length"], counts["suspect"]
+    stages.rows(rows_out=count5)
+    print("Flights meeting TYPE_REGISTRANT, Sinuosity, Operator Name(s), and minimum path length criteria selected...")
+    arcpy.AddMessage("Flights meeting TYPE_REGISTRANT, Sinuosity, Operator Name(s), and minimum path length criteria selected...")
+
+    # Write suspect and screened flightlines in one pass each from selection sets on the merged flightlines
+    stages.start("write_lines")
+    suspectOIDs = lines["OID@"][ruleMask > 0].tolist()
+    screenedOIDs = lines["OID@"][ruleMask == 0].tolist()
+    for outputLines, lineOIDs in [(outputSuspectLines, suspectOIDs), (outputScreenedMergedLines, screenedOIDs)]:
+        lineLayer = arcpy.management.MakeFeatureLayer(inputFlightlines, "lineLayer", "" if lineOIDs else "1 = 0").getOutput(0)
+        if lineOIDs:
+            lineLayer.setSelectionSet(lineOIDs, "NEW")
+        arcpy.management.CopyFeatures(lineLayer, outputLines)
+        arcpy.management.Delete(lineLayer)
+    print("Suspect flightlines written to new screening feature class...")
+    arcpy.AddMessage("Suspect flightlines written to new screening feature class...")
+
+    # Record the screening rules met by each suspect flightline (1 = registrant, 2 = sinuosity, 4 = operator, 8 = length)
+    stages.start("rules")
+    flightRules = dict(zip(lines["flight_id"][ruleMask > 0], ruleMask[ruleMask > 0].tolist()))
+    arcpy.management.AddField(outputSuspectLines, "SCREEN_RULES", "SHORT")
+    with arcpy.da.UpdateCursor(outputSuspectLines, ["flight_id", "SCREEN_RULES"]) as cursor:
         for row in cursor:
-            flightIdList.append(row[0])
+            cursor.updateRow([row[0], flightRules[row[0]]])
+    print("Screening rules recorded for suspect flightlines...")
+    arcpy.AddMessage("Screening rules recorded for suspect flightlines...")
+
+    # Create a list of flight_id's for screened flightlines to screen waypoints
+    stages.start("suspect_ids")
+    flightIdList = list(flightRules)
     print("List of suspect Flight IDs created...")
-    arcpy.AddMessage("List of suspect Flight IDs created...")             
+    arcpy.AddMessage("List of suspect Flight IDs created...")
 
-    # Make a feature layer of the waypoints file to be cleaned
-    arcpy.SetProgressorLabel("Creating feature class for suspect waypoints...")
-    arcpy.SetProgressorPosition()    
-    tempWaypoints = arcpy.management.MakeFeatureLayer(inputWaypoints)
-    
-    # Select flight_id's and save waypoints to new screening waypoint file
-    flights = "', '".join(flightIdList)
-    whereClause = """{0} IN ('{1}')""".format(arcpy.AddFieldDelimiters(tempWaypoints, "flight_id"), flights)
-    arcpy.management.SelectLayerByAttribute(tempWaypoints, 'NEW_SELECTION', whereClause)
-    arcpy.management.CopyFeatures(tempWaypoints, outputSuspectPoints)
-    print("New feature class created for suspect waypoints...")
-    arcpy.AddMessage("New feature class created for suspect waypoints...")
+    # Partition waypoints by joining their flight_id's to the set of suspect flight_id's, reading waypoints in batches of ObjectIDs rather than selecting them with an IN clause
+    stages.start("partition")
+    suspectFlights = flight_set(flightIdList)
+    oidField = arcpy.Describe(inputWaypoints).OIDFieldName
+    with arcpy.da.SearchCursor(inputWaypoints, "OID@", sql_clause=(None, "ORDER BY {0} DESC".format(oidField))) as cursor:
+        maxOID = next(cursor, [0])[0]
+    suspectOIDs, screenedOIDs = [], []
+    for batchStart in range(0, maxOID + 1, batchRows):
+        rows = arcpy.da.FeatureClassToNumPyArray(inputWaypoints, ["OID@", "flight_id"], "{0} >= {1} AND {0} < {2}".format(oidField, batchStart, batchStart + batchRows))
+        suspect = flight_membership(rows["flight_id"], suspectFlights)
+        suspectOIDs.append(rows["OID@"][suspect])
+        screenedOIDs.append(rows["OID@"][~suspect])
+    stages.rows(sum(len(batch) for batch in suspectOIDs + screenedOIDs), sum(len(batch) for batch in suspectOIDs))
+    print("Waypoints partitioned by suspect Flight IDs...")
+    arcpy.AddMessage("Waypoints partitioned by suspect Flight IDs...")
     
-    # Switch selection and save waypoints to a new screened waypoint file
-    arcpy.SetProgressorLabel("Removing suspect waypoints from new merged waypoint feature class...")
-    arcpy.SetProgressorPosition()
-    arcpy.management.SelectLayerByAttribute(tempWaypoints, 'SWITCH_SELECTION')
-    arcpy.management.CopyFeatures(tempWaypoints, outputScreenedMergedPoints)
-    print("Suspect waypoints removed from new merged waypoint feature class...")
-    arcpy.AddMessage("Suspect waypoints removed from new merged waypoint feature class...")              
+    # Save suspect and screened waypoints to new waypoint files from selection sets
+    stages.start("write_waypoints")
+    for outputPoints, pointOIDs in [(outputSuspectPoints, suspectOIDs), (outputScreenedMergedPoints, screenedOIDs)]:
+        pointOIDs = [oid for batch in pointOIDs for oid in batch.tolist()]
+        pointLayer = arcpy.management.MakeFeatureLayer(inputWaypoints, "pointLayer", "" if pointOIDs else "1 = 0").getOutput(0)
+        if pointOIDs:
+            pointLayer.setSelectionSet(pointOIDs, "NEW")
+        arcpy.management.CopyFeatures(pointLayer, outputPoints)
+        arcpy.management.Delete(pointLayer)
+    print("New feature classes created for suspect and screened waypoints...")
+    arcpy.AddMessage("New feature classes created for suspect and screened waypoints...")
 
     # Print final summary messages
     print("{0} flights met the registrant type(s).".format(str(count1))) 
@@ -175,6 +151,10 @@ except NonGPError:
     arcpy.AddError("A non-geoprocessing error occurred. Please ask for technical assistance.")
 
 finally:    
+    # Record the last stage, unless the stage log could not be created
+    if "stages" in locals():
+        stages.close()
+
     # Report aircraft and flight summaries and execution time
     end = time.time()
     print("Total Execution Time (secs) = {0}".format(str(round(end - start, 3))))    
@@ -8,7 +8,7 @@
     Description:  Generates output tables summarizing waypoint altitudes (both MSL and AGL) by user-defined classes, creates kernel density grids for each AGL class, and produces optional band collection statistics
     Status:  Development
     Date created: 1/24/2022
-    Date last modified: 3/22/2023
+    Date last modified: 10/18/2026
     Python Version: 3.9.16
 """
 
@@ -18,6 +18,12 @@ class WhitespaceError(Exception):
 
 # Import libraries
 import arcpy, time, os
+from ads_b.altitudes import class_count, histogram_flights, histogram_summary, new_histogram, update_histogram
+from ads_b.buffers import buffer_key, load_buffer, save_buffer
+from ads_b.density import band_masks, kernel_density, unit_scale
+from ads_b.formats import to_structured_array
+from ads_b.geometry import buffer_mask
+from ads_b.stages import stage_log
 
 # User-specified local variable(s) for ArcGIS script tool
 parkName = arcpy.GetParameterAsText(0)
@@ -38,7 +44,7 @@ arcpy.env.workspace = arcpy.Describe(inputWaypoints).path
 arcpy.env.overwriteOutput = True
 arcpy.env.extent = inputWaypoints
 
-# Parallel Processing Factor - applies only to Buffer. Clip, and Kernel Density functions
+# Parallel Processing Factor - applies only to the Buffer function
 arcpy.env.parallelProcessingFactor = "50%"
 
 # Fixed local variables
@@ -46,94 +52,80 @@ totalWaypoints_agl = 0
 totalWaypoints_msl = 0
 totalFlights_agl = 0
 totalFlights_msl = 0
-aglClasses = round(int(aglMax)/int(aglInterval))
-mslClasses = round(int(mslMax)/int(mslInterval))
+aglClasses = class_count(aglMax, aglInterval)
+mslClasses = class_count(mslMax, mslInterval)
+bufferCache = os.path.join(arcpy.env.scratchFolder, "buffer_cache")
+batchRows = 5000000
+nullAltitude = 2147483647
+toolStages = [("buffer", "Creating the buffer and clipping screened waypoints..."),
+              ("histograms", "Clipping screened waypoints and summarizing AGL and MSL altitudes..."),
+              ("agl_waypoints", "Creating new output AGL waypoints feature class..."),
+              ("summary_tables", "Writing altitude frequencies and percentages..."),
+              ("report", "Preparing summary messages..."),
+              ("density", "Calculating kernel density for each AGL altitude band..."),
+              ("density_report", "Preparing final summary messages..."),
+              ("band_stats", "Preparing band collection statistics..."),
+              ("cleanup", "Finalizing messages and removing temporary files...")]
 
 try:
     
-    # Start timer and create progressor
+    # Start timer and create progressor driven by the stage registry
     start = time.time()
   
-    # Create buffer polygon around park boundary based on user-defined distance, then clip the inputFile
-    arcpy.SetProgressor("step", "Creating the buffer and clipping screened waypoints...", 0, 8, 1)
-    arcpy.analysis.Buffer(parkBoundaryFile, "temp1", bufferDistance)
-    arcpy.analysis.Clip(inputWaypoints,  "temp1", "temp2")
-    print("Buffer created and waypoints clipped.")    
-    arcpy.AddMessage("Buffer created and waypoints clipped.")    
-   
-    # Delete waypoints with AGL/MSL greater than the maximum value that won't be included in the summary tables
-    arcpy.SetProgressorLabel("Removing waypoints outside of desired altitude bands...")
-    arcpy.SetProgressorPosition()    
-    tempWaypoints = arcpy.management.MakeFeatureLayer("temp2")  
-    arcpy.analysis.Select(tempWaypoints, "temp3", """{0} <= {1}""".format(arcpy.AddFieldDelimiters(tempWaypoints, "alt_agl"), aglMax))
-    arcpy.analysis.Select(tempWaypoints, "temp4", """{0} <= {1}""".format(arcpy.AddFieldDelimiters(tempWaypoints, "alt_msl"), mslMax))
-    print("Selected waypoints removed.")    
-    arcpy.AddMessage("Selected waypoints removed.")
-
-    # Save refined AGL waypoints file for use in later summaries
-    arcpy.SetProgressorLabel("Creating new output AGL waypoints feature class...")
-    arcpy.SetProgressorPosition()
-    arcpy.management.CopyFeatures("temp3", outputWaypoints)
+    # Use a cached buffer polygon around park boundary based on user-defined distance (shared with Tool 2), or create and cache it, then find waypoints inside it with an in-memory point-in-polygon test
+    stages = stage_log("Tool 5", toolStages, arcpy)
+    stages.start("buffer")
+    boundaryGeometry = [row[0] for row in arcpy.da.SearchCursor(parkBoundaryFile, "SHAPE@WKB")]
+    bufferKey = buffer_key(boundaryGeometry, bufferDistance, arcpy.Describe(parkBoundaryFile).spatialReference.exportToString(), arcpy.Describe(inputWaypoints).spatialReference.exportToString())
+    bufferGeometry = load_buffer(bufferCache, bufferKey)
+    if bufferGeometry is None:
+        arcpy.analysis.Buffer(parkBoundaryFile, "memory/buffer", bufferDistance, "", "", "ALL")
+        bufferGeometry = [row[0] for row in arcpy.da.SearchCursor("memory/buffer", "SHAPE@WKB", spatial_reference=arcpy.Describe(inputWaypoints).spatialReference)]
+        arcpy.management.Delete("memory/buffer")
+        save_buffer(bufferCache, bufferKey, bufferGeometry)
+    print("Buffer created.")    
+    arcpy.AddMessage("Buffer created.")    
+
+    # Read waypoint coordinates, flight IDs, and altitudes once in batches of ObjectIDs, keeping waypoints inside the buffer and adding their altitudes to streaming AGL and MSL histograms
+    stages.start("histograms")
+    aglHistogram = new_histogram(aglMin, aglMax, aglInterval)
+    mslHistogram = new_histogram(mslMin, mslMax, mslInterval)
+    oidField = arcpy.Describe(inputWaypoints).OIDFieldName
+    with arcpy.da.SearchCursor(inputWaypoints, "OID@", sql_clause=(None, "ORDER BY {0} DESC".format(oidField))) as cursor:
+        maxOID = next(cursor, [0])[0]
+    bufferOIDs = []
+    for batchStart in range(0, maxOID + 1, batchRows):
+        rows = arcpy.da.FeatureClassToNumPyArray(inputWaypoints, ["OID@", "SHAPE@X", "SHAPE@Y", "flight_id", "alt_agl", "alt_msl"], "{0} >= {1} AND {0} < {2}".format(oidField, batchStart, batchStart + batchRows), null_value={"alt_agl": nullAltitude, "alt_msl": nullAltitude})
+        rows = rows[buffer_mask(bufferGeometry, rows["SHAPE@X"], rows["SHAPE@Y"])]
+        bufferOIDs.extend(rows["OID@"].tolist())
+        update_histogram(aglHistogram, rows["alt_agl"], rows["flight_id"])
+        update_histogram(mslHistogram, rows["alt_msl"], rows["flight_id"])
+    stages.rows(rows_out=len(bufferOIDs))
+    totalWaypoints_agl, totalFlights_agl = int(aglHistogram["counts"].sum()), histogram_flights(aglHistogram)
+    totalWaypoints_msl, totalFlights_msl = int(mslHistogram["counts"].sum()), histogram_flights(mslHistogram)
+    print("Waypoints clipped and altitudes summarized.")    
+    arcpy.AddMessage("Waypoints clipped and altitudes summarized.")
+
+    # Save refined AGL waypoints file for use in later summaries, removing waypoints with AGL greater than the maximum value
+    stages.start("agl_waypoints")
+    tempWaypoints = arcpy.management.MakeFeatureLayer(inputWaypoints, "tempWaypoints", "" if bufferOIDs else "1 = 0").getOutput(0)
+    if bufferOIDs:
+        tempWaypoints.setSelectionSet(bufferOIDs, "NEW")
+    arcpy.analysis.Select(tempWaypoints, outputWaypoints, """{0} <= {1}""".format(arcpy.AddFieldDelimiters(tempWaypoints, "alt_agl"), aglMax))
     print("New output AGL waypoints feature class created.")    
     arcpy.AddMessage("New output AGL waypoints feature class created.")       
 
-    # Determine the number of unique flights within the AGL and MSL datasets
-    arcpy.SetProgressorLabel("Identifying unique flights...")
-    arcpy.SetProgressorPosition()
-    arcpy.management.CopyFeatures(outputWaypoints, "temp5")      
-    arcpy.management.DeleteIdentical("temp5", "flight_id")     
-    totalFlights_agl = int(arcpy.management.GetCount("temp5").getOutput(0))       
-    arcpy.management.CopyFeatures("temp4", "temp6")      
-    arcpy.management.DeleteIdentical("temp6", "flight_id")     
-    totalFlights_msl = int(arcpy.management.GetCount("temp6").getOutput(0))       
-    print("Unique flights identified and counted.")    
-    arcpy.AddMessage("Unique flights identified and counted.")    
-
-    # Create and disassemble dictionaries to form AGL and MSL reclassification tables
-    arcpy.SetProgressorLabel("Creating dictionaries to form reclassification tables...")
-    arcpy.SetProgressorPosition()   
-    aglDct = {}
-    for i in range(0, aglClasses):
-        aglDct[int(aglMin) + int(aglInterval) * i] = '{}'.format(i)
-    agl_reclassTable = [[key, value] for key, value in aglDct.items()]
-    mslDct = {}
-    for i in range(0, mslClasses):
-        mslDct[int(mslMin) + int(mslInterval) * i] = '{}'.format(i)
-    msl_reclassTable = [[key, value] for key, value in mslDct.items()]
-    print("Reclassification tables constructed.")    
-    arcpy.AddMessage("Reclassification tables constructed.")        
-      
-    # Reclassify merged waypoints
-    arcpy.SetProgressorLabel("Reclassifying waypoints by AGL and MSL altitude bands...")
-    arcpy.SetProgressorPosition()    
-    arcpy.management.ReclassifyField("temp3", "alt_agl", "MANUAL", "", "", "", agl_reclassTable, "", "alt_agl_MANUAL")
-    arcpy.management.ReclassifyField("temp4", "alt_msl", "MANUAL", "", "", "", msl_reclassTable, "", "alt_msl_MANUAL")   
-    print("Reclassification complete.")    
-    arcpy.AddMessage("Reclassification complete.")
-    
-    # Summarize waypoint altitudes and write output to two new tables
-    arcpy.SetProgressorLabel("Calculating altitude frequencies and percentages...")
-    arcpy.SetProgressorPosition()
-    arcpy.analysis.Frequency("temp3", "temp7", ["alt_agl_MANUAL_RANGE", "alt_agl_MANUAL"])
-    totalWaypoints_agl = int(arcpy.management.GetCount("temp3").getOutput(0))
-    arcpy.analysis.Frequency("temp4", "temp8", ["alt_msl_MANUAL_RANGE", "alt_msl_MANUAL"])   
-    totalWaypoints_msl = int(arcpy.management.GetCount("temp4").getOutput(0))
-    arcpy.management.AddField("temp7", "PERCENTAGE", "DOUBLE")
-    arcpy.management.AddField("temp8", "PERCENTAGE", "DOUBLE")
-    with arcpy.da.UpdateCursor("temp7", ("FREQUENCY", "PERCENTAGE")) as cursor:
-        for frequency, percentage in cursor:            
-            cursor.updateRow([frequency, round(frequency / totalWaypoints_agl * 100, 1)])                      
-    arcpy.management.Sort("temp7", parkName + "_" + "WaypointSummary_AGL", "alt_agl_MANUAL") 
-    with arcpy.da.UpdateCursor("temp8", ("FREQUENCY", "PERCENTAGE")) as cursor:
-        for frequency, percentage in cursor:            
-            cursor.updateRow([frequency, round(frequency / totalWaypoints_msl * 100, 1)])                        
-    arcpy.management.Sort("temp8", parkName + "_" + "WaypointSummary_MSL", "alt_msl_MANUAL")
+    # Write the AGL and MSL altitude band frequencies, percentages, and distinct flights to two new tables
+    stages.start("summary_tables")
+    for summaryTable, histogram, field in [(parkName + "_" + "WaypointSummary_AGL", aglHistogram, "alt_agl"), (parkName + "_" + "WaypointSummary_MSL", mslHistogram, "alt_msl")]:
+        if arcpy.Exists(summaryTable):
+            arcpy.management.Delete(summaryTable)
+        arcpy.da.NumPyArrayToTable(to_structured_array(histogram_summary(histogram, field)), os.path.join(arcpy.env.workspace, summaryTable))
     print("Waypoint frequencies and percentages calculated.") 
     arcpy.AddMessage("Waypoint frequencies and percentages calculated.")
         
     # Report final aircraft summaries
-    arcpy.SetProgressorLabel("Preparing summary messages...")
-    arcpy.SetProgressorPosition()
+    stages.start("report")
     print("Success... Aircraft waypoint altitudes summarized!")
     arcpy.AddMessage("Success... Aircraft waypoint altitudes summarized!")
     print("AGL summary includes {0} waypoints from {1} flights.".format(totalWaypoints_agl, totalFlights_agl))
@@ -141,31 +133,29 @@ try:
     print("MSL summary includes {0} waypoints from {1} flights.".format(totalWaypoints_msl, totalFlights_msl))
     arcpy.AddMessage("MSL summary includes {0} waypoints from {1} flights.".format(totalWaypoints_msl, totalFlights_msl))
 
-    # Calculate kernel density grids for each AGL altitude band
-    if arcpy.CheckExtension("Spatial") == "Available":
-        arcpy.CheckOutExtension("Spatial")
-        
-        # Specify start and end values for altitude classes and produce kernel density grids
-        arcpy.SetProgressorLabel("Calculating kernel density for each AGL altitude band...")
-        arcpy.SetProgressorPosition()        
-        for i in range(0, aglClasses):
-            aglEnd = int(aglMin) + i * int(aglInterval)
-            aglStart = i * int(aglInterval)
-            selRecs = arcpy.management.SelectLayerByAttribute("temp3", "NEW_SELECTION", """ {0} > {1} AND {0} <= {2}""".format(arcpy.AddFieldDelimiters("temp3", "alt_agl"), aglStart, aglEnd))
-            outKernel = arcpy.sa.KernelDensity(selRecs, "", "", "", "SQUARE_KILOMETERS", "", "GEODESIC")            
-            outKernel.save(parkName + "_" + "KernelDensity" + "_" + str(aglStart) + "_" + str(aglEnd))
-            print("Kernel density for {0} to {1} feet AGL calculated.".format(str(aglStart), str(aglEnd)))
-            arcpy.AddMessage("Kernel density for {0} to {1} feet AGL calculated.".format(str(aglStart), str(aglEnd)))
-        
-        # Report final kernel density summaries and check in Spatial Analyst extension
-        arcpy.SetProgressorLabel("Preparing final summary messages...")
-        arcpy.SetProgressorPosition()
-        print("Success... AGL kernel density rasters created!")
-        arcpy.AddMessage("Success... AGL kernel density rasters created!")
-        arcpy.CheckInExtension("Spatial")
-         
+    # Calculate kernel density grids for every AGL altitude band at once on a shared grid, then write one raster per band
+    stages.start("density")
+    aglBands = [(i * int(aglInterval), int(aglMin) + i * int(aglInterval)) for i in range(0, aglClasses)]
+    kernelPoints = arcpy.da.FeatureClassToNumPyArray(outputWaypoints, ["SHAPE@X", "SHAPE@Y", "alt_agl"], null_value={"alt_agl": -1})
+    spatialRef = arcpy.Describe(outputWaypoints).spatialReference
+    extent = arcpy.Describe(inputWaypoints).extent
+    if spatialRef.type == "Geographic":
+        kernelScale = unit_scale(spatialRef.type, lat=(extent.YMin + extent.YMax) / 2, a=spatialRef.semiMajorAxis, f=spatialRef.flattening)
     else:
-        arcpy.Warning("An ArcGIS Spatial Analyst extension is required!  The current status of this extension is {0}.".format(arcpy.CheckExtension("Spatial")))
+        kernelScale = unit_scale(spatialRef.type, spatialRef.metersPerUnit)
+    stages.rows(rows_in=len(kernelPoints))
+    densities, grid = kernel_density(kernelPoints["SHAPE@X"], kernelPoints["SHAPE@Y"], band_masks(kernelPoints["alt_agl"], aglBands), (extent.XMin, extent.YMin, extent.XMax, extent.YMax), scale=kernelScale)
+    for (aglStart, aglEnd), density in zip(aglBands, densities):
+        outKernel = arcpy.NumPyArrayToRaster(density.astype("float32"), arcpy.Point(grid["xmin"], grid["ymin"]), grid["cell_size"], grid["cell_size"])
+        outKernel.save(parkName + "_" + "KernelDensity" + "_" + str(aglStart) + "_" + str(aglEnd))
+        arcpy.management.DefineProjection(parkName + "_" + "KernelDensity" + "_" + str(aglStart) + "_" + str(aglEnd), spatialRef)
+        print("Kernel density for {0} to {1} feet AGL calculated.".format(str(aglStart), str(aglEnd)))
+        arcpy.AddMessage("Kernel density for {0} to {1} feet AGL calculated.".format(str(aglStart), str(aglEnd)))
+
+    # Report final kernel density summaries
+    stages.start("density_report")
+    print("Success... AGL kernel density rasters created!")
+    arcpy.AddMessage("Success... AGL kernel density rasters created!")
 
     # Optional Processing - Calculate Band Collection Statistics to produce correlation matrix table 
     # Check to make sure optional outputTable path does not include spaces (required by text output)
@@ -182,8 +172,7 @@ try:
     try:
         if arcpy.CheckExtension("Spatial") == "Available":
             arcpy.CheckOutExtension("Spatial")
-            arcpy.SetProgressorLabel("Preparing band collection statistics...")
-            arcpy.SetProgressorPosition()
+            stages.start("band_stats")
             kernelList = arcpy.ListRasters("*" + "KernelDensity" + "*")
             arcpy.sa.BandCollectionStats(kernelList, outputTable, "DETAILED")        
             print("Success... Band collection stats calculated!")
@@ -208,8 +197,8 @@ except:
 
 finally:
         # Delete files no longer needed    
-    arcpy.SetProgressorLabel("Finalizing messages and removing temporary files...")
-    arcpy.SetProgressorPosition()
+    if "stages" in locals():
+        stages.start("cleanup")
     # Delete files no longer needed
     delList = arcpy.ListFeatureClasses("temp*")    
     for i in delList:
@@ -217,6 +206,8 @@ finally:
     delList = arcpy.ListTables("temp*")
     for i in delList:
         arcpy.management.Delete(i)        
+    if "stages" in locals():
+        stages.close()
 
     # Report execution time
     end = time.time()
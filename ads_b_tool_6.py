@@ -8,17 +8,26 @@
     Description:  Generates output tables summarizing waypoint frequencies by day, hour, month/year, aircraft operator, and aircraft type.
     Status:  Development
     Date created: 1/24/2022
-    Date last modified: 12/16/2022
+    Date last modified: 10/18/2026
     Python Version: 3.9.16
 """
 
 # Import libraries
-import arcpy, time
+import arcpy, os, time
+from ads_b.dedup import keep_mask
+from ads_b.faa import faa_index, faa_values
+from ads_b.stages import stage_log
+from ads_b.tables import table_array
+from ads_b.temporal import temporal_summaries
 
 # User-specified local variable(s) for ArcGIS script tool
 parkName = arcpy.GetParameterAsText(0)
 inputWaypoints = arcpy.GetParameterAsText(1)
 faaTable = arcpy.GetParameterAsText(2)
+parkTimeZone = arcpy.GetParameterAsText(3) if arcpy.GetArgumentCount() > 3 else ""
+
+# Optional park time zone: an IANA time zone name (e.g., America/Denver) used to convert UTC waypoint times to local time; times are summarized as recorded when blank
+parkTimeZone = parkTimeZone.strip()
 
 # Set local environments
 arcpy.env.workspace = arcpy.Describe(inputWaypoints).path
@@ -29,138 +38,70 @@ inField1 = "ICAO_address"
 joinTable1 = faaTable + "/MASTER"
 joinField1 = "MODE_S_CODE_HEX"
 fieldList1 = ["TYPE_AIRCRAFT", "TYPE_REGISTRANT"]
-operator_reclassTable = [[1, "Individual"], [2, "Partnership"], [3, "Corporation"], [4, "Co-Owned"], [5, "Government"], [7, "LLC"], [8, "Non-Citizen Corporation"], [9, "Non-Citizen Co-Owned"]]
-type_reclassTable = [[1, "Glider"], [2, "Balloon"], [3, "Blimp/Dirigible"], [4, "Fixed Wing Single Engine"], [5, "Fixed Wing Multi Engine"], [6, "Rotorcraft"], [7, "Weight-Shift-Control"], [8, "Powered Parachute"], [9, "Gyroplane"]]
-
-# Define function for determining the type of day - weekday or weekend
-codeblock1 = """
-def getDayType(labelday):
-    daynum = labelday.weekday()
-    if daynum < 5:
-        return "Weekday"
-    else:
-        return "Weekend"
-"""
+toolStages = [("read", "Reading the first waypoint of each flight from the input waypoint file..."),
+              ("faa", "Joining select fields from MASTER table of FAA Releaseable Database..."),
+              ("summaries", "Calculating day, hour, month, operator, and type frequencies and percentages..."),
+              ("write_tables", "Writing flight summary tables...")]
 
 try:
     
-    # Start timer and create progressor
+    # Start timer and create progressor driven by the stage registry
     start = time.time()
-    arcpy.SetProgressor("step", "Creating the buffer and clipping screened waypoints..", 0, 6, 1)
+    stages = stage_log("Tool 6", toolStages, arcpy)
     
-    # Copy input waypoint file to a temp file and delete identical flight_id's to represent flights
-    arcpy.SetProgressorLabel("Creating a temporary copy of the input waypoint file...")
-    arcpy.SetProgressorPosition()   
-    arcpy.management.CopyFeatures(inputWaypoints, "temp1")    
-    arcpy.management.DeleteIdentical("temp1", "flight_id")  
-    print("Input waypoint feature class copied.")    
-    arcpy.AddMessage("Input waypoint feature class copied.")    
+    # Read the flight_id, TIME, and ICAO address of every waypoint once and keep only the first waypoint of each flight_id to represent flights
+    stages.start("read")
+    waypointRows = arcpy.da.FeatureClassToNumPyArray(inputWaypoints, ["flight_id", "TIME", inField1])
+    flightRows = waypointRows[keep_mask(waypointRows, ["flight_id"])]
+    stages.rows(len(waypointRows), len(flightRows))
+    del waypointRows
+    print("First waypoint of {0} flights read from the input waypoint feature class.".format(len(flightRows)))    
+    arcpy.AddMessage("First waypoint of {0} flights read from the input waypoint feature class.".format(len(flightRows)))    
 
-    # Convert local DateTime field to text, then parse into HOUR and MONTH fields for later summarization
-    arcpy.SetProgressorLabel("Converting DateTime to local time and creating new hour and month fields...")
-    arcpy.SetProgressorPosition()
-    arcpy.management.ConvertTimeField("temp1", 'TIME', "", "TIME_TEXT", 'TEXT', "yyyy/MM/dd HH:mm:ss")
-    arcpy.management.CalculateField("temp1", "DAY", "!TIME!.strftime('%A')", "PYTHON3")
-    arcpy.management.CalculateField("temp1", "HOUR", "!TIME_TEXT![-8:-6]", 'PYTHON3')
-    arcpy.management.CalculateField("temp1", "MONTH", "!TIME_TEXT![-14:-12]", 'PYTHON3')
-    arcpy.management.CalculateField("temp1", "YEAR", "!TIME_TEXT![0:4]", 'PYTHON3')
-    arcpy.management.CalculateField("temp1", "MOYEAR", "!MONTH! + '/' + !YEAR!", 'PYTHON3')
-    print("Local time conversion complete; hour and month fields calculated.")    
-    arcpy.AddMessage("Local time conversion complete; hour and month fields calculated.")    
-    
-    # Calculate frequencies and percentages for day, hour, and month/year tables
-    arcpy.SetProgressorLabel("Calculating day, hour, and month frequencies and percentages...")
-    arcpy.SetProgressorPosition()     
-    arcpy.analysis.Frequency("temp1", parkName + "_" + "FlightSummary_HR", "HOUR")
-    totalWaypoints = 0
-    with arcpy.da.SearchCursor(parkName + "_" + "FlightSummary_HR", "FREQUENCY") as cursor:
-        for row in cursor:
-            totalWaypoints += row[0]
-    arcpy.management.AddField(parkName + "_" + "FlightSummary_HR", "PERCENTAGE", "DOUBLE")
-    with arcpy.da.UpdateCursor(parkName + "_" + "FlightSummary_HR", ("FREQUENCY", "PERCENTAGE")) as cursor:
-        for frequency, percentage in cursor:            
-            cursor.updateRow([frequency, round(frequency / totalWaypoints * 100, 1)])         
-    arcpy.analysis.Frequency("temp1", parkName + "_" + "FlightSummary_DAY", "DAY")
-    arcpy.management.AddField(parkName + "_" + "FlightSummary_DAY", "PERCENTAGE", "DOUBLE")
-    with arcpy.da.UpdateCursor(parkName + "_" + "FlightSummary_DAY", ("FREQUENCY", "PERCENTAGE")) as cursor:
-        for frequency, percentage in cursor:
-            cursor.updateRow([frequency, round(frequency / totalWaypoints * 100, 1)])              
-    arcpy.analysis.Frequency("temp1", parkName + "_" + "FlightSummary_MOYR", "MOYEAR")              
-    arcpy.management.AddField(parkName + "_" + "FlightSummary_MOYR", "PERCENTAGE", "DOUBLE")    
-    with arcpy.da.UpdateCursor(parkName + "_" + "FlightSummary_MOYR", ("FREQUENCY", "PERCENTAGE")) as cursor:
-        for frequency, percentage in cursor:            
-            cursor.updateRow([frequency, round(frequency / totalWaypoints * 100, 1)])            
+    # Join FAA variables from the cached FAA lookup index in memory, or from the MASTER table after stripping whitespace from MODE_S_CODE_HEX
+    stages.start("faa", len(flightRows))
+    faaIndex = faa_index(faaTable)
+    if faaIndex is not None:
+        faaValues = faa_values(flightRows[inField1], faaIndex, fieldList1)
+    else:
+        faaValues = {}
+        with arcpy.da.SearchCursor(joinTable1, [joinField1] + fieldList1) as cursor:
+            for row in cursor:
+                if row[0] is not None:
+                    faaValues.setdefault(row[0].strip(), list(row[1:]))
+    flightValues = [faaValues.get(icao, [None] * len(fieldList1)) for icao in flightRows[inField1]]
+    flights = {"TIME": flightRows["TIME"]}
+    for i, field in enumerate(fieldList1):
+        flights[field] = [values[i] for values in flightValues]
+    print("Type_Aircraft and Type_Registrant fields joined from FAA MASTER table.")    
+    arcpy.AddMessage("Type_Aircraft and Type_Registrant fields joined from FAA MASTER table.") 
+
+    # Convert UTC DateTime values to park local time, then calculate hour, day, month/year, and type of day keys and every summary table from one grouping of the flights
+    stages.start("summaries", len(flightRows))
+    summaries = temporal_summaries(flights, parkTimeZone)
+    totalWaypoints = int(summaries["HR"]["FREQUENCY"].sum())
+    dayTypes = summaries["DAYTYPE"].groupby("DAYTYPE")["FREQUENCY"].sum()
+    totalWeekdays = int(dayTypes.get("Weekday", 0))
+    totalWeekends = int(dayTypes.get("Weekend", 0))
+    if parkTimeZone:
+        print("Waypoint times converted from UTC to {0} local time.".format(parkTimeZone))
+        arcpy.AddMessage("Waypoint times converted from UTC to {0} local time.".format(parkTimeZone))
     print("Day, hour, and month flight summaries calculated.") 
     arcpy.AddMessage("Day, hour, and month flight summaries calculated.")     
-    
-    # Calculate frequencies and percentages for flights by hour for weekdays and weekends
-    arcpy.management.CalculateField("temp1", "DAYTYPE", "getDayType(!TIME!)", "PYTHON3", codeblock1)
-    arcpy.analysis.Frequency("temp1", parkName + "_" + "FlightSummary_DAYTYPE2", ["HOUR", "DAYTYPE"])
-    arcpy.management.Sort(parkName + "_" + "FlightSummary_DAYTYPE2", parkName + "_" + "FlightSummary_DAYTYPE", "DAYTYPE")
-    arcpy.management.Delete(parkName + "_" + "FlightSummary_DAYTYPE2")
-    arcpy.management.AddField(parkName + "_" + "FlightSummary_DAYTYPE", "PERCENTAGE", "DOUBLE")  
-    totalWeekdays = 0
-    with arcpy.da.SearchCursor(parkName + "_" + "FlightSummary_DAYTYPE", "FREQUENCY", "DAYTYPE = 'Weekday'") as cursor:
-        for row in cursor:
-            totalWeekdays += row[0]
-    with arcpy.da.UpdateCursor(parkName + "_" + "FlightSummary_DAYTYPE", ("FREQUENCY", "PERCENTAGE"), "DAYTYPE = 'Weekday'") as cursor:
-        for frequency, percentage in cursor:
-            cursor.updateRow([frequency, round(frequency / totalWeekdays * 100, 1)])       
     print("{0} weekday flights identified and hourly summaries calculated.".format(totalWeekdays)) 
     arcpy.AddMessage("{0} weekday flights identified and hourly summaries calculated.".format(totalWeekdays)) 
-    totalWeekends = 0    
-    with arcpy.da.SearchCursor(parkName + "_" + "FlightSummary_DAYTYPE", "FREQUENCY", "DAYTYPE = 'Weekend'") as cursor:
-        for row in cursor:
-            totalWeekends += row[0]
-    with arcpy.da.UpdateCursor(parkName + "_" + "FlightSummary_DAYTYPE", ("FREQUENCY", "PERCENTAGE"), "DAYTYPE = 'Weekend'") as cursor:
-        for frequency, percentage in cursor:
-            cursor.updateRow([frequency, round(frequency / totalWeekends * 100, 1)])       
-    arcpy.management.DeleteField(parkName + "_" + "FlightSummary_DAYTYPE", "ORIG_FID")
     print("{0} weekend flights identified and hourly summaries calculated.".format(totalWeekends)) 
     arcpy.AddMessage("{0} weekend flights identified and hourly summaries calculated.".format(totalWeekends))    
-
-    # Strip whitespace from the MODE_S_CODE_HEX field in the FAA MASTER file
-    arcpy.SetProgressorLabel("Joining select fields from MASTER table of FAA Releaseable Database...")
-    arcpy.SetProgressorPosition()
-    arcpy.management.CalculateField(joinTable1, joinField1, "!MODE_S_CODE_HEX!.strip()", "PYTHON3")
-    
-    # Perform a table join to add FAA database variables from MASTER file
-    arcpy.management.JoinField("temp1", inField1, joinTable1, joinField1, fieldList1)
-    print("Type_Aircraft and Type_Registrant fields joined from FAA MASTER table.")    
-    arcpy.AddMessage("Type_Aircraft and Type_Registrant fields joined from FAA MASTER table.") 
-  
-    # Need to make TYPE_REGISTRANT field in temp1 an INT to allow for later reclassification
-    arcpy.management.AddField("temp1", "TYPE_OPERATOR", "SHORT")
-    arcpy.management.CalculateField("temp1", "TYPE_OPERATOR", "!TYPE_REGISTRANT!", "PYTHON3")
-    
-    # Calculate frequencies and percentages for flight operators and aircraft types
-    arcpy.SetProgressorLabel("Calculating flight operator and type frequencies and percentages...")
-    arcpy.SetProgressorPosition()
-    
-    totalWaypoints = 0
-    arcpy.analysis.Frequency("temp1", parkName + "_" + "FlightSummary_Operators", "TYPE_OPERATOR")
-    arcpy.analysis.Frequency("temp1", parkName + "_" + "FlightSummary_Type", "TYPE_AIRCRAFT")      
-    with arcpy.da.SearchCursor(parkName + "_" + "FlightSummary_Operators", "FREQUENCY") as cursor:
-        for row in cursor:
-            totalWaypoints += row[0]
-    arcpy.management.AddField(parkName + "_" + "FlightSummary_Operators", "PERCENTAGE", "DOUBLE")
-    arcpy.management.AddField(parkName + "_" + "FlightSummary_Type", "PERCENTAGE", "DOUBLE")    
-    with arcpy.da.UpdateCursor(parkName + "_" + "FlightSummary_Operators", ("FREQUENCY", "PERCENTAGE")) as cursor:
-        for frequency, percentage in cursor:            
-            cursor.updateRow([frequency, round(frequency / totalWaypoints * 100, 1)])            
-    with arcpy.da.UpdateCursor(parkName + "_" + "FlightSummary_Type", ("FREQUENCY", "PERCENTAGE")) as cursor:
-        for frequency, percentage in cursor:            
-            cursor.updateRow([frequency, round(frequency / totalWaypoints * 100, 1)])            
     print("Aircraft operator and type summaries calculated.") 
     arcpy.AddMessage("Aircraft operator and type summaries calculated.")
-    
-    # Reclassify operator and aircraft type numeric codes into descriptive text fields
-    arcpy.SetProgressorLabel("Reclassifying aircraft operators and types...")
-    arcpy.SetProgressorPosition()
-    arcpy.management.ReclassifyField(parkName + "_" + "FlightSummary_Operators", "TYPE_OPERATOR", "MANUAL", "", "", "", operator_reclassTable, "", "Aircraft_Operator")
-    arcpy.management.ReclassifyField(parkName + "_" + "FlightSummary_Type", "TYPE_AIRCRAFT", "MANUAL", "", "", "", type_reclassTable, "", "Aircraft_Type")
-    arcpy.management.DeleteField(parkName + "_" + "FlightSummary_Operators", "Aircraft_Operator_RANGE")
-    arcpy.management.DeleteField(parkName + "_" + "FlightSummary_Type", "Aircraft_Type_RANGE")
+
+    # Write each summary table, with operator and aircraft type numeric codes reclassified into descriptive text fields
+    stages.start("write_tables")
+    for suffix, summary in summaries.items():
+        summaryTable = parkName + "_" + "FlightSummary_" + suffix
+        if arcpy.Exists(summaryTable):
+            arcpy.management.Delete(summaryTable)
+        arcpy.da.NumPyArrayToTable(table_array(summary), os.path.join(arcpy.env.workspace, summaryTable))
     print("Reclassification of aircraft operators and types complete.")
     arcpy.AddMessage("Reclassification of aircraft operators and types complete.")  
 
@@ -179,11 +120,9 @@ except:
     arcpy.AddWarning("An unexpected error occurred processing the input file {0}".format(inputWaypoints))
 
 finally:  
-    # Delete files no longer needed
-    delList = arcpy.ListFeatureClasses("temp*")
-    for i in delList:
-        arcpy.management.Delete(i)
-    print("Temporary files deleted.")
+    # Record the last stage, unless the stage log could not be created
+    if "stages" in locals():
+        stages.close()
 
     # Report execution time
     end = time.time()
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: test_clean.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Checks the ICAO address screen and QA/QC counts of cleaned logger records
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+from ads_b.clean import clean_logger_file, qaqc_percentages
+from ads_b.schema import icao_text, text_waypoints
+from ads_b.synthetic import synthetic_logger_data
+
+def test_invalid_icao_addresses_are_counted_and_removed():
+    data = synthetic_logger_data(200, 2, tslc={1: 1.0}, flags={"1ff": 1.0}, seed=7)
+    data.loc[[3, 50], "ICAO_address"] = ["XYZ123", "1234567"]
+    data.loc[10, "ICAO_address"] = "~0dbe91"
+    cleaned, counts = clean_logger_file([data], "SITE")
+    assert counts["icao_rows"] == 200
+    assert counts["invalid_icao"] == 2
+    assert len(cleaned) == 198
+    assert qaqc_percentages(counts)["invalid_icao"] == 1
+    assert "~0DBE91" in set(icao_text(cleaned["ICAO_address"]))
+
+def test_icao_text_is_normalized():
+    data = synthetic_logger_data(20, 1, tslc={1: 1.0}, flags={"1ff": 1.0}, seed=7)
+    data["ICAO_address"] = "96f0"
+    cleaned, counts = clean_logger_file([data], "SITE")
+    assert set(text_waypoints(cleaned)["ICAO_address"]) == {"0096F0"}
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: test_dedup.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Checks the hashed composite-key duplicate mask used in place of DeleteIdentical
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+import pytest
+from ads_b import dedup
+
+# Fixed local variables
+fields = ["ICAO_address", "lat", "lon", "DATE", "altitude"]
+
+def waypoints():
+    """Return waypoints with repeated keys, a repeated missing altitude, and a second time on the same day."""
+    return pd.DataFrame({"ICAO_address": ["A1B2C3", "A1B2C3", "0DBE91", "A1B2C3", "0DBE91", "0DBE91", "0DBE91"],
+                         "lat": [35.6, 35.6, 35.6, 35.7, 35.6, 35.6, 35.6], "lon": [-83.5] * 7,
+                         "TIME": pd.to_datetime(["2023-07-22 10:00", "2023-07-22 11:00", "2023-07-22 10:00", "2023-07-22 10:00",
+                                                 "2023-07-23 10:00", "2023-07-22 12:00", "2023-07-22 12:00"]),
+                         "altitude": [1000.0, 1000.0, 1000.0, 1000.0, 1000.0, np.nan, np.nan]})
+
+def expected_mask(data):
+    """Return the first-row mask of the key fields compared directly, as DeleteIdentical would."""
+    return ~dedup.key_columns(data, fields).duplicated(keep="first").to_numpy()
+
+def test_keep_mask_matches_key_comparison():
+    data = waypoints()
+    assert list(dedup.keep_mask(data, fields)) == [True, False, True, True, True, True, False]
+    assert (dedup.keep_mask(data, fields) == expected_mask(data)).all()
+
+@pytest.mark.parametrize("buckets", [1, 2])
+def test_keep_mask_falls_back_to_key_comparison_on_hash_collisions(monkeypatch, buckets):
+    hash_pandas_object = pd.util.hash_pandas_object
+    # Collapse the hashes into one or two values so different keys share a hash
+    monkeypatch.setattr(pd.util, "hash_pandas_object", lambda keys, index=False: hash_pandas_object(keys, index=index) % np.uint64(buckets))
+    data = waypoints()
+    assert (dedup.keep_mask(data, fields) == expected_mask(data)).all()
+    assert dedup.distinct_count(data, fields) == 5
+    assert dedup.duplicate_ids(data.assign(OID=np.arange(1, 8)), fields, "OID") == [2, 7]
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: test_dem.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Checks the keys and eviction of the floating point rasters exported from DEMs that cannot be memory-mapped
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import os, struct, time
+from ads_b.dem import evict_exports, export_name, find_export, raster_table_files, source_signature
+
+def write_catalog(gdb, names, deleted=()):
+    """Write a file geodatabase system catalog listing table names (table n is names[n - 1]), with deleted rows that keep their old bytes."""
+    os.makedirs(gdb, exist_ok=True)
+    table, offsets = bytearray(40), []
+    for name in list(names) + list(deleted):
+        text = name.encode("utf-8")
+        blob = b"\x00" + bytes([len(text)]) + text + struct.pack("<i", 0)
+        offsets.append(len(table))
+        table += struct.pack("<I", len(blob)) + blob
+    offsets = offsets[:len(names)] + [0] * len(deleted)
+    with open(os.path.join(gdb, "a00000001.gdbtable"), "wb") as f:
+        f.write(table)
+    with open(os.path.join(gdb, "a00000001.gdbtablx"), "wb") as f:
+        f.write(struct.pack("<4i", 3, 1, len(offsets), 5))
+        f.write(b"".join(o.to_bytes(5, "little") for o in offsets) + bytes(5 * (1024 - len(offsets))))
+        f.write(bytes(16))
+
+def write_table(gdb, number, data=b"rows"):
+    """Write the files of table number n in a file geodatabase."""
+    for ext in ["gdbtable", "gdbtablx"]:
+        with open(os.path.join(gdb, "a{0:08x}.{1}".format(number, ext)), "wb") as f:
+            f.write(data)
+
+def test_gdb_raster_signature_depends_only_on_its_own_tables(tmp_path):
+    gdb = str(tmp_path / "Season.gdb")
+    names = ["GDB_SystemCatalog", "GDB_DBTune", "GDB_SpatialRefs", "GDB_Items", "fras_ras_DEM", "fras_bnd_DEM", "fras_blk_DEM", "fras_aux_DEM",
+             "fras_ras_DEM2", "fras_bnd_DEM2", "fras_blk_DEM2", "fras_aux_DEM2", "Points_10Miles"]
+    # A deleted raster named dem left its old table names in the catalog file
+    write_catalog(gdb, names, deleted=["fras_blk_dem"])
+    for number in range(2, len(names) + 1):
+        write_table(gdb, number)
+    tables = raster_table_files(gdb, "dem")
+    assert [os.path.basename(p) for p in tables] == ["a{0:08x}.{1}".format(n, ext) for n in range(5, 9) for ext in ["gdbtable", "gdbtablx"]]
+    signature = source_signature(os.path.join(gdb, "dem"))
+    name = export_name(os.path.join(gdb, "dem"))
+
+    # Writing another dataset (e.g., Tool 2 output points) or another raster to the geodatabase keeps the DEM export
+    time.sleep(0.01)
+    write_table(gdb, 13, b"new points")
+    write_table(gdb, 11, b"new raster blocks")
+    write_table(gdb, 20, b"new table")
+    assert source_signature(os.path.join(gdb, "dem")) == signature
+    assert export_name(os.path.join(gdb, "dem")) == name
+
+    # Editing the raster's cell blocks gives a new export
+    write_table(gdb, 7, b"edited raster blocks")
+    assert source_signature(os.path.join(gdb, "dem")) != signature
+    assert export_name(os.path.join(gdb, "dem")) != name
+
+def test_gdb_without_a_readable_catalog_uses_the_whole_geodatabase(tmp_path):
+    gdb = str(tmp_path / "Other.gdb")
+    os.makedirs(gdb)
+    write_table(gdb, 2)
+    assert raster_table_files(gdb, "dem") is None
+    signature = source_signature(os.path.join(gdb, "dem"))
+    write_table(gdb, 3)
+    assert source_signature(os.path.join(gdb, "dem")) != signature
+
+def test_export_name_includes_the_description(tmp_path):
+    path = str(tmp_path / "dem.img")
+    with open(path, "wb") as f:
+        f.write(b"cells")
+    assert export_name(path, "0 0 10 10|30") == export_name(path, "0 0 10 10|30")
+    assert export_name(path, "0 0 10 10|30") != export_name(path, "0 0 10 10|10")
+
+def test_least_recently_used_exports_are_evicted_with_their_companion_files(tmp_path):
+    folder = str(tmp_path)
+    for i in range(6):
+        for ext in [".flt", ".hdr", ".prj"]:
+            with open(os.path.join(folder, "dem_{0}{1}".format(i, ext)), "w") as f:
+                f.write("x")
+        os.utime(os.path.join(folder, "dem_{0}.flt".format(i)), (1000 + i, 1000 + i))
+    assert find_export(folder, "dem_0.flt") == os.path.join(folder, "dem_0.flt")
+    assert find_export(folder, "dem_9.flt") is None
+    evict_exports(folder, 3)
+    assert sorted(os.listdir(folder)) == ["dem_{0}{1}".format(i, ext) for i in [0, 4, 5] for ext in [".flt", ".hdr", ".prj"]]
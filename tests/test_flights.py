@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: test_flights.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Checks waypoint sorting and flight segmentation against the pandas sort and groupby implementation of the original Tool 1
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+from ads_b.flights import segment_flights, segment_index, sort_order, sort_waypoints
+from ads_b.schema import date_categories, icao_integers
+
+# Fixed local variables
+dur_threshold = 900
+
+def waypoints(rows):
+    """Return sorted waypoints in the compact schema from (ICAO_address, TIME text) rows."""
+    icao, time = zip(*rows)
+    time = pd.to_datetime(list(time))
+    return pd.DataFrame({"ICAO_address": icao_integers(list(icao)), "TIME": time, "DATE": date_categories(time)})
+
+def groupby_flight_ids(rows, dur_threshold):
+    """Return the flight_id of each waypoint kept by the original Tool 1 code, which numbered flights with a per-aircraft groupby."""
+    data = pd.DataFrame(rows, columns=["ICAO_address", "TIME"])
+    data["TIME"] = pd.to_datetime(data["TIME"])
+    data["DATE"] = data["TIME"].dt.strftime("%Y%m%d")
+    data["dur_secs"] = data.groupby("ICAO_address")["TIME"].diff().dt.total_seconds().fillna(0)
+    data["cumsum"] = data.groupby("ICAO_address")["dur_secs"].transform(lambda d: (d >= dur_threshold).cumsum())
+    data["flight_id"] = data["ICAO_address"] + "_" + data["cumsum"].astype(str) + "_" + data["DATE"]
+    data = data[data.groupby("flight_id").flight_id.transform(len) > 1]
+    return list(data["flight_id"])
+
+# Two aircraft with a flight crossing midnight, gaps one second under, exactly at, and one second over the threshold, and a single-waypoint flight
+rows = [("A1B2C3", "2023-07-22 23:50:00"), ("A1B2C3", "2023-07-22 23:59:59"), ("A1B2C3", "2023-07-23 00:00:00"), ("A1B2C3", "2023-07-23 00:10:00"),
+        ("A1B2C3", "2023-07-23 00:24:59"), ("A1B2C3", "2023-07-23 00:39:59"), ("A1B2C3", "2023-07-23 00:40:00"), ("A1B2C3", "2023-07-23 00:55:01"),
+        ("A1B2C3", "2023-07-23 00:56:00"), ("0DBE91", "2023-07-23 01:00:00"), ("0DBE91", "2023-07-23 01:15:00"), ("0DBE91", "2023-07-23 01:15:30")]
+rows = sorted(rows)
+
+def test_segment_flights_matches_groupby_numbering():
+    data = segment_flights(waypoints(rows), dur_threshold)
+    assert list(data["flight_id"].astype(str)) == groupby_flight_ids(rows, dur_threshold)
+
+def test_flights_split_at_midnight_and_at_the_threshold():
+    data = waypoints(rows)
+    codes, offsets, numbers = segment_index(data["ICAO_address"], data["TIME"], dur_threshold, data["DATE"].cat.codes)
+    # 0DBE91: a gap of exactly 900 secs starts a new flight
+    assert list(codes[:3]) == [0, 1, 1] and list(numbers[:2]) == [0, 1]
+    # A1B2C3: split at midnight with the same flight number, a gap of 899 secs is not split, 900 and 901 secs are
+    assert list(offsets) == [0, 1, 3, 5, 8, 10, 12]
+    assert list(numbers[2:]) == [0, 0, 1, 2]
+    data = segment_flights(data, dur_threshold)
+    assert list(data["flight_id"].unique().astype(str)) == ["0DBE91_1_20230723", "A1B2C3_0_20230722", "A1B2C3_0_20230723", "A1B2C3_1_20230723", "A1B2C3_2_20230723"]
+
+def test_segment_flights_matches_groupby_on_random_gaps():
+    rng = np.random.default_rng(11)
+    start = pd.Timestamp("2023-07-22 20:00:00")
+    rows = []
+    for icao in ["0A0001", "0A0002", "A1B2C3"]:
+        seconds = np.cumsum(rng.choice([1, 2, 899, 900, 901, 3600], size=300, p=[0.5, 0.3, 0.05, 0.05, 0.05, 0.05]))
+        rows += [(icao, str(start + pd.Timedelta(seconds=int(s)))) for s in seconds]
+    rows = sorted(rows)
+    data = segment_flights(waypoints(rows), dur_threshold)
+    assert list(data["flight_id"].astype(str)) == groupby_flight_ids(rows, dur_threshold)
+
+def stable_sort_order(icao, time):
+    """Return the row order of sort_values on ICAO_address and TIME with a stable sort."""
+    data = pd.DataFrame({"ICAO_address": icao, "TIME": time})
+    return data.sort_values(["ICAO_address", "TIME"], kind="stable").index.to_numpy()
+
+def test_sort_order_matches_stable_sort_values():
+    rng = np.random.default_rng(5)
+    icao = rng.choice(icao_integers(["0A0001", "A1B2C3", "~0DBE91", "FFFFFF"]), 2000)
+    time = pd.Timestamp("2023-07-22") + pd.to_timedelta(rng.integers(0, 50, 2000), unit="s")
+    order = sort_order(icao, time)
+    assert (order == stable_sort_order(icao, time)).all()
+    data = sort_waypoints(pd.DataFrame({"ICAO_address": icao, "TIME": time, "row": np.arange(2000)}))
+    assert (data["row"].to_numpy() == stable_sort_order(icao, time)).all()
+
+def test_sort_order_ranks_missing_icao_last_and_keeps_ties_in_input_order():
+    icao = np.array(["A1B2C3", None, "0DBE91", "A1B2C3", None, "0DBE91", "A1B2C3"], dtype=object)
+    time = pd.to_datetime(["2023-07-22 10:00:02", "2023-07-22 10:00:00", "2023-07-22 10:00:01", "2023-07-22 10:00:01",
+                           "2023-07-22 09:00:00", "2023-07-22 10:00:01", "2023-07-22 10:00:01"])
+    order = sort_order(icao, time)
+    assert list(order) == list(stable_sort_order(icao, time)) == [2, 5, 3, 6, 0, 4, 1]
+
+def test_sort_order_of_grouped_times_and_times_too_far_apart_for_one_key():
+    icao = icao_integers(["A1B2C3", "0DBE91", "A1B2C3", "0DBE91"])
+    time = pd.to_datetime(["2023-07-22 10:00:00", "2023-07-22 10:00:00", "2023-07-22 10:00:01", "2023-07-22 10:00:01"])
+    assert list(sort_order(icao, time)) == list(stable_sort_order(icao, time)) == [1, 3, 0, 2]
+    assert sort_order(np.sort(icao), time) is None
+    # The span of times times the number of aircraft overflows an int64 key, so the rows are sorted with lexsort
+    time = pd.to_datetime(["2262-04-01", "1678-01-01", "1970-01-01", "2262-04-01"])
+    assert list(sort_order(icao, time)) == list(stable_sort_order(icao, time)) == [1, 3, 2, 0]
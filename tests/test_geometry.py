@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: test_geometry.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Checks the gridded point-in-polygon test used to screen waypoints against park buffers
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import struct
+import numpy as np
+import pytest
+from ads_b.geometry import buffer_mask, points_in_polygon, prepare_polygon, rings_from_wkb
+
+# Fixed local variables
+# An exterior ring with a square hole, and a second part shaped like a star with edges at many angles
+exterior = [(0, 0), (16, 0), (16, 16), (0, 16), (0, 0)]
+hole = [(4, 4), (4, 8), (8, 8), (8, 4), (4, 4)]
+star = [(20 + (4 if k % 2 == 0 else 1.5) * np.cos(np.pi * k / 5), 8 + (4 if k % 2 == 0 else 1.5) * np.sin(np.pi * k / 5)) for k in range(10)]
+rings = [exterior, hole, star]
+
+def even_odd(rings, x, y):
+    """Return True for each point with an odd number of ray crossings with all the ring edges, one point at a time."""
+    inside = []
+    for px, py in zip(x, y):
+        crossings = 0
+        for ring in rings:
+            for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+                if (y1 > py) != (y2 > py) and px < x1 + (py - y1) * (x2 - x1) / (y2 - y1):
+                    crossings += 1
+        inside.append(crossings % 2 == 1)
+    return np.array(inside)
+
+def polygon_wkb(rings):
+    """Return little-endian WKB for a polygon."""
+    data = struct.pack("<BII", 1, 3, len(rings))
+    for ring in rings:
+        data += struct.pack("<I", len(ring)) + np.asarray(ring, dtype="<f8").tobytes()
+    return data
+
+@pytest.mark.parametrize("cells", [16, 256])
+def test_random_points_match_even_odd(cells):
+    rng = np.random.default_rng(8)
+    x, y = rng.uniform(-2, 26, 20000), rng.uniform(-2, 18, 20000)
+    prepared = prepare_polygon(rings, cells)
+    assert (points_in_polygon(prepared, x, y) == even_odd(rings, x, y)).all()
+
+@pytest.mark.parametrize("cells", [16, 24])
+def test_points_on_grid_cell_boundaries_match_even_odd(cells):
+    prepared = prepare_polygon(rings, cells)
+    xmin, ymin, xmax, ymax = prepared["bbox"]
+    # Every grid line crossing, plus the midpoints between them, including the bounding box edges and ring vertices
+    gx = xmin + np.arange(2 * cells + 1) * prepared["cell_width"] / 2
+    gy = ymin + np.arange(2 * cells + 1) * prepared["band_height"] / 2
+    x, y = [v.ravel() for v in np.meshgrid(gx, gy)]
+    assert (points_in_polygon(prepared, x, y) == even_odd(rings, x, y)).all()
+
+def test_buffer_mask_reads_wkb_and_unions_features():
+    assert [ring.tolist() for ring in rings_from_wkb(polygon_wkb([exterior, hole]))] == [[list(p) for p in exterior], [list(p) for p in hole]]
+    multipolygon = struct.pack("<BII", 1, 6, 2) + polygon_wkb([exterior, hole]) + polygon_wkb([star])
+    overlap = polygon_wkb([[(6, 6), (10, 6), (10, 10), (6, 10), (6, 6)]])
+    x, y = np.array([5.0, 7.0, 9.0, 20.0, 30.0]), np.array([5.0, 7.0, 9.0, 8.0, 8.0])
+    assert list(buffer_mask([multipolygon], x, y)) == [False, False, True, True, False]
+    # Overlapping features are combined as a union, so a point in both stays inside
+    assert list(buffer_mask([multipolygon, overlap], x, y)) == [False, True, True, True, False]
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: test_merge.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Checks the key fingerprint index used by the incremental merge mode of Tool 3
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+from ads_b.merge import append_keys, fingerprint_dtype, key_fingerprints, key_index, waypoint_key_fields
+
+def fingerprints(pairs):
+    """Return (hash, check) pairs as a key fingerprint array."""
+    return np.array(pairs, dtype=fingerprint_dtype)
+
+def test_primary_hash_collision_is_not_a_match():
+    index = key_index(fingerprints([(5, 1), (9, 0)]))
+    keep, merged = append_keys(index, fingerprints([(5, 2), (5, 1), (5, 2), (3, 9), (9, 0), (5, 0)]))
+    assert list(keep) == [True, False, False, True, False, True]
+    assert merged.tolist() == [(3, 9), (5, 0), (5, 1), (5, 2), (9, 0)]
+
+def test_append_keys_matches_set_membership():
+    rng = np.random.default_rng(2)
+    # Few distinct primary hashes, so most rows collide with another key on the first hash alone
+    index = key_index(fingerprints(list(zip(rng.integers(0, 4, 50).tolist(), rng.integers(0, 40, 50).tolist()))))
+    seen = set(index.tolist())
+    for batch in range(3):
+        new = fingerprints(list(zip(rng.integers(0, 4, 60).tolist(), rng.integers(0, 40, 60).tolist())))
+        keep, index = append_keys(index, new)
+        expected = []
+        for key in new.tolist():
+            expected.append(key not in seen)
+            seen.add(key)
+        assert list(keep) == expected
+        assert index.tolist() == sorted(seen)
+
+def test_append_keys_to_an_empty_index():
+    keep, index = append_keys(key_index(fingerprints([])), fingerprints([(2, 1), (2, 1), (1, 7)]))
+    assert list(keep) == [True, False, True]
+    assert index.tolist() == [(1, 7), (2, 1)]
+
+def test_waypoint_fingerprints_use_the_calendar_day_of_time():
+    data = pd.DataFrame({"ICAO_address": ["A1B2C3", "A1B2C3", "A1B2C3"], "lat": [35.6, 35.6, 35.6], "lon": [-83.5, -83.5, -83.5],
+                         "TIME": pd.to_datetime(["2023-07-22 10:00", "2023-07-22 11:00", "2023-07-23 10:00"]), "altitude": [1000.0, 1000.0, 1000.0]})
+    keys = key_fingerprints(data, waypoint_key_fields)
+    assert keys[0] == keys[1] and keys[0] != keys[2]
+    assert (keys["hash"] != keys["check"]).all()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: test_parse.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Checks that the vectorized validFlags decoder matches the original per-row decoding used by Tool 1
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import pandas as pd
+import pytest
+from ads_b.parse import check_header, decode_valid_flags, flags_names
+
+# Fixed local variables
+edge_flags = ["0", "1", "1FF", "1ff", "1Fe", "0x1FF", "0X17f", "3FF", "FFFF", "200", "201", "7e", "17E", "00001ff", "deadbeef"]
+
+def per_row_flags(valid_flags):
+    """Return the validFlags decoding of the original Tool 1 code, one row at a time, on the index of valid_flags."""
+    rows = [[bit == "1" for bit in bin(int(t, 16))[2:].zfill(9)[-9:]] for t in valid_flags]
+    return pd.DataFrame(rows, columns=flags_names, index=valid_flags.index)
+
+@pytest.mark.parametrize("flag", edge_flags)
+def test_single_values_match_per_row_decoding(flag):
+    valid_flags = pd.Series([flag])
+    pd.testing.assert_frame_equal(decode_valid_flags(valid_flags), per_row_flags(valid_flags))
+
+def test_column_matches_per_row_decoding():
+    valid_flags = pd.Series(edge_flags * 3, index=range(100, 100 + 3 * len(edge_flags)))
+    pd.testing.assert_frame_equal(decode_valid_flags(valid_flags), per_row_flags(valid_flags))
+
+def test_decoding_is_index_aligned_after_header_rows_are_removed():
+    rows = [["1690009200", "A1B2C3", "1ff"], ["1690009201", "A1B2C3", "17e"], ["TIME", "ICAO_address", "validFlags"],
+            ["1690009202", "0DBE91", "0x1fe"], ["TIME", "ICAO_address", "validFlags"], ["1690009203", "0DBE91", "3FF"]]
+    data = check_header(pd.DataFrame(rows, columns=["TIME", "ICAO_address", "validFlags"]))
+    decoded = decode_valid_flags(data["validFlags"])
+    assert list(decoded.index) == [0, 1, 3, 5]
+    pd.testing.assert_frame_equal(decoded, per_row_flags(data["validFlags"]))
+    assert decoded.loc[1, "valid_LATLON"] == False and decoded.loc[3, "valid_LATLON"] == False and decoded.loc[5, "valid_LATLON"] == True
+
+def test_missing_values_raise():
+    with pytest.raises(ValueError):
+        decode_valid_flags(pd.Series(["1ff", None]))
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: test_sinuosity.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Checks the flightline attributes built from waypoint arrays for Tool 2
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+from ads_b.sinuosity import flightline_table
+
+def test_icao_address_is_the_flight_id_prefix():
+    flight_id = ["A1B2C3_0_20230722", "A1B2C3_0_20230722", "~0DBE91_1_20231231", "~0DBE91_1_20231231"]
+    lines = flightline_table(flight_id, [1, 2, 3, 4], [-83.5, -83.4, -83.6, -83.7], [35.6, 35.7, 35.5, 35.4])
+    assert list(lines["flight_id"]) == ["A1B2C3_0_20230722", "~0DBE91_1_20231231"]
+    assert list(lines["ICAO_address"]) == ["A1B2C3", "~0DBE91"]
+    assert list(lines["Year"]) == [2023, 2023]
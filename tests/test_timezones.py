@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#!/usr/bin/env python
+
+"""
+    File name: test_timezones.py
+    Author: Shawn Hutchinson
+    Credits: Shawn Hutchinson, Brian Peterson, Myles Cramer
+    Description:  Checks UTC to park local time conversion against pandas time zone conversion
+    Status:  Development
+    Date created: 10/18/2026
+    Date last modified: 10/18/2026
+    Python Version: 3.9.16
+"""
+
+# Import libraries
+import numpy as np, pandas as pd
+import pytest
+from ads_b.timezones import utc_to_local
+
+def pandas_local(time, timezone):
+    """Return UTC times converted to naive local times with pandas tz_convert."""
+    return pd.DatetimeIndex(time).tz_localize("UTC").tz_convert(timezone).tz_localize(None).to_numpy()
+
+def around(*times, seconds=7200):
+    """Return every 30 seconds within seconds either side of each UTC time, plus the times themselves one second apart."""
+    values = []
+    for t in times:
+        t = np.datetime64(t, "s")
+        values.append(t + np.arange(-seconds, seconds + 1, 30).astype("timedelta64[s]"))
+        values.append(t + np.arange(-2, 3).astype("timedelta64[s]"))
+    return np.concatenate(values).astype("datetime64[us]")
+
+@pytest.mark.parametrize("timezone, transitions", [
+    # Daylight saving time starts and ends in a mountain time park
+    ("America/Denver", ["2023-03-12T09:00:00", "2023-11-05T08:00:00"]),
+    # A half-hour zone with daylight saving time (UTC-3:30 and UTC-2:30)
+    ("America/St_Johns", ["2023-03-12T05:30:00", "2023-11-05T04:30:00"]),
+    # A half-hour zone without daylight saving time
+    ("Asia/Kolkata", ["2023-07-22T00:00:00"]),
+    # Hawaii does not observe daylight saving time
+    ("Pacific/Honolulu", ["2023-03-12T12:00:00"])])
+def test_utc_to_local_matches_tz_convert(timezone, transitions):
+    time = around(*transitions)
+    assert (utc_to_local(time, timezone) == pandas_local(time, timezone)).all()
+
+def test_utc_to_local_across_a_season_with_fractional_seconds_and_missing_times():
+    rng = np.random.default_rng(4)
+    start = np.datetime64("2023-01-01T00:00:00", "us")
+    time = start + rng.integers(0, 365 * 86400 * 10 ** 6, 5000).astype("timedelta64[us]")
+    time[::97] = np.datetime64("NaT")
+    local = utc_to_local(time, "America/Denver")
+    expected = pandas_local(time, "America/Denver")
+    assert (np.isnat(local) == np.isnat(expected)).all()
+    assert (local[~np.isnat(local)] == expected[~np.isnat(expected)]).all()
+
+def test_utc_returns_times_unchanged():
+    time = around("2023-03-12T09:00:00")
+    assert (utc_to_local(time, "") == time).all()
+    assert (utc_to_local(time, "UTC") == time).all()